@@ -0,0 +1,51 @@
+from __future__ import annotations
+from pathlib import Path
+import os, sys, random, string, time, tempfile
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+sys.path.insert(0, str(THIS_DIR))
+
+from strings_06_group_anagrams import group_anagrams_sort, group_anagrams_count
+from src.strings.anagram_groups import group_anagrams, group_anagrams_external, iter_words
+
+# Anagram grouping over a synthetic vocabulary: the sorted-key and Counter-key
+# versions vs prime signatures (in memory), and the external pipeline streaming
+# from a file with spilling (serial and process pool).
+
+def make_vocab(n: int, rng: random.Random):
+    words = ["".join(rng.choice(string.ascii_lowercase[:12]) for _ in range(rng.randint(3, 9)))
+             for _ in range(n)]
+    words += ["é" + w for w in words[: n // 50]]   # a little non-ASCII
+    return words
+
+def timed(fn):
+    t = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    rng = random.Random(1)
+    words = make_vocab(n, rng)
+    print(f"{len(words)} words on {os.cpu_count()} CPU(s)")
+    ref, t_sort = timed(lambda: group_anagrams_sort(words))
+    _, t_count = timed(lambda: group_anagrams_count(words))
+    got, t_new = timed(lambda: group_anagrams(words))
+    assert got == ref
+    print(f"in memory   sort-key {t_sort:6.2f}s | Counter-key {t_count:6.2f}s | prime signature {t_new:6.2f}s")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "vocab.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(0, len(words), 20):
+                f.write(" ".join(words[i:i + 20]) + "\n")
+        budget = len(words) // 8
+        for workers in (1, None):
+            got, t = timed(lambda: list(group_anagrams_external(iter_words(path), shards=32,
+                                                                memory_words=budget, workers=workers,
+                                                                tmp_dir=tmp)))
+            assert got == ref
+            label = "serial" if workers == 1 else "process pool"
+            print(f"external    {label:<12} {t:6.2f}s (buffer {budget} words, 32 shards)")
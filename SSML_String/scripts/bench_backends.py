@@ -0,0 +1,46 @@
+from __future__ import annotations
+from pathlib import Path
+import sys, random, time
+import xml.etree.ElementTree as ET
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from src.ssml.backends import BACKENDS, parse, choose_backend
+
+# Speed matrix: every backend x document size (docs use no optional features,
+# so all backends must agree), plus what parse() picks automatically.
+
+WORDS = "welcome to the show tonight we talk about speech synthesis and markup".split()
+
+def make_doc(n: int, rng: random.Random) -> str:
+    parts = ["<speak>"]
+    for _ in range(n):
+        text = " ".join(rng.choice(WORDS) for _ in range(20))
+        parts.append(f'<p><s>{text} <sub alias="New York">NY</sub></s><break time="{rng.randrange(900)}ms"/></p>')
+    parts.append("</speak>")
+    return "".join(parts)
+
+def best_of(fn, reps: int = 3) -> float:
+    best = float("inf")
+    for _ in range(reps):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+if __name__ == "__main__":
+    rng = random.Random(4)
+    sizes = (10, 100, 1_000, 10_000)
+    names = list(BACKENDS)
+    print(f"{'paragraphs':>10} | " + " | ".join(f"{n:>9}" for n in names) + " | auto")
+    for n in sizes:
+        doc = make_doc(n, rng)
+        ref = ET.tostring(ET.fromstring(doc))
+        cells = []
+        for name in names:
+            assert ET.tostring(parse(doc, backend=name)) == ref, name
+            cells.append(f"{best_of(lambda: parse(doc, backend=name)) * 1000:7.2f}ms")
+        print(f"{n:>10} | " + " | ".join(cells) + f" | {choose_backend(doc).name}")
@@ -0,0 +1,54 @@
+from __future__ import annotations
+from pathlib import Path
+import os, sys, random, time, tempfile
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.transforms import flatten_text, total_duration_seconds
+from src.ssml.compiled import CompiledDocument, save_compiled
+
+# Startup cost per playback: re-parse + re-analyse the SSML source vs opening
+# the compiled file (mmap; header only) and reading the duration and the first
+# timeline entry and the first <break> (iter_tag). Compiled open time should
+# not grow with the document.
+
+WORDS = "welcome to the show tonight we talk about speech synthesis and markup".split()
+
+def make_doc(n: int, rng: random.Random) -> str:
+    parts = ["<speak>"]
+    for _ in range(n):
+        text = " ".join(rng.choice(WORDS) for _ in range(25))
+        parts.append(f'<p><s>{text} <sub alias="New York">NY</sub></s><break time="{rng.randrange(900)}ms"/></p>')
+    parts.append("</speak>")
+    return "".join(parts)
+
+def best_of(fn, reps: int = 5) -> float:
+    best = float("inf")
+    for _ in range(reps):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+if __name__ == "__main__":
+    rng = random.Random(9)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (100, 1_000, 10_000, 50_000):
+            src = make_doc(n, rng)
+            path = os.path.join(tmp, f"doc{n}.ssmc")
+            save_compiled(parse_ssml(src), path)
+
+            def reparse():
+                root = parse_ssml(src)
+                return flatten_text(root), total_duration_seconds(root)
+
+            def reopen():
+                with CompiledDocument.open(path) as doc:
+                    return doc.duration, doc.timeline(0), next(doc.iter_tag("break"))
+
+            print(f"{n:>6} paragraphs ({len(src) / 1e6:5.1f} MB source, {os.path.getsize(path) / 1e6:5.1f} MB compiled): "
+                  f"parse+analyse {best_of(reparse) * 1000:8.2f}ms | open compiled {best_of(reopen) * 1000:6.3f}ms")
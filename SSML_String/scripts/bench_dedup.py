@@ -0,0 +1,73 @@
+from __future__ import annotations
+from pathlib import Path
+import sys, random, time
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from src.ssml.dedup import DedupIndex, document_words
+from src.strings.bounded_edit import bounded_edit_distance
+
+# Near-duplicate search over a synthetic script library (1 in 4 scripts has a
+# lightly edited copy): MinHash/LSH + bounded confirmation vs comparing all
+# pairs. All-pairs time is extrapolated from a sample of full-table word
+# edit distances (and of bounded ones, which already skip most of the table).
+
+WORDS = ("your order ships today thanks for calling our support team please hold the "
+         "line while we connect you to an agent account balance payment due tomorrow "
+         "morning evening store hours holiday delivery return policy refund").split()
+
+def edit_distance(a, b) -> int:
+    prev = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        cur = [i]
+        for j, y in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (x != y)))
+        prev = cur
+    return prev[-1]
+
+def make_corpus(n: int, rng: random.Random):
+    docs, planted = [], set()
+    for i in range(n):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(100, 200))]
+        docs.append((i, words))
+        if i % 4 == 0:
+            copy = list(words)
+            for _ in range(rng.randint(1, 8)):
+                copy[rng.randrange(len(copy))] = rng.choice(WORDS)
+            docs.append((f"{i}-copy", copy))
+            planted.add((f"{i}-copy", i))
+    ssml = [(k, "<speak><p><s>" + " ".join(w[:50]) + "</s></p><break time='500ms'/><p>"
+             + " ".join(w[50:]) + "</p></speak>") for k, w in docs]
+    return ssml, planted
+
+def main() -> None:
+    rng = random.Random(48)
+    for n in (1000, 4000):
+        docs, planted = make_corpus(n, rng)
+        t0 = time.perf_counter()
+        idx = DedupIndex(threshold=0.9)
+        found = {(m.key, m.other) for m in idx.add_many(docs)}
+        t_lsh = time.perf_counter() - t0
+
+        words = [document_words(d) for _, d in docs[:40]]
+        pairs = [(a, b) for a in words[:20] for b in words[20:]]
+        t0 = time.perf_counter()
+        for a, b in pairs[:30]:
+            edit_distance(a, b)
+        t_full = (time.perf_counter() - t0) / 30
+        t0 = time.perf_counter()
+        for a, b in pairs:
+            bounded_edit_distance(a, b, int(0.1 * max(len(a), len(b))))
+        t_bounded = (time.perf_counter() - t0) / len(pairs)
+        n_pairs = len(docs) * (len(docs) - 1) // 2
+
+        recall = len(found & planted) / len(planted)
+        print(f"{len(docs):5d} docs: minhash/lsh {t_lsh:7.2f} s ({idx.candidates} candidates, "
+              f"recall {recall:.3f}, {len(found - planted)} extra)   all pairs ~"
+              f"{n_pairs * t_full:8.0f} s full DP, ~{n_pairs * t_bounded:6.0f} s bounded")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+from pathlib import Path
+import os, sys, random, time
+import xml.etree.ElementTree as ET
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from src.strings.is_valid_tags import check_markup, check_markup_many, OK
+
+# Pre-filter cost per inbound request: check_markup vs ET.fromstring,
+# on text-heavy valid documents and on documents broken early.
+
+WORDS = "welcome to the show tonight we talk about speech synthesis and markup".split()
+
+def make_doc(n_sentences: int, rng: random.Random) -> str:
+    parts = ["<speak>"]
+    for i in range(n_sentences):
+        text = " ".join(rng.choice(WORDS) for _ in range(25))
+        parts.append(f'<p><s>{text} <emphasis level="strong">{rng.choice(WORDS)}</emphasis>.</s>'
+                     f'<break time="{rng.randrange(900)}ms"/></p>')
+    parts.append("</speak>")
+    return "".join(parts)
+
+def etree_ok(s: str) -> bool:
+    try:
+        ET.fromstring(s)
+        return True
+    except ET.ParseError:
+        return False
+
+def legacy_is_well_formed(s: str) -> bool:
+    """The previous char-by-char version, for reference."""
+    stack = []
+    i, n = 0, len(s)
+    while i < n:
+        if s[i] == "<":
+            j = s.find(">", i + 1)
+            if j == -1:
+                return False
+            inside = s[i+1:j].strip()
+            if not inside:
+                return False
+            if inside.startswith("/"):
+                if not stack or stack[-1] != inside[1:].strip():
+                    return False
+                stack.pop()
+            elif not inside.endswith("/"):
+                stack.append(inside.split()[0])
+            i = j + 1
+        else:
+            i += 1
+    return not stack
+
+def timeit(fn, docs, reps: int = 3) -> float:
+    best = float("inf")
+    for _ in range(reps):
+        t = time.perf_counter()
+        for d in docs:
+            fn(d)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+if __name__ == "__main__":
+    rng = random.Random(3)
+    valid = [make_doc(rng.randint(20, 200), rng) for _ in range(200)]
+    broken = ["<speak><p></s>" + d[7:] for d in valid]   # fails at the first end tag
+    size_mb = sum(map(len, valid)) / 1e6
+    print(f"{len(valid)} docs, {size_mb:.1f} MB")
+    for label, docs in (("valid", valid), ("broken early", broken)):
+        t_legacy = timeit(legacy_is_well_formed, docs)
+        t_new = timeit(check_markup, docs)
+        t_et = timeit(etree_ok, docs)
+        print(f"{label:<13} legacy {t_legacy * 1000:8.1f}ms | check_markup {t_new * 1000:8.1f}ms "
+              f"| ET.fromstring {t_et * 1000:8.1f}ms")
+    assert all(check_markup(d) == OK for d in valid)
+
+    many = valid * 10
+    t = time.perf_counter()
+    check_markup_many(many, workers=1)
+    t_serial = time.perf_counter() - t
+    t = time.perf_counter()
+    check_markup_many(many)
+    t_pool = time.perf_counter() - t
+    print(f"bulk x{len(many)} on {os.cpu_count()} CPU(s): serial {t_serial * 1000:.1f}ms | process pool {t_pool * 1000:.1f}ms")
@@ -0,0 +1,68 @@
+from __future__ import annotations
+from pathlib import Path
+import sys, random, time
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.transforms import flatten_text, total_duration_seconds
+from src.ssml.edge_cases import validate_tree
+from src.ssml.merkle import AnalysisCache
+
+# Re-analysing a long document after a one-paragraph edit: full
+# flatten_text + total_duration_seconds + validate_tree on every version vs
+# AnalysisCache.analyze, which reuses the summaries of unchanged subtrees.
+
+WORDS = "welcome to the show tonight we talk about speech synthesis and markup".split()
+
+def make_paragraphs(n: int, rng: random.Random):
+    out = []
+    for _ in range(n):
+        sents = "".join(
+            f'<s>{" ".join(rng.choice(WORDS) for _ in range(12))} '
+            f'<emphasis level="strong">{rng.choice(WORDS)}</emphasis> '
+            f'<say-as interpret-as="cardinal">{rng.randrange(999)}</say-as> '
+            f'<sub alias="New York">NY</sub></s><break time="{rng.randrange(900)}ms"/>'
+            for _ in range(4))
+        out.append(f"<p>{sents}</p>")
+    return out
+
+def best(fn, repeat: int = 5) -> float:
+    t = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        t = min(t, time.perf_counter() - t0)
+    return t
+
+def main() -> None:
+    rng = random.Random(44)
+    for n in (200, 2000):
+        paras = make_paragraphs(n, rng)
+        versions = []
+        for _ in range(5):
+            k = rng.randrange(n)
+            paras[k] = make_paragraphs(1, rng)[0]
+            versions.append(parse_ssml("<speak>" + "\n".join(paras) + "</speak>"))
+
+        def full():
+            for root in versions:
+                flatten_text(root); total_duration_seconds(root); validate_tree(root)
+
+        cache = AnalysisCache()
+        cache.analyze(versions[0])  # previous version already analysed
+
+        def cached():
+            for root in versions:
+                cache.analyze(root)
+
+        t_full, t_cached = best(full), best(cached)
+        print(f"{n:5d} paragraphs x 5 edits: full {t_full * 1e3:8.1f} ms   "
+              f"cached {t_cached * 1e3:8.1f} ms   ({t_full / t_cached:.1f}x)  hit rate "
+              f"{cache.hits / (cache.hits + cache.misses):.3f}")
+
+if __name__ == "__main__":
+    main()
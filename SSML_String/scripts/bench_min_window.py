@@ -0,0 +1,46 @@
+from __future__ import annotations
+from pathlib import Path
+import sys, random, time
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from strings_04_min_window_substring import min_window as legacy_min_window
+from src.strings.min_window_stream import MinWindowQuery
+
+# Same query set against many documents: compiled queries vs the Counter version.
+
+def make_docs(n_docs: int, size: int, alphabet: str, rng: random.Random) -> list[str]:
+    return ["".join(rng.choice(alphabet) for _ in range(size)) for _ in range(n_docs)]
+
+def bench(label: str, docs: list[str], queries: list[str]) -> None:
+    t = time.perf_counter()
+    legacy = [legacy_min_window(d, q) for d in docs for q in queries]
+    t_legacy = time.perf_counter() - t
+
+    compiled = [MinWindowQuery(q) for q in queries]
+    t = time.perf_counter()
+    fast = [c.search(d) for d in docs for c in compiled]
+    t_fast = time.perf_counter() - t
+    assert legacy == fast
+
+    # streaming: feed each document in 4 KB chunks, never holding it whole
+    t = time.perf_counter()
+    for d in docs:
+        for c in compiled:
+            c.reset()
+            for i in range(0, len(d), 4096):
+                c.feed(d[i:i + 4096])
+    t_stream = time.perf_counter() - t
+    print(f"{label:<28} legacy {t_legacy:7.3f}s  compiled {t_fast:7.3f}s "
+          f"({t_legacy / t_fast:4.1f}x)  streamed {t_stream:7.3f}s")
+
+if __name__ == "__main__":
+    rng = random.Random(1)
+    queries = ["ABC", "aeiou", "xyz", "SSML"]
+    bench("ascii letters, 20 x 50k", make_docs(20, 50_000, "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz ", rng), queries)
+    bench("dense alphabet, 20 x 50k", make_docs(20, 50_000, "ABCSaeiouxyzL", rng), queries)
+    uni_q = ["αβγ", "ñé"]
+    bench("unicode, 20 x 50k", make_docs(20, 50_000, "αβγδεñéabc ", rng), uni_q)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+from pathlib import Path
+import sys, random
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.duration import estimate_duration
+from src.ssml.planner import EngineModel, LocalEngine, Segment, plan, run_plan, split_segments
+
+# Multi-voice chapter through the stand-in engines (LocalEngine sleeps for the
+# modelled synthesis cost, scaled by TIME_SCALE). Baselines: the whole document
+# as one request to one engine (today), and the segments one after another on a
+# single worker. Times are reported in modelled seconds (wall / TIME_SCALE).
+
+TIME_SCALE = 0.005
+WORDS = "welcome to the show tonight we talk about speech synthesis and markup".split()
+VOICES = ["en-US-JennyNeural", "en-GB-RyanNeural", "de-DE-KatjaNeural"]
+MODEL = EngineModel({"en-US-JennyNeural": 0.2, "en-GB-RyanNeural": 0.3, "de-DE-KatjaNeural": 0.45},
+                    overhead=0.3)
+
+def chapter(rng: random.Random, sections: int) -> str:
+    out = ["<speak>"]
+    for _ in range(sections):
+        out.append(f'<voice name="{rng.choice(VOICES)}">')
+        for _ in range(rng.randint(1, 6)):
+            n = rng.choice([8, 20, 60, 150])
+            out.append(f'<p><s>{" ".join(rng.choice(WORDS) for _ in range(n))}.</s>'
+                       f'<break time="{rng.randrange(800)}ms"/></p>')
+        out.append("</voice>")
+    out.append("</speak>")
+    return "".join(out)
+
+def main() -> None:
+    rng = random.Random(46)
+    root = parse_ssml(chapter(rng, 30))
+    segs = split_segments(root, max_seconds=20.0)
+    engine = LocalEngine(MODEL, time_scale=TIME_SCALE)
+    total = estimate_duration(root).total
+    print(f"{len(segs)} segments, {total:.0f} s of audio")
+
+    # one request for everything, at the same per-voice synthesis speeds
+    work = sum(s.seconds * MODEL.rtf[s.voice] for s in segs)
+    one = EngineModel(default_rtf=work / total, overhead=MODEL.overhead)
+    whole = Segment(0, None, "", total, 0)
+    r = run_plan(plan([whole], 1, one), LocalEngine(one, time_scale=TIME_SCALE))
+    print(f"{'whole document':>24}: ttfa {r.ttfa / TIME_SCALE:7.1f}  makespan {r.makespan / TIME_SCALE:7.1f}")
+    for workers, strategy in [(1, "ordered"), (4, "ordered"), (4, "lpt"), (4, "hybrid"),
+                              (8, "ordered"), (8, "lpt"), (8, "hybrid")]:
+        p = plan(segs, workers, MODEL, strategy)
+        r = run_plan(p, engine)
+        print(f"{f'{workers} x {strategy}':>24}: ttfa {r.ttfa / TIME_SCALE:7.1f}  makespan "
+              f"{r.makespan / TIME_SCALE:7.1f}  (predicted {p.ttfa:6.1f} / {p.makespan:6.1f}, "
+              f"playback stall {p.stall:5.1f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+from pathlib import Path
+import sys, random, time
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from src.strings.prefix_index import PrefixIndex, longest_common_prefix
+
+# A 1M-entry synthetic lexicon: bulk build, marshal load vs rebuild, and the
+# editor queries (autocomplete with a limit, longest prefix match, LCP of a
+# completion set) vs a linear scan / per-length set probes / vertical scanning.
+
+SYLLABLES = "ka lo mi ne ru sa to vi pe da ri mo su na le ti".split()
+
+def make_lexicon(n: int, rng: random.Random):
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 6))))
+    return list(words)
+
+def vertical_lcp(strs) -> str:
+    # the previous strings_all_in_one.longest_common_prefix
+    shortest = min(strs, key=len)
+    for i, ch in enumerate(shortest):
+        for s in strs:
+            if s[i] != ch:
+                return shortest[:i]
+    return shortest
+
+def timed(fn, repeat: int = 1):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(49)
+    words = make_lexicon(n, rng)
+    idx, t_build = timed(lambda: PrefixIndex(words))
+    data = idx.dumps()
+    _, t_load = timed(lambda: PrefixIndex.loads(data))
+    print(f"{n} words: build {t_build:.2f} s   dumps {len(data) / 1e6:.1f} MB   loads {t_load * 1e3:.0f} ms")
+
+    prefixes = [w[:rng.randint(2, 5)] for w in rng.sample(words, 2000)]
+    _, t = timed(lambda: [idx.complete(p, 10) for p in prefixes], 3)
+    _, t_scan = timed(lambda: [[w for w in words if w.startswith(p)][:10] for p in prefixes[:5]])
+    print(f"complete(limit=10): {t / len(prefixes) * 1e6:7.1f} us/query   "
+          f"linear scan {t_scan / 5 * 1e6:9.0f} us/query")
+
+    texts = ["".join(rng.choice(SYLLABLES) for _ in range(12)) for _ in range(2000)]
+    wordset = set(words)
+    _, t = timed(lambda: [idx.longest_prefix_match(s) for s in texts], 3)
+    _, t_set = timed(lambda: [next((s[:k] for k in range(len(s), 0, -1) if s[:k] in wordset), None)
+                              for s in texts], 3)
+    print(f"longest_prefix_match: {t / len(texts) * 1e6:5.1f} us/query   "
+          f"set probes per length {t_set / len(texts) * 1e6:5.1f} us/query")
+
+    _, t = timed(lambda: [idx.common_prefix(p) for p in prefixes], 3)
+    group = [w for w in words if w.startswith("ka")]
+    _, t_vert = timed(lambda: vertical_lcp(group), 3)
+    _, t_mm = timed(lambda: longest_common_prefix(group), 3)
+    print(f"common_prefix: {t / len(prefixes) * 1e6:5.1f} us/query   LCP of {len(group)} words: "
+          f"vertical scan {t_vert * 1e3:.1f} ms, min/max {t_mm * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
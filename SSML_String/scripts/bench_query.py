@@ -0,0 +1,61 @@
+from __future__ import annotations
+from pathlib import Path
+import sys, random, time
+import xml.etree.ElementTree as ET
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.query import TreeIndex
+
+# Dozens of structural queries per document: index once vs iter() scans per query.
+
+VOICES = ["en-US-Jenny", "en-US-Guy", "en-GB-Libby", "en-AU-Natasha"]
+MODES = ["date", "digits", "ordinal", "characters", "telephone"]
+
+def make_doc(n_paragraphs: int, rng: random.Random) -> str:
+    parts = ["<speak>"]
+    for i in range(n_paragraphs):
+        parts.append(f'<voice name="{rng.choice(VOICES)}"><p>')
+        for _ in range(4):
+            parts.append(f'<s>Item {i} <say-as interpret-as="{rng.choice(MODES)}">{rng.randrange(9999)}</say-as>'
+                         f' and <prosody rate="slow">more</prosody> text.</s><break time="{rng.randrange(900)}ms"/>')
+        parts.append("</p></voice>")
+    parts.append("</speak>")
+    return "".join(parts)
+
+def scan_query(root: ET.Element, voice: str, mode: str) -> list[ET.Element]:
+    """The hand-written way: nested iter() scans."""
+    out = []
+    for v in root.iter("voice"):
+        if v.attrib.get("name") == voice:
+            for el in v.iter("say-as"):
+                if el.attrib.get("interpret-as") == mode:
+                    out.append(el)
+    return out
+
+if __name__ == "__main__":
+    rng = random.Random(7)
+    queries = [(v, m) for v in VOICES for m in MODES]  # 20 queries per document
+    for n in (100, 1000, 5000):
+        root = parse_ssml(make_doc(n, rng))
+
+        t = time.perf_counter()
+        scanned = [scan_query(root, v, m) for v, m in queries]
+        scanned += [list(root.iter("break")) for _ in range(5)]
+        t_scan = time.perf_counter() - t
+
+        t = time.perf_counter()
+        idx = TreeIndex(root)
+        t_build = time.perf_counter() - t
+        t = time.perf_counter()
+        indexed = [idx.select(f"voice[@name='{v}']//say-as[@interpret-as='{m}']") for v, m in queries]
+        indexed += [idx.select("//break") for _ in range(5)]
+        t_query = time.perf_counter() - t
+
+        assert scanned == indexed
+        print(f"{len(idx):>7} elements, {len(scanned)} queries: iter scans {t_scan * 1000:8.1f}ms | "
+              f"index build {t_build * 1000:7.1f}ms + queries {t_query * 1000:7.1f}ms")
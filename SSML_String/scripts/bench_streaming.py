@@ -0,0 +1,60 @@
+from __future__ import annotations
+from pathlib import Path
+import os, sys, random, subprocess, tempfile, time
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+# Peak RSS of duration + word count on growing SSML files: build-the-tree
+# (parse_ssml + total_duration_seconds) vs the streaming pass. Each measurement
+# runs in a fresh child process so ru_maxrss is per run.
+
+WORDS = "welcome to the show tonight we talk about speech synthesis and markup".split()
+
+def write_doc(path: str, mb: int, rng: random.Random) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<speak>")
+        written = 0
+        while written < mb << 20:
+            text = " ".join(rng.choice(WORDS) for _ in range(25))
+            p = f'<p><s>{text} <sub alias="New York">NY</sub></s><break time="{rng.randrange(900)}ms"/></p>\n'
+            f.write(p)
+            written += len(p)
+        f.write("</speak>")
+
+def child(mode: str, path: str) -> None:
+    import resource
+    t = time.perf_counter()
+    if mode == "tree":
+        from src.ssml.simple_etree import parse_ssml
+        from src.ssml.transforms import total_duration_seconds
+        with open(path, encoding="utf-8") as f:
+            result = total_duration_seconds(parse_ssml(f.read()))
+    else:
+        from src.ssml.streaming import stream_total_duration_seconds
+        with open(path, "rb") as f:
+            result = stream_total_duration_seconds(f)
+    elapsed = time.perf_counter() - t
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB -> MB on Linux
+    print(f"{result} {elapsed:.2f} {rss:.1f}")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+        sys.exit()
+    sizes = [int(a) for a in sys.argv[1:]] or [4, 16, 64]
+    rng = random.Random(6)
+    with tempfile.TemporaryDirectory() as tmp:
+        for mb in sizes:
+            path = os.path.join(tmp, f"doc{mb}.xml")
+            write_doc(path, mb, rng)
+            row = []
+            for mode in ("tree", "stream"):
+                out = subprocess.run([sys.executable, __file__, "--child", mode, path],
+                                     capture_output=True, text=True, check=True).stdout.split()
+                row.append(out)
+            assert row[0][0] == row[1][0], row
+            print(f"{mb:>4} MB: tree {row[0][1]}s peak RSS {row[0][2]:>7} MB | "
+                  f"stream {row[1][1]}s peak RSS {row[1][2]:>6} MB | duration {row[0][0]}s")
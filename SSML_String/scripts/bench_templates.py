@@ -0,0 +1,62 @@
+from __future__ import annotations
+from pathlib import Path
+import sys, time
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.transforms import flatten_text, total_duration_seconds
+from src.ssml.edge_cases import validate_tree
+from src.ssml.templates import Template
+
+# Generated prompts: render + parse_ssml + flatten_text + total_duration_seconds
+# + validate_tree per instance, vs Template.analyze (no parse, no tree walk).
+
+PROMPTS = {
+    "short": '<speak>Hello {name}, your code is <say-as interpret-as="digits">{code:int}</say-as>.</speak>',
+    "order": ('<speak><p><s>Hi {name}, thanks for your order.</s>'
+              '<s>Order <say-as interpret-as="characters">{order}</say-as> with {items:int} items '
+              'ships on <say-as interpret-as="date" format="mdy">{date}</say-as>.</s></p>'
+              '<break time="{pause:time}"/><p><s>Your total is <prosody rate="slow">{total:float} '
+              'dollars</prosody>.</s><s>Questions? Call <sub alias="support">{phone}</sub> any time.</s></p>'
+              '<p><s>We ship from <emphasis level="moderate">{city}</emphasis>, usually within '
+              '{days:int} business days, and track every parcel until it arrives.</s></p></speak>'),
+    # mostly fixed boilerplate around a few slots
+    "notice": ('<speak><p><s>Dear {name},</s></p>' + "".join(
+        f'<p><s>Section {i}: this message explains the terms of your account and what changes '
+        f'on the effective date.</s><s>Please read it carefully <break strength="medium"/> '
+        f'and keep it for your records.</s></p>' for i in range(12))
+        + '<p><s>Your reference is <say-as interpret-as="characters">{order}</say-as>.</s></p></speak>'),
+}
+
+VALUES = {"name": "Ann Lee", "code": 482913, "order": "AB12", "items": 3, "date": "10/19/2026",
+          "pause": "400ms", "total": 42.5, "phone": "555 0100", "city": "Rotterdam", "days": 4}
+
+def best(fn, n: int, repeat: int = 5) -> float:
+    t = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        t = min(t, time.perf_counter() - t0)
+    return t / n
+
+def main() -> None:
+    for label, src in PROMPTS.items():
+        t = Template(src)
+
+        def slow():
+            root = parse_ssml(t.render(VALUES))
+            return flatten_text(root), total_duration_seconds(root), validate_tree(root)
+
+        fast = lambda: t.analyze(VALUES)
+        out = fast()
+        assert (out.text, out.duration_seconds, out.issues) == slow()
+        a, b = best(slow, 2000), best(fast, 2000)
+        print(f"{label:>6}: parse+analyze {a * 1e6:7.1f} us   template {b * 1e6:6.1f} us   ({a / b:.0f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+from pathlib import Path
+import sys, random, time
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from src.strings.top_k_freq import top_k_from_counts, choose_top_k_method
+
+# Usage:
+#   python scripts/bench_top_k.py            # vocabularies 1e4, 1e5, 1e6
+#   python scripts/bench_top_k.py --full     # adds 1e7 (needs a few GB of RAM)
+
+def legacy_lambda_sort(counts, k):
+    """Baseline: the original Counter + sort(key=lambda) approach."""
+    return [w for w, _ in sorted(counts.items(), key=lambda x: (-x[1], x[0]))[:k]]
+
+def zipf_counts(n: int, rng: random.Random) -> dict[str, int]:
+    words = [f"w{i}" for i in range(n)]
+    rng.shuffle(words)
+    return {w: max(1, 10**6 // (i + 1)) + rng.randrange(3) for i, w in enumerate(words)}
+
+def timed(fn, *args):
+    t = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t
+
+if __name__ == "__main__":
+    sizes = [10**4, 10**5, 10**6] + ([10**7] if "--full" in sys.argv else [])
+    rng = random.Random(42)
+    print(f"{'vocab':>9} {'k':>8} {'method':>7}" + "".join(f"{h:>11}" for h in ("lambda", "sort", "heap", "select", "auto")))
+    for n in sizes:
+        counts = zipf_counts(n, rng)
+        for k in sorted({10, 100, n // 1000, n // 100, n // 10, n // 2}):
+            row = []
+            base, t = timed(legacy_lambda_sort, counts, k)
+            row.append(t)
+            for m in ("sort", "heap", "select", "auto"):
+                out, t = timed(top_k_from_counts, counts, k, m)
+                assert out == base, (n, k, m)
+                row.append(t)
+            cells = "".join(f"{t * 1000:9.1f}ms" for t in row)
+            print(f"{n:>9} {k:>8} {choose_top_k_method(n, k):>7}{cells}")
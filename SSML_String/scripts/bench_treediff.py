@@ -0,0 +1,60 @@
+from __future__ import annotations
+from pathlib import Path
+import sys, copy, random, time
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+import xml.etree.ElementTree as ET
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.treediff import diff_trees, format_edit
+
+# diff_trees on chapters of growing size with a handful of scattered edits
+# (break times, prosody rates, a rewritten sentence, a dropped and an added
+# paragraph). Unchanged regions are matched by subtree id, so the time is
+# dominated by the one hashing pass over both trees.
+
+WORDS = "welcome to the show tonight we talk about speech synthesis and markup".split()
+
+def chapter(n_paras: int, rng: random.Random) -> str:
+    out = ["<speak>"]
+    for _ in range(n_paras):
+        out.append("<p>")
+        for _ in range(3):
+            out.append(f'<s>{" ".join(rng.choice(WORDS) for _ in range(8))} '
+                       f'<prosody rate="{rng.choice(["slow", "medium", "fast"])}">'
+                       f'{rng.choice(WORDS)}</prosody></s><break time="{rng.randrange(900)}ms"/>')
+        out.append("</p>\n")
+    out.append("</speak>")
+    return "".join(out)
+
+def edit(root: ET.Element, rng: random.Random) -> None:
+    paras = list(root)
+    for _ in range(5):
+        rng.choice(rng.choice(paras).findall("break")).set("time", "1s")
+        rng.choice(list(rng.choice(paras).iter("prosody"))).set("rate", "x-fast")
+    s = rng.choice(paras).find("s")
+    s.text = "rewritten sentence"
+    root.remove(paras[len(paras) // 2])
+    new = copy.deepcopy(paras[0])
+    new[0].text = "an added paragraph"
+    root.insert(len(paras) // 3, new)
+
+def main() -> None:
+    rng = random.Random(45)
+    for n in (1000, 5000, 15000):
+        a = parse_ssml(chapter(n, rng))
+        b = copy.deepcopy(a)
+        edit(b, rng)
+        size = sum(1 for _ in a.iter())
+        t = time.perf_counter()
+        edits = diff_trees(a, b)
+        dt = time.perf_counter() - t
+        print(f"{size:7d} elements: {dt:6.2f} s, {len(edits)} edits")
+    for e in edits[:6]:
+        print("  ", format_edit(e))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+from pathlib import Path
+import argparse, asyncio, os, random, sys, time
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from src.ssml.service import SSMLService, ServiceBusy
+
+# Load test for the async facade with a local stand-in client: C concurrent
+# "connections" each fire requests back to back, drawn from a small pool of
+# documents (so duplicates exercise coalescing). Reports latency percentiles and
+# event-loop lag (how late a 10ms ticker wakes up), which shows whether CPU work
+# is kept off the loop.
+
+WORDS = "welcome to the show tonight we talk about speech synthesis and markup".split()
+OPS = ("flatten", "duration", "validate", "edge_cases")
+
+def make_doc(rng: random.Random, n: int) -> str:
+    parts = ["<speak>"]
+    for _ in range(n):
+        text = " ".join(rng.choice(WORDS) for _ in range(20))
+        parts.append(f'<p>{text} <sub alias="New York">NY</sub> <break time="{rng.randrange(900)}ms"/></p>')
+    parts.append("</speak>")
+    return "".join(parts)
+
+def pct(sorted_vals, q: float) -> float:
+    return sorted_vals[min(int(q * len(sorted_vals)), len(sorted_vals) - 1)]
+
+async def ticker(stop: asyncio.Event, lags: list) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        t = loop.time()
+        await asyncio.sleep(0.01)
+        lags.append(loop.time() - t - 0.01)
+
+async def client(svc: SSMLService, docs, n: int, rng: random.Random, lat: list, errors: list) -> None:
+    for _ in range(n):
+        op, doc = rng.choice(OPS), rng.choice(docs)
+        t = time.perf_counter()
+        try:
+            await svc.submit(op, doc, timeout=5.0)
+        except (asyncio.TimeoutError, ServiceBusy) as e:
+            errors.append(type(e).__name__)
+            continue
+        lat.append(time.perf_counter() - t)
+
+async def run(executor: str, clients: int, per_client: int, docs, workers: int, queue: int) -> None:
+    lat, errors, lags = [], [], []
+    stop = asyncio.Event()
+    async with SSMLService(executor, max_workers=workers, queue_size=queue) as svc:
+        tick = asyncio.create_task(ticker(stop, lags))
+        t0 = time.perf_counter()
+        await asyncio.gather(*(client(svc, docs, per_client, random.Random(i), lat, errors)
+                               for i in range(clients)))
+        wall = time.perf_counter() - t0
+        stop.set()
+        await tick
+        stats = svc.stats.to_dict()
+    lat.sort()
+    lags.sort()
+    print(f"{executor:<8} {len(lat)} ok / {len(errors)} err in {wall:.2f}s ({len(lat) / wall:.0f} req/s) | "
+          f"p50 {pct(lat, 0.5) * 1000:.1f}ms p99 {pct(lat, 0.99) * 1000:.1f}ms | "
+          f"loop lag p99 {pct(lags, 0.99) * 1000:.1f}ms | coalesced {stats['coalesced']}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=32)
+    ap.add_argument("--requests", type=int, default=50, help="per client")
+    ap.add_argument("--docs", type=int, default=40, help="distinct documents")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--queue", type=int, default=64)
+    args = ap.parse_args()
+    rng = random.Random(7)
+    docs = [make_doc(rng, rng.randint(5, 60)) for _ in range(args.docs)]
+    print(f"{args.clients} clients x {args.requests} requests, {args.docs} docs, "
+          f"{args.workers} worker(s) on {os.cpu_count()} CPU(s)")
+    for executor in ("thread", "process"):
+        asyncio.run(run(executor, args.clients, args.requests, docs, args.workers, args.queue))
@@ -9,6 +9,7 @@ PROJ_ROOT = THIS_DIR.parent
 sys.path.insert(0, str(PROJ_ROOT))
 
 from src.ssml.simple_etree import parse_ssml
+from src.ssml.normalize import join_words
 
 SAMPLE = """<speak>
   Hello <sub alias="NYC">New York City</sub> fans!
@@ -77,7 +78,7 @@ if __name__ == "__main__":
     buf: list[str] = []
     dfs_flatten_reading_order(root, buf)
     # normalize spaces lightly for display
-    text = " ".join(" ".join(buf).split())
+    text = join_words(buf)
     print(text)
 
     print("\n=== DFS with style inheritance (prosody) ===")
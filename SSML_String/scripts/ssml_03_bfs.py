@@ -9,6 +9,7 @@ PROJ_ROOT = THIS_DIR.parent
 sys.path.insert(0, str(PROJ_ROOT))
 
 from src.ssml.simple_etree import parse_ssml
+from src.ssml.stats import DocStats
 
 SAMPLE = """<speak>
   <p id="intro">Hello <sub alias="NYC">New York City</sub> fans!</p>
@@ -37,26 +38,23 @@ def bfs_levels(root: ET.Element):
         print(f"depth {depth}: {levels[depth]}")
 
 def bfs_collect_tags_and_attrs(root: ET.Element):
-    """Collect tag frequencies and distinct attributes by tag."""
-    q = collections.deque([root])
-    tag_freq: dict[str, int] = {}
-    attrs_by_tag: dict[str, set[str]] = {}
+    """Collect tag frequencies and distinct attributes by tag.
 
-    while q:
-        el = q.popleft()
-        tag_freq[el.tag] = tag_freq.get(el.tag, 0) + 1
-        if el.attrib:
-            attrs_by_tag.setdefault(el.tag, set()).update(el.attrib.keys())
-        for c in list(el):
-            q.append(c)
+    Counting is done by DocStats (src/ssml/stats.py), the same one-pass,
+    mergeable collector the batch/corpus path uses.
+    """
+    st = DocStats()
+    st.add(root)
 
     print("\n=== Tag Frequencies ===")
-    for t, n in sorted(tag_freq.items(), key=lambda x: (-x[1], x[0])):
+    for t, n in sorted(st.tags.items(), key=lambda x: (-x[1], x[0])):
         print(f"{t}: {n}")
 
     print("\n=== Attributes Seen by Tag ===")
+    attrs_by_tag = st.attributes_by_tag()
     for t in sorted(attrs_by_tag):
-        print(f"{t}: {sorted(attrs_by_tag[t])}")
+        print(f"{t}: {attrs_by_tag[t]}")
+    return st
 
 if __name__ == "__main__":
     root = parse_ssml(SAMPLE)
@@ -10,6 +10,7 @@ PROJ_ROOT = THIS_DIR.parent
 sys.path.insert(0, str(PROJ_ROOT))
 
 from src.ssml.simple_etree import parse_ssml
+from src.ssml.normalize import join_words
 
 SAMPLE = """<speak>
   Welcome to <sub alias="New York City">NYC</sub>!
@@ -38,7 +39,7 @@ if __name__ == "__main__":
 
     buf: list[str] = []
     flatten_with_subs(root, buf)
-    text = " ".join(" ".join(buf).split())
+    text = join_words(buf)
 
     print("=== Flattened Text with <sub> handled ===")
     print(text)
\ No newline at end of file
@@ -10,6 +10,7 @@ PROJ_ROOT = THIS_DIR.parent
 sys.path.insert(0, str(PROJ_ROOT))
 
 from src.ssml.simple_etree import parse_ssml
+from src.ssml.normalize import join_words
 
 SAMPLE = """<speak>
   Spell out: <say-as interpret-as="characters">HTML</say-as>.
@@ -60,7 +61,7 @@ if __name__ == "__main__":
 
     buf: list[str] = []
     flatten_with_say_as(root, buf)
-    text = " ".join(" ".join(buf).split())
+    text = join_words(buf)
 
     print("=== Flattened Text with <say-as> handled ===")
     print(text)
\ No newline at end of file
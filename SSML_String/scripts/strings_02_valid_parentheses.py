@@ -1,27 +1,36 @@
 
 
+from pathlib import Path
 import sys
 import unittest
 
-def is_valid_brackets(s: str) -> bool:
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from src.strings.markup_tokens import as_tokens, OPEN, CLOSE
+
+_MATCH = {')': '(', ']': '[', '}': '{'}
+
+def is_valid_brackets(s) -> bool:
     """
     Return True if all (), [], {} are balanced and properly nested.
     Non-bracket characters are ignored.
+    `s` may be a str or a Tokens array built with brackets=True (shared with
+    the markup checker / parser, so the text is not scanned again).
     """
-    close_to_open = {')': '(', ']': '[', '}': '{'}
-    opens = set(close_to_open.values())
+    toks = as_tokens(s, brackets=True)
+    text = toks.text
     stack = []
 
-    for ch in s:
-        if ch in opens:
-            stack.append(ch)
-        elif ch in close_to_open:
-            if not stack or stack[-1] != close_to_open[ch]:
+    for kind, a, _ in toks:
+        if kind == OPEN:
+            stack.append(text[a])
+        elif kind == CLOSE:
+            if not stack or stack[-1] != _MATCH[text[a]]:
                 return False
             stack.pop()
-        else:
-            # ignore other characters
-            continue
 
     return len(stack) == 0
 
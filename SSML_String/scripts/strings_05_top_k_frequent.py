@@ -4,6 +4,7 @@ import sys
 import unittest
 from collections import Counter
 import heapq
+from operator import neg
 
 def top_k_frequent_sort(words, k):
     """
@@ -16,42 +17,16 @@ def top_k_frequent_sort(words, k):
 
 def top_k_frequent_heap(words, k):
     """
-    Min-heap solution for large streams.
-    Keep heap of size k with ordering by (freq asc, word desc),
-    so the smallest-by-rules item is popped first.
+    Heap solution for large vocabularies.
+    Encode each entry as (-freq, word) so tuple order *is* the required order,
+    then let heapq.nsmallest keep a bounded heap of size k: O(n log k).
+    Keys are built with map/zip, so heap comparisons stay in C (no wrapper
+    objects with a Python-level __lt__, no re-sort with cnt[w] lookups).
     """
     cnt = Counter(words)
-    heap = []
-    for w, f in cnt.items():
-        # Python's heap is min-heap; to prefer lexicographically smaller words
-        # on ties of frequency, we push (-ord) by reversing word order via a trick:
-        # We want to eject lexicographically larger words first at equal freq,
-        # so we keep (f, -word) equivalently by using a tuple (f, reverse_flag, w).
-        # Simpler: use (f, -ord) is messy; instead store (f, invert word ordering)
-        # Use (f, WordNeg(w)) by pushing (f, tuple of negative code points) is overkill.
-        # Easiest: push (f, ReverseLex(w)) simulated by using (f, -w) not possible.
-        # Practical approach: push (f, -1*alphabetic rank) is not clean either.
-        # Therefore a standard trick: store (f, WordWrap) where WordWrap compares inverted.
-        # Python heapq doesn't allow custom comparators, so we'll invert by storing (f, Invert(w)).
-        # We'll store (f, Inverter(w)) where Inverter has __lt__ reversed. Keep it simple:
-        heapq.heappush(heap, (f, _Rev(w)))
-        if len(heap) > k:
-            heapq.heappop(heap)
-    # extract and sort by our final required ordering (-freq, word)
-    result = [item[1].s for item in heap]
-    result.sort(key=lambda w: (-cnt[w], w))
-    return result
-
-class _Rev:
-    """
-    Helper wrapper to invert lexicographic ordering inside the heap for ties.
-    We want the heap (which pops smallest) to treat lexicographically *larger* words as smaller,
-    so they are popped first when heap exceeds size k.
-    """
-    __slots__ = ("s",)
-    def __init__(self, s): self.s = s
-    def __lt__(self, other):  # invert normal order
-        return self.s > other.s
+    if k <= 0:
+        return []
+    return [w for _, w in heapq.nsmallest(k, zip(map(neg, cnt.values()), cnt.keys()))]
 
 # -------- sample runner --------
 
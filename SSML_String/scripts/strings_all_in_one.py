@@ -1,6 +1,16 @@
 import sys
 import unittest
 from collections import Counter, defaultdict, deque
+from pathlib import Path
+
+# make project root importable when running this script directly
+THIS_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = THIS_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+# roman_to_int lives with the say-as expansion (it also rejects non-canonical
+# numerals such as "IIII" by returning None)
+from src.ssml.say_as import roman_to_int
 
 # ============================================================
 # String Utilities: "All-in-One" reference implementations
@@ -189,48 +199,52 @@ def valid_palindrome_alnum(s: str) -> bool:
 
 def longest_common_prefix(strs) -> str:
     """
-    LCP across strings by vertical scanning.
-    Time: O(sum of lengths), Space: O(1)
+    LCP across strings: the LCP of the set equals the LCP of its
+    lexicographically smallest and largest strings, so only those two are
+    compared (min/max run in C).
+    Time: O(sum of lengths) for min/max + O(LCP), Space: O(1)
+    (For repeated prefix queries over a word list see src/strings/prefix_index.py.)
     """
     if not strs: return ""
-    shortest = min(strs, key=len)
-    for i, ch in enumerate(shortest):
-        for s in strs:
-            if s[i] != ch:
-                return shortest[:i]
-    return shortest
+    lo, hi = min(strs), max(strs)
+    for i, ch in enumerate(lo):
+        if hi[i] != ch:
+            return lo[:i]
+    return lo
+
+def kmp_prefix_function(p: str):
+    """
+    pi[i] = length of the longest proper prefix of p[:i+1] that is also its suffix.
+    Time: O(m)
+    """
+    pi = [0] * len(p)
+    k = 0
+    for i in range(1, len(p)):
+        while k and p[i] != p[k]:
+            k = pi[k-1]
+        if p[i] == p[k]:
+            k += 1
+        pi[i] = k
+    return pi
 
 def str_str(haystack: str, needle: str) -> int:
     """
-    Substring search (KMP for O(n+m)). Here: simple linear scan for clarity.
-    Time: O(n*m) worst-case; OK for interview scaffolding.
+    Substring search with KMP: never re-reads haystack characters.
+    Time: O(n + m), Space: O(m)
+    (For many patterns at once see src/strings/multi_search.py — Aho–Corasick.)
     """
     if needle == "": return 0
-    n, m = len(haystack), len(needle)
-    for i in range(n - m + 1):
-        if haystack[i:i+m] == needle:
-            return i
+    pi = kmp_prefix_function(needle)
+    m, k = len(needle), 0
+    for i, ch in enumerate(haystack):
+        while k and ch != needle[k]:
+            k = pi[k-1]
+        if ch == needle[k]:
+            k += 1
+            if k == m:
+                return i - m + 1
     return -1
 
-def roman_to_int(s: str) -> int:
-    """
-    Convert Roman numeral to integer.
-    Handles subtraction pairs (IV, IX, XL, XC, CD, CM).
-    Time: O(n)
-    """
-    val = {'I':1,'V':5,'X':10,'L':50,'C':100,'D':200//2,'M':1000}  # D=500 (kept simple)
-    val['D'] = 500
-    total = 0
-    i = 0
-    while i < len(s):
-        if i+1 < len(s) and val[s[i]] < val[s[i+1]]:
-            total += val[s[i+1]] - val[s[i]]
-            i += 2
-        else:
-            total += val[s[i]]
-            i += 1
-    return total
-
 def add_binary(a: str, b: str) -> str:
     """
     Add two binary strings.
@@ -290,6 +304,8 @@ class TestAllInOne(unittest.TestCase):
         self.assertTrue(valid_palindrome_alnum("A man, a plan, a canal: Panama"))
         self.assertEqual(longest_common_prefix(["cir","car"]), "c")
         self.assertEqual(str_str("aaaaa","bba"), -1)
+        self.assertEqual(str_str("aabaaabaaac","aabaaac"), 4)
+        self.assertEqual(str_str("hello","ll"), 2)
         self.assertEqual(roman_to_int("LVIII"), 58)
         self.assertEqual(add_binary("11","1"), "100")
         self.assertTrue(rotate_string("abcde","cdeab"))
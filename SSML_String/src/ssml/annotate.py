@@ -0,0 +1,163 @@
+from __future__ import annotations
+import marshal
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+from ..strings.multi_search import AhoCorasick
+
+# Dictionary-driven auto-annotation of plain text:
+#   "Dr. Smith lives in NYC" -> <speak><sub alias="Doctor">Dr.</sub> Smith lives in
+#                                      <sub alias="New York City">NYC</sub></speak>
+# All abbreviations are compiled into one Aho–Corasick automaton, so a document is
+# scanned once regardless of dictionary size; overlapping hits are resolved
+# leftmost-longest at word boundaries.
+
+class Expansion(NamedTuple):
+    tag: str            # "sub" or "say-as"
+    value: str          # sub alias, or say-as interpret-as mode
+
+    def attrs(self) -> Dict[str, str]:
+        if self.tag == "sub":
+            return {"alias": self.value}
+        return {"interpret-as": self.value}
+
+# (start, end, tag, attrs) over the source text
+Span = Tuple[int, int, str, Dict[str, str]]
+
+_MAGIC = b"ABBR"
+_FORMAT_VERSION = 1
+
+def spans_to_tree(text: str, spans: Iterable[Span], root_tag: str = "speak") -> ET.Element:
+    """Build <root_tag> with one child element per (non-overlapping, sorted) span.
+
+    Text between spans becomes root.text / child.tail, so the result is what
+    parse_ssml would return for the equivalent markup.
+    """
+    root = ET.Element(root_tag)
+    last = None
+    pos = 0
+    for start, end, tag, attrs in spans:
+        gap = text[pos:start]
+        if last is None:
+            root.text = gap or None
+        else:
+            last.tail = gap or None
+        last = ET.SubElement(root, tag, attrs)
+        last.text = text[start:end]
+        pos = end
+    rest = text[pos:]
+    if last is None:
+        root.text = rest or None
+    else:
+        last.tail = rest or None
+    return root
+
+def annotate_tree(root: ET.Element, find_spans: Callable[[str], List[Span]]) -> ET.Element:
+    """Wrap the spans `find_spans` reports in the text and tails of `root`, in
+    place; <sub>/<say-as> content is left alone."""
+    def split(text: str) -> Tuple[Optional[str], List[ET.Element]]:
+        spans = find_spans(text)
+        if not spans:
+            return text, []
+        tmp = spans_to_tree(text, spans)
+        return tmp.text, list(tmp)
+
+    def walk(el: ET.Element):
+        if el.tag in ("sub", "say-as"):
+            return
+        children = list(el)
+        rebuilt: List[ET.Element] = []
+        if el.text:
+            el.text, added = split(el.text)
+            rebuilt.extend(added)
+        for c in children:
+            walk(c)
+            rebuilt.append(c)
+            if c.tail:
+                c.tail, added = split(c.tail)
+                rebuilt.extend(added)
+        if len(rebuilt) != len(children):
+            el[:] = rebuilt
+
+    walk(root)
+    return root
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+class AbbreviationAnnotator:
+    """Compiled abbreviation dictionary -> <sub>/<say-as> annotator."""
+    __slots__ = ("keys", "expansions", "_ac")
+
+    def __init__(self, entries: Mapping[str, Union[str, Expansion, Tuple[str, str]]], case_fold: bool = False):
+        self.keys: List[str] = []
+        self.expansions: List[Expansion] = []
+        for abbr, exp in entries.items():
+            if isinstance(exp, str):
+                exp = Expansion("sub", exp)
+            else:
+                exp = Expansion(*exp)
+            if exp.tag not in ("sub", "say-as"):
+                raise ValueError(f"Unsupported expansion tag: {exp.tag}")
+            self.keys.append(abbr)
+            self.expansions.append(exp)
+        self._ac = AhoCorasick(self.keys, case_fold=case_fold)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def find_spans(self, text: str) -> List[Span]:
+        """Leftmost-longest, non-overlapping dictionary hits that sit on word boundaries."""
+        n = len(text)
+        best: Dict[int, Tuple[int, int]] = {}   # start -> (end, pattern id), longest wins
+        keys = self.keys
+        for pid, start in self._ac.finditer(text):
+            key = keys[pid]
+            end = start + len(key)
+            # a boundary is only required where the abbreviation itself starts/ends with a word char
+            if start > 0 and _is_word(key[0]) and _is_word(text[start - 1]):
+                continue
+            if end < n and _is_word(key[-1]) and _is_word(text[end]):
+                continue
+            prev = best.get(start)
+            if prev is None or end > prev[0]:
+                best[start] = (end, pid)
+        spans: List[Span] = []
+        pos = 0
+        for start in sorted(best):
+            if start < pos:
+                continue
+            end, pid = best[start]
+            exp = self.expansions[pid]
+            spans.append((start, end, exp.tag, exp.attrs()))
+            pos = end
+        return spans
+
+    def annotate_text(self, text: str, root_tag: str = "speak") -> ET.Element:
+        """Plain text -> SSML tree ready for flatten_text / total_duration_seconds."""
+        return spans_to_tree(text, self.find_spans(text), root_tag)
+
+    def annotate_element(self, root: ET.Element) -> ET.Element:
+        """Annotate text and tails of an existing tree in place (skips <sub>/<say-as> content)."""
+        return annotate_tree(root, self.find_spans)
+
+    # ---------- compiled dictionary persistence ----------
+
+    def dumps(self) -> bytes:
+        exps = [tuple(e) for e in self.expansions]
+        return _MAGIC + bytes([_FORMAT_VERSION]) + marshal.dumps((self.keys, exps, self._ac.dumps()))
+
+    @classmethod
+    def loads(cls, data: bytes) -> "AbbreviationAnnotator":
+        if len(data) < 5 or data[:4] != _MAGIC or data[4] != _FORMAT_VERSION:
+            raise ValueError("Not a compiled abbreviation dictionary (or unsupported version)")
+        try:
+            keys, exps, ac = marshal.loads(data[5:])
+            expansions = [Expansion(*e) for e in exps]
+            automaton = AhoCorasick.loads(ac)
+        except (EOFError, ValueError, TypeError):
+            raise ValueError("Truncated or corrupt abbreviation dictionary") from None
+        ann = cls.__new__(cls)
+        ann.keys = keys
+        ann.expansions = expansions
+        ann._ac = automaton
+        return ann
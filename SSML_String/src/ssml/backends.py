@@ -0,0 +1,197 @@
+from __future__ import annotations
+import html
+import re
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence
+from .node import Node
+from .tiny_parser import parse_tiny
+from ..strings.markup_tokens import tokenize, TEXT, START, END, SELF, EMPTY, UNCLOSED
+
+# Parser backends behind one parse() call. Every backend returns an
+# ET.Element tree and raises ET.ParseError on input it cannot handle.
+#
+#   etree     ET.fromstring (expat, C) - the default for in-memory text
+#   pull      expat fed incrementally: file objects, chunk iterables, and large
+#             str documents (fed in slices so the whole text is never encoded at once)
+#   tiny      tiny_parser.parse_tiny, converted from Node; no entities, no
+#             single-quoted attributes, no namespaces, no CDATA
+#   tolerant  recovering parser on the markup token stream: auto-closes and
+#             drops stray tags, keeps broken '<' as text, wraps multiple roots in
+#             <speak>; recovery notes go to the optional `issues` list
+#
+# Trees from different backends are equal up to whitespace-only text, which
+# tiny drops.
+
+# features a document may need
+ENTITIES = "entities"
+SINGLE_QUOTES = "single-quotes"
+NAMESPACES = "namespaces"
+CDATA = "cdata"
+RECOVER = "recover"
+STREAM = "stream"
+
+PULL_THRESHOLD = 8 << 20      # str documents at least this long go to the pull backend
+PULL_CHUNK = 1 << 20
+
+class Backend(NamedTuple):
+    name: str
+    parse: Callable[..., ET.Element]
+    features: FrozenSet[str]
+
+# ---- etree / pull ----
+
+def _parse_etree(source, issues: Optional[List[str]] = None) -> ET.Element:
+    return ET.fromstring(source)
+
+def iter_chunks(source, size: int) -> Iterable:
+    """str/bytes slices, file reads, or the items of an iterable of chunks."""
+    if isinstance(source, (str, bytes)):
+        for i in range(0, len(source), size):
+            yield source[i:i + size]
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+def _parse_pull(source, issues: Optional[List[str]] = None, chunk_size: int = PULL_CHUNK) -> ET.Element:
+    parser = ET.XMLParser()
+    for chunk in iter_chunks(source, chunk_size):
+        parser.feed(chunk)
+    return parser.close()
+
+# ---- tiny ----
+
+def node_to_element(node: Node) -> ET.Element:
+    """Convert a tiny_parser Node tree ("#text" children) to ElementTree."""
+    el = ET.Element(node.tag, node.attrs)
+    last: Optional[ET.Element] = None
+    for c in node.children:
+        if c.tag == "#text":
+            if last is None:
+                el.text = (el.text or "") + c.text
+            else:
+                last.tail = (last.tail or "") + c.text
+        else:
+            last = node_to_element(c)
+            el.append(last)
+    return el
+
+def _parse_tiny(source, issues: Optional[List[str]] = None) -> ET.Element:
+    if isinstance(source, bytes):
+        source = source.decode("utf-8")
+    try:
+        top = parse_tiny(source)
+    except ValueError as e:
+        raise ET.ParseError(str(e)) from None
+    elements = [c for c in top.children if c.tag != "#text"]
+    if len(elements) != 1 or len(top.children) != 1:
+        raise ET.ParseError("Expected exactly one root element")
+    return node_to_element(elements[0])
+
+# ---- tolerant ----
+
+_STRAY_LT = re.compile(r"<(?![A-Za-z_:/!?])")  # '<' that cannot open a tag
+_ATTR = re.compile(r"""([^\s=/"']+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>/]+))""")
+
+def _tolerant_attrs(s: str) -> Dict[str, str]:
+    return {m.group(1): html.unescape(m.group(2) if m.group(2) is not None else
+                                      m.group(3) if m.group(3) is not None else m.group(4))
+            for m in _ATTR.finditer(s)}
+
+def _add_text(parent: ET.Element, txt: str) -> None:
+    if len(parent):
+        last = parent[-1]
+        last.tail = (last.tail or "") + txt
+    else:
+        parent.text = (parent.text or "") + txt
+
+def _parse_tolerant(source, issues: Optional[List[str]] = None) -> ET.Element:
+    if isinstance(source, bytes):
+        source = source.decode("utf-8")
+    elif not isinstance(source, str):
+        source = "".join(iter_chunks(source, PULL_CHUNK))
+    notes: List[str] = issues if issues is not None else []
+    s, n = _STRAY_LT.subn("&lt;", source)  # comes back as text through html.unescape
+    if n:
+        notes.append(f"Escaped {n} stray '<'")
+    holder = ET.Element("speak")
+    stack = [holder]
+    for kind, a, b in tokenize(s):
+        if kind == TEXT:
+            _add_text(stack[-1], html.unescape(s[a:b]))
+        elif kind == START or kind == SELF:
+            j = s.find(">", b)
+            body = s[b:j]
+            el = ET.SubElement(stack[-1], s[a:b], _tolerant_attrs(body))
+            if kind == START:
+                stack.append(el)
+        elif kind == END:
+            name = s[a:b]
+            depth = next((k for k in range(len(stack) - 1, 0, -1) if stack[k].tag == name), 0)
+            if not depth:
+                notes.append(f"Dropped stray </{name}> at {a}")
+                continue
+            for el in stack[depth + 1:]:
+                notes.append(f"Auto-closed <{el.tag}> before </{name}>")
+            del stack[depth:]
+        elif kind == EMPTY or kind == UNCLOSED:
+            notes.append(f"Kept malformed tag at {a} as text")
+            _add_text(stack[-1], s[a:b])
+    for el in stack[1:]:
+        notes.append(f"Auto-closed <{el.tag}> at end of input")
+    if len(holder) == 1 and not (holder.text or "").strip() and not (holder[0].tail or "").strip():
+        root = holder[0]
+        root.tail = None
+        return root
+    notes.append("Wrapped top-level content in <speak>")
+    return holder
+
+BACKENDS: Dict[str, Backend] = {
+    "etree": Backend("etree", _parse_etree, frozenset({ENTITIES, SINGLE_QUOTES, NAMESPACES, CDATA})),
+    "pull": Backend("pull", _parse_pull, frozenset({ENTITIES, SINGLE_QUOTES, NAMESPACES, CDATA, STREAM})),
+    "tiny": Backend("tiny", _parse_tiny, frozenset()),
+    "tolerant": Backend("tolerant", _parse_tolerant, frozenset({ENTITIES, SINGLE_QUOTES, RECOVER})),
+}
+
+def choose_backend(source, require: Sequence[str] = ()) -> Backend:
+    """Backend parse() would use for `source` given the required features.
+
+    Streams (file objects, chunk iterables) and str documents of PULL_THRESHOLD
+    characters or more go to "pull"; other text to "etree", the fastest at every
+    size (scripts/bench_backends.py); RECOVER selects "tolerant".
+    """
+    need = set(require)
+    if not isinstance(source, (str, bytes)):
+        need.add(STREAM)
+    if RECOVER in need:
+        # tolerant reads streams whole; it needs the full text to recover
+        order, need = ("tolerant",), need - {STREAM}
+    elif STREAM in need or len(source) >= PULL_THRESHOLD:
+        order = ("pull",)
+    else:
+        order = ("etree", "pull", "tiny", "tolerant")
+    for name in order:
+        if need <= BACKENDS[name].features:
+            return BACKENDS[name]
+    raise ValueError(f"No backend supports: {', '.join(sorted(need))}")
+
+def parse(source, backend: str = "auto", require: Sequence[str] = (),
+          issues: Optional[List[str]] = None) -> ET.Element:
+    """Parse SSML with the named backend, or pick one ("auto").
+
+    `source` is document text (str/bytes), a binary/text file object, or an
+    iterable of chunks. Always returns an ET.Element root; malformed input raises
+    ET.ParseError except under "tolerant", which records what it repaired in `issues`.
+    """
+    if backend == "auto":
+        b = choose_backend(source, require)
+    else:
+        try:
+            b = BACKENDS[backend]
+        except KeyError:
+            raise ValueError(f"Unknown backend: {backend}") from None
+    return b.parse(source, issues)
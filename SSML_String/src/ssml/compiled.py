@@ -0,0 +1,322 @@
+from __future__ import annotations
+import mmap
+import struct
+import sys
+import xml.etree.ElementTree as ET
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+from .transforms import parse_time_seconds
+
+# Compiled SSML: a parsed + analysed document as one flat binary file that is
+# loaded with mmap and read through memoryview casts, so opening it costs the
+# same for a paragraph and for a whole book. Nothing is decoded until asked for.
+#
+# Layout (all sections 8-byte aligned, offsets follow from the header counts):
+#   header       magic, version, byte order, counts, total duration
+#   str_offsets  uint32[n_strings + 1]     interned strings (tags, attr keys/values, text)
+#   tag, parent, end, text, tail           int32[n_nodes] each, preorder; end = index
+#                                          past the subtree; text/tail = string id or -1
+#   attr_start   int32[n_nodes + 1]        node i owns attrs[attr_start[i]:attr_start[i+1]]
+#   attrs        int32[2 * n_attrs]        (key id, value id) pairs
+#   tag index    int32 names[n_tags]       distinct tag string ids, sorted by UTF-8 bytes
+#                int32 post_start[n_tags + 1], int32 post[n_nodes]
+#                                          names[k]'s nodes are post[post_start[k]:post_start[k+1]]
+#   timeline     float64 start[n], float64 end[n], int32 node[n],
+#                uint32 flat_start[n], uint32 flat_end[n]   (byte offsets in flat text)
+#   strings      UTF-8 blob
+#   flat text    UTF-8 of flatten_text(root)
+# Arrays use the writer's native byte order; a file from a machine with the
+# other order is rejected rather than silently byte-swapped.
+#
+# Timeline: one entry per spoken piece (words * 60 / wpm) and per <break>
+# (its time attribute, as total_duration_seconds counts it), in document order.
+# iter_tag binary-searches the tag index, decoding O(log n_tags) strings.
+
+_MAGIC = b"SSMC"
+_FORMAT_VERSION = 2
+_HEADER = struct.Struct("<4sBBHIIIIIIId")
+_BYTEORDER = 0 if sys.byteorder == "little" else 1
+
+def _pad(n: int) -> int:
+    return (n + 7) & ~7
+
+def _layout(n_nodes: int, n_strings: int, n_attrs: int, n_tags: int, n_timeline: int,
+            strings_len: int, flat_len: int) -> Dict[str, Tuple[int, int, str]]:
+    # section name -> (offset, item count, array typecode)
+    sections = [
+        ("str_offsets", n_strings + 1, "I"),
+        ("tag", n_nodes, "i"), ("parent", n_nodes, "i"), ("end", n_nodes, "i"),
+        ("text", n_nodes, "i"), ("tail", n_nodes, "i"), ("attr_start", n_nodes + 1, "i"),
+        ("attrs", 2 * n_attrs, "i"),
+        ("tag_names", n_tags, "i"), ("tag_post_start", n_tags + 1, "i"), ("tag_post", n_nodes, "i"),
+        ("t_start", n_timeline, "d"), ("t_end", n_timeline, "d"), ("t_node", n_timeline, "i"),
+        ("t_flat_start", n_timeline, "I"), ("t_flat_end", n_timeline, "I"),
+        ("strings", strings_len, "B"), ("flat", flat_len, "B"),
+    ]
+    out = {}
+    pos = _pad(_HEADER.size)
+    for name, count, code in sections:
+        out[name] = (pos, count, code)
+        pos = _pad(pos + count * array(code).itemsize)
+    out["size"] = (pos, 0, "B")
+    return out
+
+def compile_document(root: ET.Element, wpm: int = 180) -> bytes:
+    """Serialize a parsed tree with its flattened text and timeline."""
+    strings: List[str] = []
+    sid: Dict[str, int] = {}
+
+    def intern(s: Optional[str]) -> int:
+        if s is None:
+            return -1
+        i = sid.get(s)
+        if i is None:
+            i = sid[s] = len(strings)
+            strings.append(s)
+        return i
+
+    tag, parent, end, text, tail = (array("i") for _ in range(5))
+    attr_start, attrs = array("i"), array("i")
+    t_start, t_end = array("d"), array("d")
+    t_node, t_fa, t_fb = array("i"), array("I"), array("I")
+    flat_parts: List[bytes] = []
+    clock = 0.0
+    flat_pos = 0
+
+    def spoken(piece: Optional[str], node: int) -> None:
+        nonlocal clock, flat_pos
+        if not piece:
+            return
+        words = piece.split()
+        if not words:
+            return
+        b = " ".join(words).encode("utf-8")
+        if flat_parts:
+            flat_pos += 1  # the joining space
+        flat_parts.append(b)
+        secs = len(words) * 60.0 / wpm
+        t_start.append(clock); t_end.append(clock + secs); t_node.append(node)
+        t_fa.append(flat_pos); t_fb.append(flat_pos + len(b))
+        clock += secs
+        flat_pos += len(b)
+
+    def walk(el: ET.Element, up: int, speak: bool) -> None:
+        nonlocal clock
+        i = len(tag)
+        tag.append(intern(el.tag)); parent.append(up); end.append(0)
+        text.append(intern(el.text)); tail.append(intern(el.tail))
+        attr_start.append(len(attrs) // 2)
+        for k, v in el.attrib.items():
+            attrs.append(intern(k)); attrs.append(intern(v))
+        # same reading as flatten_text: <sub alias> replaces the subtree's text
+        alias = speak and el.tag == "sub" and "alias" in el.attrib
+        if alias:
+            spoken(el.attrib["alias"], i)
+        elif speak:
+            spoken(el.text, i)
+        if speak and el.tag == "break":
+            secs = parse_time_seconds(el.attrib.get("time", ""))
+            t_start.append(clock); t_end.append(clock + secs); t_node.append(i)
+            t_fa.append(flat_pos + (1 if flat_parts else 0)); t_fb.append(t_fa[-1])
+            clock += secs
+        for c in el:
+            walk(c, i, speak and not alias)
+            if speak and not alias:
+                spoken(c.tail, i)
+        end[i] = len(tag)
+
+    walk(root, -1, True)
+    attr_start.append(len(attrs) // 2)
+
+    blob = [s.encode("utf-8") for s in strings]
+    str_offsets = array("I", [0])
+    for b in blob:
+        str_offsets.append(str_offsets[-1] + len(b))
+    strings_bytes = b"".join(blob)
+    flat = b" ".join(flat_parts)
+
+    by_tag: Dict[int, List[int]] = {}
+    for i, k in enumerate(tag):
+        by_tag.setdefault(k, []).append(i)
+    tag_names = array("i", sorted(by_tag, key=blob.__getitem__))
+    tag_post_start, tag_post = array("i", [0]), array("i")
+    for k in tag_names:
+        tag_post.extend(by_tag[k])
+        tag_post_start.append(len(tag_post))
+
+    n_nodes, n_t = len(tag), len(t_start)
+    lay = _layout(n_nodes, len(strings), len(attrs) // 2, len(tag_names), n_t,
+                  len(strings_bytes), len(flat))
+    buf = bytearray(lay["size"][0])
+    _HEADER.pack_into(buf, 0, _MAGIC, _FORMAT_VERSION, _BYTEORDER, 0, n_nodes, len(strings),
+                      len(attrs) // 2, len(tag_names), n_t, len(strings_bytes), len(flat), clock)
+    data = {"str_offsets": str_offsets, "tag": tag, "parent": parent, "end": end, "text": text,
+            "tail": tail, "attr_start": attr_start, "attrs": attrs, "tag_names": tag_names,
+            "tag_post_start": tag_post_start, "tag_post": tag_post, "t_start": t_start,
+            "t_end": t_end, "t_node": t_node, "t_flat_start": t_fa, "t_flat_end": t_fb,
+            "strings": strings_bytes, "flat": flat}
+    for name, payload in data.items():
+        off = lay[name][0]
+        raw = payload.tobytes() if isinstance(payload, array) else payload
+        buf[off:off + len(raw)] = raw
+    return bytes(buf)
+
+def save_compiled(root: ET.Element, path: str, wpm: int = 180) -> None:
+    with open(path, "wb") as f:
+        f.write(compile_document(root, wpm))
+
+class CompiledDocument:
+    """Read-only view over a compiled document (bytes or an mmap'd file)."""
+    __slots__ = ("_mm", "_views", "_arr", "_strings", "_flat", "n_nodes", "n_strings",
+                 "n_timeline", "duration")
+
+    def __init__(self, data, _mm: Optional[mmap.mmap] = None):
+        self._mm = _mm
+        mv = memoryview(data)
+        if len(mv) < _HEADER.size or bytes(mv[:4]) != _MAGIC:
+            mv.release()
+            raise ValueError("Not a compiled SSML document")
+        (_, version, order, _, n_nodes, n_strings, n_attrs, n_tags, n_t,
+         strings_len, flat_len, duration) = _HEADER.unpack_from(mv, 0)
+        if version != _FORMAT_VERSION:
+            mv.release()
+            raise ValueError(f"Unsupported compiled document version: {version}")
+        if order != _BYTEORDER:
+            mv.release()
+            raise ValueError("Compiled document was written with the other byte order")
+        lay = _layout(n_nodes, n_strings, n_attrs, n_tags, n_t, strings_len, flat_len)
+        if len(mv) < lay["size"][0]:
+            mv.release()
+            raise ValueError("Truncated compiled document")
+        self._views: List[memoryview] = [mv]
+        self._arr: Dict[str, memoryview] = {}
+        for name, (off, count, code) in lay.items():
+            if name == "size":
+                continue
+            size = count * array(code).itemsize
+            v = mv[off:off + size]
+            if code != "B":
+                v = v.cast(code)
+            self._views.append(v)
+            self._arr[name] = v
+        self._strings = self._arr["strings"]
+        self._flat = self._arr["flat"]
+        self.n_nodes = n_nodes
+        self.n_strings = n_strings
+        self.n_timeline = n_t
+        self.duration = duration
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompiledDocument":
+        return cls(data)
+
+    @classmethod
+    def open(cls, path: str) -> "CompiledDocument":
+        """Map the file read-only; only the header is parsed up front."""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mm, mm)
+        except ValueError:
+            mm.close()
+            raise
+
+    def close(self) -> None:
+        for v in reversed(self._views):
+            v.release()
+        self._views = []
+        self._arr = {}
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self) -> "CompiledDocument":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- strings / nodes ----
+
+    def string(self, i: int) -> Optional[str]:
+        if i < 0:
+            return None
+        off = self._arr["str_offsets"]
+        return str(self._strings[off[i]:off[i + 1]], "utf-8")
+
+    def _raw(self, i: int) -> bytes:
+        off = self._arr["str_offsets"]
+        return bytes(self._strings[off[i]:off[i + 1]])
+
+    def tag(self, i: int) -> str:
+        return self.string(self._arr["tag"][i])
+
+    def text(self, i: int) -> Optional[str]:
+        return self.string(self._arr["text"][i])
+
+    def tail(self, i: int) -> Optional[str]:
+        return self.string(self._arr["tail"][i])
+
+    def parent(self, i: int) -> int:
+        return self._arr["parent"][i]
+
+    def attrs(self, i: int) -> Dict[str, str]:
+        a = self._arr["attr_start"]
+        pairs = self._arr["attrs"]
+        s = self.string
+        return {s(pairs[2 * k]): s(pairs[2 * k + 1]) for k in range(a[i], a[i + 1])}
+
+    def children(self, i: int) -> Iterator[int]:
+        end = self._arr["end"]
+        j, stop = i + 1, end[i]
+        while j < stop:
+            yield j
+            j = end[j]
+
+    def iter_tag(self, name: str) -> Iterator[int]:
+        """Preorder indices of nodes with tag `name` (from the stored tag index)."""
+        key = name.encode("utf-8")
+        names = self._arr["tag_names"]
+        lo, hi = 0, len(names)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._raw(names[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(names) or self._raw(names[lo]) != key:
+            return
+        start = self._arr["tag_post_start"]
+        yield from self._arr["tag_post"][start[lo]:start[lo + 1]]
+
+    def to_element(self, i: int = 0) -> ET.Element:
+        """Rebuild the (sub)tree as ElementTree elements."""
+        el = ET.Element(self.tag(i), self.attrs(i))
+        el.text = self.text(i)
+        el.tail = self.tail(i) if i else None
+        for c in self.children(i):
+            child = self.to_element(c)
+            child.tail = self.tail(c)
+            el.append(child)
+        return el
+
+    # ---- text / timeline ----
+
+    @property
+    def flat_text(self) -> str:
+        return str(self._flat, "utf-8")
+
+    def timeline(self, k: int) -> Tuple[float, float, int, str]:
+        """(start, end, node, spoken text) of timeline entry k."""
+        a = self._arr
+        fa, fb = a["t_flat_start"][k], a["t_flat_end"][k]
+        return (a["t_start"][k], a["t_end"][k], a["t_node"][k], str(self._flat[fa:fb], "utf-8"))
+
+    def at_time(self, seconds: float) -> Optional[int]:
+        """Index of the timeline entry playing at `seconds`, or None past the end."""
+        starts = self._arr["t_start"]
+        k = bisect_right(starts, seconds) - 1
+        if k < 0 or seconds >= self.duration:
+            return None
+        return k
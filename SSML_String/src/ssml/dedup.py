@@ -0,0 +1,279 @@
+from __future__ import annotations
+import marshal
+import zlib
+import xml.etree.ElementTree as ET
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+from .simple_etree import parse_ssml
+from .transforms import flatten_text
+from ..strings.bounded_edit import bounded_edit_distance
+
+# Near-duplicate detection across an SSML corpus.
+#
+#   idx = DedupIndex(threshold=0.9)
+#   idx.add_many(corpus.items())     -> confirmed Match pairs
+#   idx.save(path); DedupIndex.load(path).query(new_doc)
+#
+# 1. flatten_text, split into words, shingle into word k-grams.
+# 2. MinHash signature per document. With pure Python, num_perm independent
+#    hash functions would cost num_perm multiplies per shingle, so this uses
+#    one-permutation hashing: a single universal hash mod 2**61 - 1 picks the
+#    bin (h % num_perm) and the value (h // num_perm) of every shingle, each bin
+#    keeps its minimum, and empty bins borrow from the next non-empty bin with
+#    an offset per step (rotation densification). The fraction of equal bins
+#    estimates the shingle Jaccard similarity like classic MinHash does, for
+#    O(words) work per document. Batches are computed in a process pool when
+#    workers > 1.
+# 3. LSH: the signature is cut into `bands` bands of `rows` values; documents
+#    sharing any band are candidates.
+# 4. Candidates are confirmed on the word streams with a bounded edit distance:
+#    similarity = 1 - distance / longer length must reach `threshold`, so the
+#    bound is known up front and most rejections stop early.
+#
+# The index (signatures, bands parameters and flattened text of every document,
+# needed to confirm later candidates) is saved with a magic/version header and
+# loaded back to check new documents incrementally.
+
+_MAGIC = b"SSMH"
+_FORMAT_VERSION = 1
+
+_M61 = (1 << 61) - 1
+_BASE = 1_000_003        # shingle polynomial over crc32 word hashes
+_A = 0x5DEECE66D1F3B1    # universal hash h(x) = (A * x + B) mod 2**61 - 1
+_B = 0x2545F4914F6CDD1
+
+Document = Union[str, ET.Element]
+
+class Match(NamedTuple):
+    key: object              # the document being added / queried
+    other: object            # the indexed document it duplicates
+    similarity: float        # 1 - distance / max(word counts)
+    distance: int            # word-level edit distance
+    jaccard: float           # MinHash estimate of shingle similarity
+
+def document_words(doc: Document) -> List[str]:
+    """Word stream of an SSML string or parsed tree (flatten_text)."""
+    root = parse_ssml(doc) if isinstance(doc, str) else doc
+    return flatten_text(root).split()
+
+def minhash(words: Sequence[str], num_perm: int = 128, shingle: int = 3) -> array:
+    """One-permutation MinHash signature (array('Q') of num_perm values)."""
+    hs = [zlib.crc32(w.encode()) for w in words]
+    k = min(shingle, len(hs)) or 1
+    if not hs:
+        hs = [0]
+    top = pow(_BASE, k - 1, _M61)
+    x = 0
+    for w in hs[:k]:
+        x = (x * _BASE + w) % _M61
+    empty = _M61
+    sig = [empty] * num_perm
+    val, b = divmod((_A * x + _B) % _M61, num_perm)
+    sig[b] = val
+    for i in range(k, len(hs)):
+        # roll the window: drop hs[i - k], append hs[i]
+        x = ((x - hs[i - k] * top) * _BASE + hs[i]) % _M61
+        val, b = divmod((_A * x + _B) % _M61, num_perm)
+        if val < sig[b]:
+            sig[b] = val
+    if empty in sig:
+        # rotation densification: an empty bin takes the next non-empty bin
+        # to its right (circularly), offset by the distance travelled
+        step = _M61 // num_perm + 1
+        nxt, dist = empty, 0
+        for t in range(2 * num_perm - 1, -1, -1):
+            b = t % num_perm
+            if sig[b] != empty:
+                nxt, dist = sig[b], 0
+            elif nxt != empty:
+                dist += 1
+                if t < num_perm:
+                    sig[b] = nxt + dist * step
+    return array("Q", sig)
+
+def _signature_batch(docs: List[Document], num_perm: int, shingle: int) -> List[Tuple[str, array]]:
+    out = []
+    for d in docs:
+        words = document_words(d)
+        out.append((" ".join(words), minhash(words, num_perm, shingle)))
+    return out
+
+def signatures(docs: Iterable[Document], num_perm: int = 128, shingle: int = 3,
+               batch: int = 256, workers: Optional[int] = 1) -> Iterable[Tuple[str, array]]:
+    """(flattened text, signature) per document, in order, computed in batches.
+
+    workers > 1 (or None = cpu count) computes batches in a process pool.
+    """
+    def batches():
+        buf: List[Document] = []
+        for d in docs:
+            buf.append(d)
+            if len(buf) >= batch:
+                yield buf
+                buf = []
+        if buf:
+            yield buf
+
+    if workers == 1:
+        for b in batches():
+            yield from _signature_batch(b, num_perm, shingle)
+        return
+    with ProcessPoolExecutor(workers) as ex:
+        for res in ex.map(_signature_batch, batches(), repeat(num_perm), repeat(shingle)):
+            yield from res
+
+def choose_bands(num_perm: int, lsh_threshold: float) -> Tuple[int, int]:
+    """(bands, rows) with bands * rows == num_perm whose S-curve midpoint
+    (1 / bands) ** (1 / rows) is closest to `lsh_threshold`."""
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows == 0:
+            bands = num_perm // rows
+            err = abs((1 / bands) ** (1 / rows) - lsh_threshold)
+            if best is None or err < best[0]:
+                best = (err, bands, rows)
+    return best[1], best[2]
+
+class DedupIndex:
+    """MinHash/LSH index of flattened documents with edit-distance confirmation."""
+    __slots__ = ("threshold", "num_perm", "shingle", "bands", "rows", "keys", "texts",
+                 "sigs", "_buckets", "_key_index", "candidates")
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128, shingle: int = 3,
+                 lsh_threshold: float = 0.5, bands: Optional[int] = None):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        if num_perm < 1 or shingle < 1:
+            raise ValueError("num_perm and shingle must be >= 1")
+        if bands is None:
+            bands, rows = choose_bands(num_perm, lsh_threshold)
+        elif bands < 1 or num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        else:
+            rows = num_perm // bands
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle = shingle
+        self.bands = bands
+        self.rows = rows
+        self.keys: List[object] = []
+        self.texts: List[str] = []           # flattened, whitespace-collapsed
+        self.sigs = array("Q")               # num_perm values per document
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._key_index: Dict[object, int] = {}
+        self.candidates = 0                  # LSH candidates checked so far
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._key_index
+
+    def _band_keys(self, sig: array) -> List[bytes]:
+        r = self.rows
+        return [sig[b * r:(b + 1) * r].tobytes() for b in range(self.bands)]
+
+    def _matches(self, key: object, text: str, sig: array, bkeys: List[bytes]) -> List[Match]:
+        seen = set()
+        for band, bk in zip(self._buckets, bkeys):
+            lst = band.get(bk)
+            if lst:
+                seen.update(lst)
+        out = []
+        if not seen:
+            return out
+        words = text.split()
+        n = self.num_perm
+        for i in sorted(seen):
+            self.candidates += 1
+            other = self.texts[i].split()
+            longest = max(len(words), len(other))
+            d = bounded_edit_distance(words, other, int((1.0 - self.threshold) * longest + 1e-9))
+            if d is None:
+                continue
+            osig = self.sigs[i * n:(i + 1) * n]
+            jac = sum(1 for x, y in zip(sig, osig) if x == y) / n
+            out.append(Match(key, self.keys[i], 1.0 - d / longest if longest else 1.0, d, jac))
+        return out
+
+    def _insert(self, key: object, text: str, sig: array, bkeys: List[bytes]) -> None:
+        if key in self._key_index:
+            raise ValueError(f"Duplicate document key: {key!r}")
+        i = len(self.keys)
+        self._key_index[key] = i
+        self.keys.append(key)
+        self.texts.append(text)
+        self.sigs.extend(sig)
+        for band, bk in zip(self._buckets, bkeys):
+            band.setdefault(bk, []).append(i)
+
+    def query(self, doc: Document) -> List[Match]:
+        """Indexed documents that `doc` near-duplicates (key None); the index is unchanged."""
+        text, sig = _signature_batch([doc], self.num_perm, self.shingle)[0]
+        return self._matches(None, text, sig, self._band_keys(sig))
+
+    def add(self, key: object, doc: Document) -> List[Match]:
+        """Index `doc` under `key`; returns its matches among documents indexed before it."""
+        return self.add_many([(key, doc)])
+
+    def add_many(self, items: Iterable[Tuple[object, Document]], batch: int = 256,
+                 workers: Optional[int] = 1) -> List[Match]:
+        """Index (key, document) pairs in order; returns every confirmed match
+        of each document against those indexed before it (this call included)."""
+        keys: List[object] = []
+
+        def docs():
+            for key, doc in items:
+                keys.append(key)
+                yield doc
+
+        out: List[Match] = []
+        for i, (text, sig) in enumerate(signatures(docs(), self.num_perm, self.shingle,
+                                                   batch, workers)):
+            bkeys = self._band_keys(sig)
+            out.extend(self._matches(keys[i], text, sig, bkeys))
+            self._insert(keys[i], text, sig, bkeys)
+        return out
+
+    # ---------- persistence ----------
+
+    def dumps(self) -> bytes:
+        params = (self.threshold, self.num_perm, self.shingle, self.bands)
+        body = marshal.dumps((params, self.keys, self.texts, self.sigs.tobytes()))
+        return _MAGIC + bytes([_FORMAT_VERSION]) + zlib.compress(body)
+
+    @classmethod
+    def loads(cls, data: bytes) -> "DedupIndex":
+        if len(data) < 5 or data[:4] != _MAGIC:
+            raise ValueError("Not a dedup signature index")
+        if data[4] != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported dedup index version: {data[4]}")
+        try:
+            (threshold, num_perm, shingle, bands), keys, texts, sigs = marshal.loads(zlib.decompress(data[5:]))
+            flat = array("Q")
+            flat.frombytes(sigs)
+        except (zlib.error, EOFError, ValueError, TypeError):
+            raise ValueError("Truncated or corrupt dedup index") from None
+        if len(texts) != len(keys) or len(flat) != len(keys) * num_perm:
+            raise ValueError("Truncated or corrupt dedup index")
+        idx = cls(threshold, num_perm, shingle, bands=bands)
+        for i, key in enumerate(keys):
+            sig = flat[i * num_perm:(i + 1) * num_perm]
+            idx._insert(key, texts[i], sig, idx._band_keys(sig))
+        return idx
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def load(cls, path: str) -> "DedupIndex":
+        with open(path, "rb") as f:
+            return cls.loads(f.read())
+
+def find_duplicates(docs: Iterable[Tuple[object, Document]], threshold: float = 0.9,
+                    workers: Optional[int] = 1, **kwargs) -> List[Match]:
+    """All confirmed near-duplicate pairs of a (key, document) corpus."""
+    return DedupIndex(threshold, **kwargs).add_many(docs, workers=workers)
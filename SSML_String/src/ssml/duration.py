@@ -0,0 +1,179 @@
+from __future__ import annotations
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from .say_as import number_to_words, say_as_text
+from .transforms import break_seconds
+
+# Duration engine with pluggable speech-rate models.
+# One DFS over the tree tracks the active <voice> and the effective <prosody rate>
+# (nested scopes compose), expands <sub>/<say-as> to what is actually spoken,
+# adds <break> time/strength pauses and punctuation pauses, and asks the model
+# how long each spoken chunk takes.
+#
+# Models:
+#   WpmModel        - words per minute (what total_duration_seconds does)
+#   SyllableModel   - syllables per second, with a cached syllable counter
+#   VoiceTableModel - calibrated per-voice syllable rates over a fallback model
+
+# speaking-rate multipliers (>1 = faster, so shorter)
+RATE_KEYWORDS = {
+    "x-slow": 0.5,
+    "slow": 0.75,
+    "medium": 1.0,
+    "default": 1.0,
+    "fast": 1.25,
+    "x-fast": 1.5,
+}
+
+# pause after a word ending in these characters, in seconds at rate 1.0
+PUNCT_PAUSES = {",": 0.15, ";": 0.2, ":": 0.2, ".": 0.35, "!": 0.35, "?": 0.35}
+_PUNCT_CHARS = "".join(PUNCT_PAUSES) + "-\"'()"
+
+def parse_rate(value: str, parent: float = 1.0) -> float:
+    """Effective rate for <prosody rate=value> inside a scope running at `parent`.
+
+    Keywords and plain percentages ("80%") are relative to the voice's default
+    rate; signed percentages ("+20%", "-10%") and bare numbers ("1.2") are
+    relative to the enclosing scope.
+    """
+    v = value.strip().lower()
+    if v in RATE_KEYWORDS:
+        return RATE_KEYWORDS[v]
+    try:
+        if v.endswith("%"):
+            num = float(v[:-1])
+            if v[0] in "+-":
+                return max(parent * (1.0 + num / 100.0), 0.01)
+            return max(num / 100.0, 0.01)
+        return max(parent * float(v), 0.01)
+    except ValueError:
+        return parent
+
+class WpmModel:
+    """Every word costs 60 / wpm seconds, for every voice."""
+    def __init__(self, wpm: float = 180.0):
+        self.wpm = wpm
+
+    def seconds(self, words: List[str], voice: Optional[str]) -> float:
+        return len(words) * 60.0 / self.wpm
+
+_VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+def count_syllables(word: str) -> int:
+    """Heuristic English syllable count (vowel groups, silent final e); numbers are spelled out."""
+    w = word.lower().strip(".,;:!?\"'()[]{}")
+    if not w:
+        return 0
+    if w.isdecimal():
+        return sum(count_syllables(x) for x in number_to_words(int(w)).replace("-", " ").split())
+    n = len(_VOWEL_GROUPS.findall(w))
+    if w.endswith("e") and not w.endswith(("le", "ee", "ye")) and n > 1:
+        n -= 1
+    return max(n, 1)
+
+class SyllableModel:
+    """Seconds = syllables / syllables_per_second; syllable counts are cached per word."""
+    def __init__(self, syllables_per_second: float = 4.5, cache_size: int = 100_000):
+        self.syllables_per_second = syllables_per_second
+        self.cache_size = cache_size
+        self._cache: Dict[str, int] = {}
+
+    def syllables(self, word: str) -> int:
+        n = self._cache.get(word)
+        if n is None:
+            n = count_syllables(word)
+            if len(self._cache) < self.cache_size:
+                self._cache[word] = n
+        return n
+
+    def precompute(self, vocabulary: Iterable[str]) -> None:
+        """Warm the syllable cache for a known vocabulary."""
+        for w in vocabulary:
+            self.syllables(w)
+
+    def count(self, words: List[str]) -> int:
+        cache = self._cache
+        total = 0
+        for w in words:
+            n = cache.get(w)
+            total += n if n is not None else self.syllables(w)
+        return total
+
+    def seconds(self, words: List[str], voice: Optional[str]) -> float:
+        return self.count(words) / self.syllables_per_second
+
+class VoiceTableModel:
+    """Calibrated syllables-per-second per voice name; other voices use `fallback`."""
+    def __init__(self, table: Dict[str, float], fallback: Optional[SyllableModel] = None):
+        self.table = dict(table)
+        self.fallback = fallback or SyllableModel()
+
+    def seconds(self, words: List[str], voice: Optional[str]) -> float:
+        sps = self.table.get(voice) if voice is not None else None
+        if sps is None:
+            return self.fallback.seconds(words, voice)
+        return self.fallback.count(words) / sps
+
+class DurationEstimate(NamedTuple):
+    total: float
+    speech: float
+    punctuation: float
+    breaks: float
+    words: int
+
+def estimate_duration(root: ET.Element, model=None, punctuation_pauses: bool = True,
+                      default_voice: Optional[str] = None) -> DurationEstimate:
+    """Single-pass duration estimate of a parsed SSML tree under `model` (default: 180 wpm)."""
+    model = model or WpmModel()
+    speech = 0.0
+    punct = 0.0
+    pauses = 0.0
+    words_total = 0
+
+    def spoken(text: Optional[str], rate: float, voice: Optional[str]) -> None:
+        nonlocal speech, punct, words_total
+        if not text:
+            return
+        words = text.split()
+        if not words:
+            return
+        p = 0.0
+        bare = 0
+        for w in words:
+            q = PUNCT_PAUSES.get(w[-1])
+            if q:
+                p += q
+                if not w.strip(_PUNCT_CHARS):
+                    bare += 1
+        if bare:  # stand-alone punctuation is a pause, not a word
+            words = [w for w in words if w.strip(_PUNCT_CHARS)]
+        words_total += len(words)
+        if words:
+            speech += model.seconds(words, voice) / rate
+        if punctuation_pauses:
+            punct += p / rate
+
+    def walk(el: ET.Element, rate: float, voice: Optional[str]) -> None:
+        nonlocal pauses
+        tag = el.tag
+        if tag == "voice":
+            voice = el.attrib.get("name", voice)
+        elif tag == "prosody" and "rate" in el.attrib:
+            rate = parse_rate(el.attrib["rate"], rate)
+        elif tag == "break":
+            pauses += break_seconds(el)
+        if tag == "sub" and "alias" in el.attrib:
+            spoken(el.attrib["alias"], rate, voice)
+            return
+        if tag == "say-as":
+            spoken(say_as_text(el), rate, voice)
+            return
+        spoken(el.text, rate, voice)
+        for c in el:
+            walk(c, rate, voice)
+            spoken(c.tail, rate, voice)
+
+    walk(root, 1.0, default_voice)
+    total = speech + punct + pauses
+    return DurationEstimate(round(total, 3), round(speech, 3), round(punct, 3), round(pauses, 3), words_total)
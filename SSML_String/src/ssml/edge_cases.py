@@ -0,0 +1,228 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+import xml.etree.ElementTree as ET
+from .transforms import STRENGTH_MAP, parse_time_seconds
+from .normalize import join_words
+from .offsets import OffsetRecorder, Positions
+
+# ============================================================
+# SSML Edge-Case Toolkit
+# - Conservative validator for allowed tags/attrs
+# - Break handling (time vs strength)
+# - <sub> aliasing, <say-as> simple mock, <prosody>/<emphasis> style tracking
+# - Whitespace normalization options
+# - Collects ALL issues instead of failing fast
+# (scripts/ssml_edge_cases.py runs it over sample payloads)
+# ============================================================
+
+ALLOWED_TAGS = {
+    "speak", "p", "s", "voice", "prosody", "break", "say-as", "sub", "emphasis"
+}
+
+ALLOWED_ATTRS = {
+    "voice": {"name", "language", "gender"},
+    "prosody": {"rate", "pitch", "volume"},
+    "break": {"time", "strength"},
+    "say-as": {"interpret-as", "format", "detail"},
+    "sub": {"alias"},
+    "emphasis": {"level"},
+    # generic container tags usually have no attrs; allow none by default
+}
+
+def parse_ssml_text(text: str):
+    """
+    Parse with ElementTree (requires well-formed XML).
+    Return root or raise ET.ParseError for unbalanced/malformed XML.
+    """
+    return ET.fromstring(text)
+
+MAX_DEPTH = 64
+
+def element_issues(tag: str, attrib: Dict[str, str]) -> List[str]:
+    """Issues of one element on its own (tag, attributes, tag-specific rules)."""
+    issues = []
+    if tag not in ALLOWED_TAGS:
+        issues.append(f"Unknown/unsupported tag <{tag}>.")
+
+    # attribute checks
+    allowed = ALLOWED_ATTRS.get(tag, set())
+    for k in attrib.keys():
+        if k not in allowed and allowed:
+            issues.append(f"Unsupported attribute '{k}' on <{tag}>.")
+    # special tag rules
+    if tag == "break":
+        t = attrib.get("time")
+        s = attrib.get("strength")
+        if t and s:
+            issues.append("<break> should not specify both 'time' and 'strength'.")
+        if not t and not s:
+            issues.append("<break> requires either 'time' or 'strength'.")
+        if t:
+            if not (t.endswith("ms") or t.endswith("s")):
+                issues.append("<break time> must end with 'ms' or 's'.")
+            else:
+                # numeric sanity
+                try:
+                    float(t[:-2]) if t.endswith("ms") else float(t[:-1])
+                except Exception:
+                    issues.append("<break time> must be numeric.")
+        if s and s not in STRENGTH_MAP:
+            issues.append(f"Unknown break strength '{s}'.")
+    if tag == "sub":
+        alias = attrib.get("alias", "")
+        if alias.strip() == "":
+            issues.append("<sub> requires non-empty 'alias'.")
+    if tag == "say-as":
+        interp = attrib.get("interpret-as")
+        if not interp:
+            issues.append("<say-as> requires 'interpret-as'.")
+    return issues
+
+def validate_tree(root: ET.Element):
+    """
+    Collect edge-case issues instead of raising immediately.
+    - Root must be <speak>.
+    - Only ALLOWED_TAGS.
+    - Tag-specific attribute allow-list.
+    - <break> must have either time or strength (not both), and time unit must be ms/s.
+    - <sub> 'alias' should be non-empty.
+    - Optional: depth limit to catch pathological nesting.
+    Returns: list[str] of issues (empty => OK)
+    """
+    issues = []
+
+    if root.tag != "speak":
+        issues.append("Root must be <speak>.")
+
+    def walk(el: ET.Element, depth: int):
+        if depth > MAX_DEPTH:
+            issues.append(f"Exceeded max depth {MAX_DEPTH} at <{el.tag}>.")
+        issues.extend(element_issues(el.tag, el.attrib))
+        # recurse
+        for c in list(el):
+            walk(c, depth + 1)
+
+    walk(root, 0)
+    return issues
+
+def break_duration_seconds(el: ET.Element) -> float:
+    if "time" in el.attrib:
+        return parse_time_seconds(el.attrib["time"])
+    if "strength" in el.attrib:
+        return STRENGTH_MAP.get(el.attrib["strength"], 0.5)
+    return 0.0
+
+def interpret_say_as(el: ET.Element) -> str:
+    """
+    Very light mock to expand <say-as> text.
+    Extend as needed for more modes.
+    """
+    txt = (el.text or "").strip()
+    mode = el.attrib.get("interpret-as", "")
+    if not txt:
+        return ""
+    if mode in ("characters", "digits", "telephone"):
+        return " ".join(list(txt))
+    if mode == "ordinal":
+        map_ord = {"1": "first", "2": "second", "3": "third", "4": "fourth", "5": "fifth"}
+        return map_ord.get(txt, txt + "th")
+    if mode == "date":
+        parts = txt.split("/")
+        if len(parts) == 3:
+            m, d, y = parts
+            return f"Month {m}, Day {d}, Year {y}"
+    return txt
+
+def flatten_with_styles(root: ET.Element, wpm: int = 180, normalize_spaces: bool = True,
+                        positions: Optional[Positions] = None):
+    """
+    Flatten to visible text while:
+      - applying <sub alias>
+      - expanding <say-as> (simple mock)
+      - accounting for <break> duration
+      - tracking style context from <prosody> and <emphasis>
+    Returns: dict(text=..., duration=..., segments=[(text, style_dict), ...])
+    With `positions` (offsets.parse_with_positions) the dict also has
+    "offsets", an OffsetMap for the whitespace-normalized text.
+    """
+    total_break = 0.0
+    out_text_chunks = []
+    segments = []
+    rec = OffsetRecorder(positions) if positions is not None else None
+
+    def dfs(el: ET.Element, style):
+        nonlocal total_break
+        # style inheritance
+        st = dict(style)
+        if el.tag == "prosody":
+            for k in ("rate", "pitch", "volume"):
+                if k in el.attrib:
+                    st[k] = el.attrib[k]
+        if el.tag == "emphasis":
+            st["emphasis"] = el.attrib.get("level", "moderate")
+
+        # emit text for this node based on tag semantics
+        if el.tag == "break":
+            total_break += break_duration_seconds(el)
+        elif el.tag == "sub":
+            alias = el.attrib.get("alias")
+            if alias:
+                segments.append((alias.strip(), dict(st)))
+                out_text_chunks.append(alias)
+                if rec:
+                    rec.replaced(alias, positions.id_of(el))
+            # else: validator will flag empty alias
+        elif el.tag == "say-as":
+            exp = interpret_say_as(el)
+            if exp:
+                segments.append((exp, dict(st)))
+                out_text_chunks.append(exp)
+                if rec:
+                    rec.replaced(exp, positions.id_of(el))
+        else:
+            # generic text handling
+            if el.text and el.text.strip():
+                txt = el.text.strip()
+                segments.append((txt, dict(st)))
+                out_text_chunks.append(txt)
+                if rec:
+                    i = positions.id_of(el)
+                    rec.text(el.text, positions.texts[i], i)
+
+        # children
+        for c in list(el):
+            dfs(c, st)
+            if c.tail and c.tail.strip():
+                segments.append((c.tail.strip(), dict(st)))
+                out_text_chunks.append(c.tail.strip())
+                if rec:
+                    rec.text(c.tail, positions.tails[positions.id_of(c)], positions.id_of(el))
+
+    dfs(root, {"rate": "medium", "pitch": "medium", "volume": "medium", "emphasis": "none"})
+    text = join_words(out_text_chunks) if normalize_spaces else "".join(out_text_chunks)
+    # crude speech time based on WPM
+    words = len(text.split())
+    speech = words / (wpm / 60.0) if wpm > 0 else 0.0
+    out = {
+        "text": text,
+        "duration_seconds": round(speech + total_break, 3),
+        "segments": segments,
+        "break_seconds": round(total_break, 3),
+    }
+    if rec:
+        out["offsets"] = rec.result()[1]
+    return out
+
+def analyze(text: str, wpm: int = 180, normalize_spaces: bool = True) -> Dict[str, Any]:
+    """The whole pipeline on raw text: parse, validate, flatten.
+
+    Returns flatten_with_styles' dict plus "issues"; malformed XML gives
+    {"parse_error": msg, "issues": [msg]} instead of raising.
+    """
+    try:
+        root = parse_ssml_text(text)
+    except ET.ParseError as e:
+        return {"parse_error": str(e), "issues": [f"XML ParseError: {e}"]}
+    result = flatten_with_styles(root, wpm=wpm, normalize_spaces=normalize_spaces)
+    result["issues"] = validate_tree(root)
+    return result
@@ -0,0 +1,170 @@
+from __future__ import annotations
+import hashlib
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Tuple, Union
+from .node import Node
+from .transforms import parse_time_seconds
+from .edge_cases import MAX_DEPTH, element_issues
+
+# Merkle hashing of SSML subtrees, and analysis memoized per subtree.
+#
+# A subtree's digest covers its tag, its attributes sorted by name, its text
+# with whitespace collapsed, and for each child the child's digest followed by
+# the child's (collapsed) tail. Whitespace and attribute order therefore do not
+# change the digest, and two equal paragraphs in different documents - or in
+# two versions of one document - share it.
+#
+# AnalysisCache memoizes a SubtreeSummary (flattened words, <break time>
+# seconds, validate_tree issues) per subtree in a bounded LRU. It keys subtrees
+# by the same canonical content, hash-consed instead of digested: a node's key
+# is (tag, sorted attrs, collapsed texts, child ids) and each distinct key gets
+# a small integer id, so keys are exact and cost one dict lookup per node rather
+# than a cryptographic digest. Summaries compose bottom-up, so after an edit
+# only the changed subtrees and their ancestors are analysed; every other
+# subtree is a cache hit. Computing the keys still visits every node (a re-parsed
+# tree shares no objects with the previous version).
+#
+# The depth rule of validate_tree depends on where a subtree sits, so subtrees
+# that reach past MAX_DEPTH are keyed by content and depth together.
+#
+# Works on ET.Element trees and on tiny_parser Node trees ("#text" children).
+
+Tree = Union[ET.Element, Node]
+
+class SubtreeSummary(NamedTuple):
+    words: Tuple[str, ...]      # flatten_text words (<sub alias> applied); the tail is not included
+    break_seconds: float        # <break time> pauses anywhere in the subtree
+    issues: Tuple[str, ...]     # validate_tree issues, in its order (root rule excluded)
+    height: int                 # 0 for a leaf
+
+def _content(el: Tree) -> Tuple[str, Dict[str, str], List[Union[str, Tree]]]:
+    # (tag, attrs, [text, child, tail, child, tail, ...]) with empty strings left out
+    if isinstance(el, Node):
+        items: List[Union[str, Tree]] = [el.text] if el.text else []
+        for c in el.children:
+            if c.tag == "#text":
+                if not c.text:
+                    continue
+                if items and isinstance(items[-1], str):
+                    items[-1] += c.text
+                else:
+                    items.append(c.text)
+            else:
+                items.append(c)
+        return el.tag, el.attrs, items
+    items = [el.text] if el.text else []
+    for c in el:
+        items.append(c)
+        if c.tail:
+            items.append(c.tail)
+    return el.tag, el.attrib, items
+
+def _digest(tag: str, attrs: Dict[str, str], items: List[Union[str, bytes]]) -> bytes:
+    # items: str (text) or bytes (child digest); NUL and friends cannot occur in XML text
+    h = hashlib.blake2b(tag.encode("utf-8"), digest_size=16)
+    for k in sorted(attrs):
+        h.update(b"\x01" + k.encode("utf-8") + b"\x02" + attrs[k].encode("utf-8"))
+    for x in items:
+        if isinstance(x, str):
+            if not x.isspace():
+                h.update(b"\x03" + " ".join(x.split()).encode("utf-8"))
+        else:
+            h.update(b"\x04" + x)
+    return h.digest()
+
+def subtree_hash(el: Tree) -> bytes:
+    """Canonical 16-byte content digest of a subtree."""
+    tag, attrs, items = _content(el)
+    return _digest(tag, attrs, [x if isinstance(x, str) else subtree_hash(x) for x in items])
+
+class AnalysisCache:
+    """Bounded LRU of SubtreeSummary per distinct subtree, shared across documents."""
+    __slots__ = ("maxsize", "_memo", "_next_id", "hits", "misses")
+
+    def __init__(self, maxsize: int = 65536):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        # canonical key -> (subtree id, summary); ids are never reused, so a parent
+        # key naming an evicted child can no longer match
+        self._memo: "OrderedDict[tuple, Tuple[int, SubtreeSummary]]" = OrderedDict()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._memo)
+
+    def clear(self) -> None:
+        self._memo.clear()
+        self.hits = self.misses = 0
+
+    def _visit(self, el: Tree, depth: int) -> Tuple[int, SubtreeSummary]:
+        tag, attrs, items = _content(el)
+        key: List[Any] = [tag, tuple(sorted(attrs.items())) if attrs else ()]
+        add = key.append
+        children: List[SubtreeSummary] = []
+        height = 0
+        for x in items:
+            if x.__class__ is str:
+                if not x.isspace():
+                    add(" ".join(x.split()))
+            else:
+                cid, cs = self._visit(x, depth + 1)
+                add(cid)
+                children.append(cs)
+                if cs.height >= height:
+                    height = cs.height + 1
+        if depth + height > MAX_DEPTH:
+            key.append(-1 - depth)
+        k = tuple(key)
+        memo = self._memo
+        hit = memo.get(k)
+        if hit is not None:
+            memo.move_to_end(k)
+            self.hits += 1
+            return hit
+        self.misses += 1
+
+        if tag == "sub" and "alias" in attrs:
+            words: Tuple[str, ...] = tuple(attrs["alias"].split())
+        else:
+            out: List[str] = []
+            i = 0
+            for x in items:
+                if x.__class__ is str:
+                    out.extend(x.split())
+                else:
+                    out.extend(children[i].words)
+                    i += 1
+            words = tuple(out)
+        br = sum(c.break_seconds for c in children)
+        if tag == "break" and attrs.get("time"):
+            br += parse_time_seconds(attrs["time"])
+        issues = element_issues(tag, attrs)
+        if depth > MAX_DEPTH:
+            issues.insert(0, f"Exceeded max depth {MAX_DEPTH} at <{tag}>.")
+        for c in children:
+            issues.extend(c.issues)
+        hit = memo[k] = (self._next_id, SubtreeSummary(words, br, tuple(issues), height))
+        self._next_id += 1
+        if len(memo) > self.maxsize:
+            memo.popitem(last=False)
+        return hit
+
+    def summarize(self, root: Tree) -> SubtreeSummary:
+        """Summary of the whole tree, reusing every cached subtree."""
+        return self._visit(root, 0)[1]
+
+    def analyze(self, root: Tree, wpm: int = 180) -> Dict[str, Any]:
+        """flatten_text, total_duration_seconds and validate_tree results in one pass."""
+        s = self.summarize(root)
+        issues = list(s.issues)
+        if root.tag != "speak":
+            issues.insert(0, "Root must be <speak>.")
+        return {
+            "text": " ".join(s.words),
+            "duration_seconds": round(len(s.words) / (wpm / 60.0) + s.break_seconds, 3),
+            "issues": issues,
+        }
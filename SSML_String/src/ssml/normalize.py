@@ -0,0 +1,174 @@
+from __future__ import annotations
+import xml.etree.ElementTree as ET
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Union
+from .say_as import say_as_text
+
+# Text normalization as declared stages fused into one pass.
+# Instead of flatten -> collapse whitespace -> expand -> casefold, each building a
+# new full-document string, a Normalizer walks the tree (or a stream of text
+# chunks) once and runs every stage on one small piece at a time:
+#
+#   structural stages  "sub"        <sub alias> replaces the element's content
+#                      "say-as"     <say-as> is replaced by its spoken form
+#   text stages        "casefold"   str.casefold per piece
+#                      "whitespace" collapse runs of whitespace to single spaces
+#   word stages        callables word -> str (None/"" drops the word), in the
+#                      declared order; they need "whitespace" (they act on words)
+#
+# Stages run in declared order: "casefold" declared after a word stage runs as a
+# word stage at that point (so the earlier stages still see the original case),
+# otherwise once per piece before any word stage.
+#
+# Output is either one str (a single final join over the word buffer) or a
+# stream of ~`size`-character chunks, so a document never has to exist whole.
+
+STAGES = ("sub", "say-as", "casefold", "whitespace")
+
+WordStage = Callable[[str], Optional[str]]
+
+def join_words(pieces: Iterable[str]) -> str:
+    """Pieces joined with whitespace collapsed, without the intermediate joined string."""
+    return " ".join([w for p in pieces for w in p.split()])
+
+class Normalizer:
+    """Compiled normalization pipeline over SSML trees or plain text streams."""
+    __slots__ = ("stages", "sub", "say_as", "casefold", "collapse", "word_stages")
+
+    def __init__(self, stages: Sequence[Union[str, WordStage]] = ("sub", "say-as", "whitespace")):
+        self.stages = tuple(stages)
+        self.word_stages: List[WordStage] = []
+        names = set()
+        for st in self.stages:
+            if callable(st):
+                self.word_stages.append(st)
+            elif st == "casefold" and self.word_stages:
+                self.word_stages.append(str.casefold)
+            elif st in STAGES:
+                names.add(st)
+            else:
+                raise ValueError(f"Unknown stage: {st}")
+        self.sub = "sub" in names
+        self.say_as = "say-as" in names
+        self.casefold = "casefold" in names
+        self.collapse = "whitespace" in names
+        if self.word_stages and not self.collapse:
+            raise ValueError("Word stages need the 'whitespace' stage")
+
+    # ---- sources ----
+
+    def _pieces(self, root: ET.Element) -> Iterator[str]:
+        # document-order text pieces, with <sub>/<say-as> already resolved;
+        # explicit stack: pending children and their tails
+        sub, say = self.sub, self.say_as
+        todo: List[Union[ET.Element, str]] = [root]
+        pop, push = todo.pop, todo.append
+        while todo:
+            x = pop()
+            if isinstance(x, str):
+                yield x
+                continue
+            tag = x.tag
+            if sub and tag == "sub" and "alias" in x.attrib:
+                yield x.attrib["alias"]
+                continue
+            if say and tag == "say-as":
+                yield say_as_text(x)
+                continue
+            if x.text:
+                yield x.text
+            for c in reversed(x):
+                if c.tail:
+                    push(c.tail)
+                push(c)
+
+    @staticmethod
+    def _text_pieces(chunks: Iterable[str]) -> Iterator[str]:
+        # re-cut a chunk stream at whitespace so no word is split across pieces
+        carry = ""
+        for c in chunks:
+            if carry:
+                c = carry + c
+                carry = ""
+            if not c:
+                continue
+            if not c[-1].isspace():
+                cut = max(c.rfind(" "), c.rfind("\n"), c.rfind("\t"), c.rfind("\r"))
+                carry = c[cut + 1:]
+                c = c[:cut + 1]
+            if c:
+                yield c
+        if carry:
+            yield carry
+
+    # ---- the fused pass ----
+
+    def _run(self, pieces: Iterable[str]) -> Iterator[List[str]]:
+        # one list of output units (words, or raw pieces without "whitespace") per piece
+        casefold, collapse, fns = self.casefold, self.collapse, self.word_stages
+        for p in pieces:
+            if casefold:
+                p = p.casefold()
+            if not collapse:
+                yield [p]
+                continue
+            words = p.split()
+            for f in fns:
+                words = [y for y in map(f, words) if y]
+            if words:
+                yield words
+
+    def _join(self, units: Iterator[List[str]]) -> str:
+        sep = " " if self.collapse else ""
+        out: List[str] = []
+        ext = out.extend
+        for group in units:
+            ext(group)
+        return sep.join(out)
+
+    def _chunks(self, units: Iterator[List[str]], size: int) -> Iterator[str]:
+        sep = " " if self.collapse else ""
+        buf: List[str] = []
+        n = 0
+        first = True
+        for group in units:
+            buf.extend(group)
+            n += sum(map(len, group)) + len(group)
+            if n >= size:
+                out = sep.join(buf)
+                yield out if first else sep + out
+                first = False
+                buf.clear()
+                n = 0
+        if buf:
+            out = sep.join(buf)
+            yield out if first else sep + out
+
+    # ---- public API ----
+
+    def normalize_tree(self, root: ET.Element) -> str:
+        if not self.collapse:
+            return self._join(self._run(self._pieces(root)))
+        # _run inlined: this is the hot path (flatten_text goes through here)
+        casefold, fns = self.casefold, self.word_stages
+        out: List[str] = []
+        ext = out.extend
+        for p in self._pieces(root):
+            if casefold:
+                p = p.casefold()
+            words = p.split()
+            for f in fns:
+                words = [y for y in map(f, words) if y]
+            ext(words)
+        return " ".join(out)
+
+    def iter_tree(self, root: ET.Element, size: int = 8192) -> Iterator[str]:
+        """normalize_tree as a stream of chunks of about `size` characters."""
+        return self._chunks(self._run(self._pieces(root)), size)
+
+    def normalize_text(self, text: str) -> str:
+        """Text stages only (there is no markup in plain text)."""
+        return self._join(self._run((text,)))
+
+    def iter_text(self, chunks: Iterable[str], size: int = 8192) -> Iterator[str]:
+        """Normalize a plain-text chunk stream (file reads, sockets) chunk by chunk."""
+        return self._chunks(self._run(self._text_pieces(chunks)), size)
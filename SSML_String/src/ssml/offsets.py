@@ -0,0 +1,303 @@
+from __future__ import annotations
+import re
+import xml.etree.ElementTree as ET
+import xml.parsers.expat as expat
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple, Union
+
+# Flattened text -> source offset map, for highlighting source spans while the
+# flattened text is being read out.
+#
+# parse_with_positions() builds the usual ElementTree tree with expat directly so
+# that byte positions are available: every element gets a preorder id and its
+# [start, end) source span, and every text/tail string keeps the source segments
+# it was assembled from (one per expat character-data event, so entity and
+# character references and CRLF line ends are segments of their own).
+#
+# The flatteners (transforms.flatten_text, edge_cases.flatten_with_styles) take
+# these positions optionally and feed an OffsetRecorder from the same traversal
+# that produces the text. The recorder stores runs, not words:
+#
+#   flat [fa, fb)  <->  source bytes [sa, sb)  in element id e
+#
+# A verbatim run is a stretch where the flattened text is a byte-for-byte copy
+# of the source, so consecutive words separated by a single source space extend
+# the same run; plain prose costs one run per text node. Anything else (alias,
+# say-as expansion, entity references, collapsed whitespace) starts a new run,
+# and replaced text maps to the whole span of its element.
+# Runs are sorted in both coordinates, so lookups either way are a bisect.
+
+Segment = Tuple[int, int, int, int, bool]   # (char a, char b, src a, src b, verbatim)
+
+_WORD = re.compile(r"\S+")
+_START_TAG = re.compile(rb"""<[^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*>""")
+
+class Positions:
+    """Source positions of a tree built by parse_with_positions."""
+    __slots__ = ("source", "ids", "spans", "texts", "tails")
+
+    def __init__(self, source: bytes):
+        self.source = source
+        self.ids: Dict[int, int] = {}          # id(element) -> preorder id
+        self.spans = array("q")                # 2 per element: [start, end) bytes
+        self.texts: List[List[Segment]] = []   # per element: segments of el.text
+        self.tails: List[List[Segment]] = []   # per element: segments of el.tail
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def id_of(self, el: ET.Element) -> int:
+        return self.ids[id(el)]
+
+    def span(self, i: int) -> Tuple[int, int]:
+        return self.spans[2 * i], self.spans[2 * i + 1]
+
+def parse_with_positions(source: Union[str, bytes]) -> Tuple[ET.Element, Positions]:
+    """Parse like ET.fromstring, also returning the source Positions (UTF-8 bytes)."""
+    data = source.encode("utf-8") if isinstance(source, str) else source
+    pos = Positions(data)
+    p = expat.ParserCreate(namespace_separator="}")
+    p.buffer_text = False
+    stack: List[ET.Element] = []
+    root: List[ET.Element] = []
+    # where character data goes: (element, is_tail)
+    target: List[Optional[Tuple[ET.Element, bool]]] = [None]
+    spans, texts, tails = pos.spans, pos.texts, pos.tails
+
+    def fixname(name: str) -> str:
+        return "{" + name if "}" in name else name
+
+    def start(name: str, attrs: Dict[str, str]) -> None:
+        a = {fixname(k): v for k, v in attrs.items()} if attrs else {}
+        el = ET.SubElement(stack[-1], fixname(name), a) if stack else ET.Element(fixname(name), a)
+        if not stack:
+            root.append(el)
+        b = p.CurrentByteIndex
+        pos.ids[id(el)] = len(texts)
+        m = _START_TAG.match(data, b)
+        spans.append(b)
+        spans.append(m.end() if m else b)  # start-tag end until the element closes
+        texts.append([])
+        tails.append([])
+        stack.append(el)
+        target[0] = (el, False)
+
+    def end(name: str) -> None:
+        el = stack.pop()
+        b = p.CurrentByteIndex
+        k = 2 * pos.ids[id(el)] + 1
+        if data.startswith(b"</", b):
+            spans[k] = data.index(b">", b) + 1
+        # else <x/>: the span already ends after the start tag
+        target[0] = (el, True) if stack else None
+
+    def chars(s: str) -> None:
+        t = target[0]
+        if t is None:
+            return
+        el, tail = t
+        b = p.CurrentByteIndex
+        if data[b] == 0x26:                  # '&': entity or character reference
+            e, verbatim = data.index(b";", b) + 1, False
+        elif s == "\n" and data[b] == 0x0D:  # CRLF reported as "\n"
+            e, verbatim = b + 2, False
+        else:
+            n = len(s.encode("utf-8")) if not s.isascii() else len(s)
+            e, verbatim = b + n, True
+        old = (el.tail if tail else el.text) or ""
+        if tail:
+            el.tail = old + s
+            segs = tails[pos.ids[id(el)]]
+        else:
+            el.text = old + s
+            segs = texts[pos.ids[id(el)]]
+        segs.append((len(old), len(old) + len(s), b, e, verbatim))
+
+    p.StartElementHandler = start
+    p.EndElementHandler = end
+    p.CharacterDataHandler = chars
+    try:
+        p.Parse(data, True)
+    except expat.ExpatError as e:
+        raise ET.ParseError(str(e)) from None
+    return root[0], pos
+
+class OffsetMap:
+    """Run-length map between flattened text offsets (chars) and source bytes."""
+    __slots__ = ("text", "flat_start", "flat_end", "src_start", "src_end", "element", "verbatim")
+
+    def __init__(self, text: str = ""):
+        self.text = text
+        self.flat_start = array("q")
+        self.flat_end = array("q")
+        self.src_start = array("q")
+        self.src_end = array("q")
+        self.element = array("i")
+        self.verbatim = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.flat_start)
+
+    def run(self, r: int) -> Tuple[int, int, int, int, int]:
+        """(flat start, flat end, source start, source end, element id) of run r."""
+        return (self.flat_start[r], self.flat_end[r], self.src_start[r], self.src_end[r],
+                self.element[r])
+
+    def _run_at_flat(self, i: int) -> int:
+        r = bisect_right(self.flat_start, i) - 1
+        return r if r >= 0 and i < self.flat_end[r] else -1
+
+    def _run_at_source(self, b: int) -> int:
+        r = bisect_right(self.src_start, b) - 1
+        return r if r >= 0 and b < self.src_end[r] else -1
+
+    def _src_offset(self, r: int, i: int) -> int:
+        # source byte of flat char i inside verbatim run r
+        fa = self.flat_start[r]
+        if self.flat_end[r] - fa == self.src_end[r] - self.src_start[r]:   # ASCII run
+            return self.src_start[r] + i - fa
+        return self.src_start[r] + len(self.text[fa:i].encode("utf-8"))
+
+    def element_at(self, i: int) -> Optional[int]:
+        """Id of the element whose text flat char i comes from (None between runs)."""
+        r = self._run_at_flat(i)
+        return None if r < 0 else self.element[r]
+
+    def to_source(self, i: int) -> Optional[int]:
+        """Source byte offset of flat char i; replaced text maps to its element's start."""
+        r = self._run_at_flat(i)
+        if r < 0:
+            return None
+        if not self.verbatim[r]:
+            return self.src_start[r]
+        return self._src_offset(r, i)
+
+    def source_range(self, a: int, b: int) -> Optional[Tuple[int, int]]:
+        """Source byte range covering flat text [a, b), e.g. one spoken word."""
+        ra = self._run_at_flat(a)
+        rb = self._run_at_flat(b - 1) if b > a else ra
+        if ra < 0 or rb < 0:
+            return None
+        sa = self._src_offset(ra, a) if self.verbatim[ra] else self.src_start[ra]
+        sb = self._src_offset(rb, b) if self.verbatim[rb] else self.src_end[rb]
+        return sa, sb
+
+    def to_flat(self, b: int) -> Optional[int]:
+        """Flat char offset of source byte b (start of the run for replaced text)."""
+        r = self._run_at_source(b)
+        if r < 0:
+            return None
+        fa = self.flat_start[r]
+        if not self.verbatim[r]:
+            return fa
+        sa = self.src_start[r]
+        if self.flat_end[r] - fa == self.src_end[r] - sa:
+            return fa + b - sa
+        raw = self.text[fa:self.flat_end[r]].encode("utf-8")[:b - sa]
+        return fa + len(raw.decode("utf-8", "ignore"))
+
+    def flat_range(self, a: int, b: int) -> Optional[Tuple[int, int]]:
+        """Flat text range covering source bytes [a, b)."""
+        fa = self.to_flat(a)
+        r = self._run_at_source(b - 1) if b > a else -1
+        if fa is None or r < 0:
+            return None
+        if not self.verbatim[r]:
+            return fa, self.flat_end[r]
+        return fa, self.to_flat(b - 1) + 1
+
+def _byte_at(s: str, seg: Segment, c: int) -> int:
+    # source byte of char c of s inside verbatim segment seg
+    ca, cb, sa, sb, _ = seg
+    if sb - sa == cb - ca:
+        return sa + c - ca
+    return sa + len(s[ca:c].encode("utf-8"))
+
+class OffsetRecorder:
+    """Collects flattened words and their runs; fed by a flattener's traversal."""
+    __slots__ = ("positions", "words", "map", "_len")
+
+    def __init__(self, positions: Positions):
+        self.positions = positions
+        self.words: List[str] = []
+        self.map = OffsetMap()
+        self._len = 0
+
+    def _add(self, word: str, sa: int, sb: int, el: int, verbatim: bool) -> None:
+        m = self.map
+        fa = self._len + 1 if self.words else 0
+        fb = fa + len(word)
+        self.words.append(word)
+        self._len = fb
+        r = len(m.flat_start) - 1
+        if r >= 0 and m.element[r] == el and m.verbatim[r] == verbatim and m.flat_end[r] == fa - 1:
+            if verbatim:
+                # one source space between them: the run continues verbatim
+                e = m.src_end[r]
+                if e + 1 == sa and self.positions.source[e] == 0x20:
+                    m.flat_end[r] = fb
+                    m.src_end[r] = sb
+                    return
+            elif m.src_start[r] == sa and m.src_end[r] == sb:
+                m.flat_end[r] = fb
+                return
+        m.flat_start.append(fa)
+        m.flat_end.append(fb)
+        m.src_start.append(sa)
+        m.src_end.append(sb)
+        m.element.append(el)
+        m.verbatim.append(verbatim)
+
+    def text(self, s: Optional[str], segments: List[Segment], el: int) -> None:
+        """Words of a text/tail string of the source, located through its segments."""
+        if not s:
+            return
+        k = 0
+        for w in _WORD.finditer(s):
+            a, b = w.span()
+            while segments[k][1] <= a:
+                k += 1
+            j = k
+            while segments[j][1] < b:
+                j += 1
+            first, last = segments[k], segments[j]
+            sa = _byte_at(s, first, a) if first[4] else first[2]
+            sb = _byte_at(s, last, b) if last[4] else last[3]
+            self._add(w.group(), sa, sb, el, first[4] and k == j)
+            k = j
+
+    def replaced(self, s: Optional[str], el: int) -> None:
+        """Words standing in for element `el` (alias, say-as expansion)."""
+        if not s:
+            return
+        sa, sb = self.positions.span(el)
+        for w in s.split():
+            self._add(w, sa, sb, el, False)
+
+    def result(self) -> Tuple[str, OffsetMap]:
+        text = " ".join(self.words)
+        self.map.text = text
+        return text, self.map
+
+def flatten_with_offsets(root: ET.Element, positions: Positions) -> Tuple[str, OffsetMap]:
+    """flatten_text(root) and its OffsetMap, in one traversal."""
+    rec = OffsetRecorder(positions)
+    ids = positions.ids
+    texts, tails = positions.texts, positions.tails
+    todo: List[Union[ET.Element, Tuple[str, List[Segment], int]]] = [root]
+    while todo:
+        x = todo.pop()
+        if isinstance(x, tuple):
+            rec.text(*x)
+            continue
+        i = ids[id(x)]
+        if x.tag == "sub" and "alias" in x.attrib:
+            rec.replaced(x.attrib["alias"], i)
+            continue
+        rec.text(x.text, texts[i], i)
+        for c in reversed(x):
+            if c.tail:
+                todo.append((c.tail, tails[ids[id(c)]], i))
+            todo.append(c)
+    return rec.result()
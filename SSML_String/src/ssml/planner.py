@@ -0,0 +1,256 @@
+from __future__ import annotations
+import copy
+import heapq
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+from .duration import WpmModel, estimate_duration
+
+# Voice-partitioned synthesis planning.
+#
+# split_segments() cuts a parsed document into standalone <speak> segments, each
+# under a single voice and no longer than `max_seconds` of estimated audio where
+# the markup allows. It descends only where it must: into <voice> scopes, into
+# elements containing one, and into elements too long to send whole. Sibling
+# content that fits is packed into one segment; every segment re-creates its
+# ancestor chain (<voice>, <prosody>, <p>, ...) so it renders as it would in
+# place.
+#
+# plan() assigns segments to N worker queues from an EngineModel cost estimate
+# (per-voice real-time factor + per-request overhead):
+#
+#   "ordered"   document order onto the earliest-free worker: audio becomes
+#               ready roughly in playback order (fewest stalls)
+#   "lpt"       longest segment first: best makespan, late first audio
+#   "hybrid"    segment 0 first (minimal time-to-first-audio), then least
+#               slack first against each segment's playback deadline, which
+#               pulls long segments forward and shortens the makespan
+#
+# The Plan carries the worker queues and the predicted timeline; reassembly()
+# lists the segments in playback (document) order with where and when each one
+# is ready and when it starts playing. run_plan()
+# executes a plan on local threads against engine callables, e.g. LocalEngine,
+# the sleep-based stand-in used by the tests and scripts/bench_planner.py.
+
+Engine = Callable[["Segment"], bytes]
+
+class Segment(NamedTuple):
+    index: int
+    voice: Optional[str]
+    ssml: str           # standalone <speak> document
+    seconds: float      # estimated audio duration
+    words: int
+
+class EngineModel:
+    """Synthesis cost: overhead + audio seconds * real-time factor of the voice."""
+    __slots__ = ("rtf", "default_rtf", "overhead")
+
+    def __init__(self, rtf: Optional[Dict[str, float]] = None, default_rtf: float = 0.25,
+                 overhead: float = 0.15):
+        self.rtf = dict(rtf or {})
+        self.default_rtf = default_rtf
+        self.overhead = overhead
+
+    def cost(self, seg: Segment) -> float:
+        return self.overhead + seg.seconds * self.rtf.get(seg.voice, self.default_rtf)
+
+# ---- splitting ----
+
+def _has_voice(el: ET.Element) -> bool:
+    return any(True for _ in el.iter("voice"))
+
+def split_segments(root: ET.Element, max_seconds: float = 20.0, model=None,
+                   default_voice: Optional[str] = None) -> List[Segment]:
+    """Single-voice segments of `root` in document order."""
+    model = model or WpmModel()
+    out: List[Segment] = []
+
+    def emit(chain: List[ET.Element], items: List[Union[str, ET.Element]], voice: Optional[str]) -> None:
+        doc = ET.Element(root.tag, root.attrib)
+        cur = doc
+        for anc in chain:
+            cur = ET.SubElement(cur, anc.tag, anc.attrib)
+        last: Optional[ET.Element] = None
+        for x in items:
+            if isinstance(x, str):
+                if last is None:
+                    cur.text = (cur.text or "") + x
+                else:
+                    last.tail = (last.tail or "") + x
+            else:
+                last = copy.deepcopy(x)
+                last.tail = None
+                cur.append(last)
+        est = estimate_duration(doc, model, default_voice=voice)
+        if est.words or est.breaks:
+            out.append(Segment(len(out), voice, ET.tostring(doc, encoding="unicode"), est.total, est.words))
+
+    def cost(x: Union[str, ET.Element], voice: Optional[str]) -> float:
+        if isinstance(x, str):
+            words = x.split()
+            return model.seconds(words, voice) if words else 0.0
+        return estimate_duration(x, model, default_voice=voice).total
+
+    def walk(el: ET.Element, chain: List[ET.Element], voice: Optional[str]) -> None:
+        items: List[Union[str, ET.Element]] = []
+        run: List[Union[str, ET.Element]] = []
+        total = 0.0
+        if el.text:
+            items.append(el.text)
+        for c in el:
+            items.append(c)
+            if c.tail:
+                items.append(c.tail)
+        for x in items:
+            if isinstance(x, ET.Element) and (x.tag == "voice" or _has_voice(x)):
+                split = True
+                c = 0.0
+            else:
+                c = cost(x, voice)
+                split = isinstance(x, ET.Element) and c > max_seconds and len(x) > 0
+            if split or (run and total + c > max_seconds):
+                if run:
+                    emit(chain, run, voice)
+                run, total = [], 0.0
+            if split:
+                v = x.attrib.get("name", voice) if x.tag == "voice" else voice
+                walk(x, chain + [x], v)
+            else:
+                run.append(x)
+                total += c
+        if run:
+            emit(chain, run, voice)
+
+    walk(root, [], default_voice)
+    return out
+
+# ---- scheduling ----
+
+class Assignment(NamedTuple):
+    segment: int
+    worker: int
+    start: float    # predicted, seconds from plan start
+    end: float
+
+class Plan(NamedTuple):
+    segments: List[Segment]
+    assignments: List[Assignment]    # indexed by segment
+    queues: List[List[int]]          # per worker: segment indices in execution order
+    playback: List[float]            # per segment: predicted playback start
+    ttfa: float                      # time to first audio
+    makespan: float
+    stall: float                     # total playback waiting after the first audio
+
+def _playback(segments: Sequence[Segment], ready: Sequence[float]):
+    t = 0.0
+    starts: List[float] = []
+    stall = 0.0
+    for s in segments:
+        begin = max(t, ready[s.index])
+        if starts:
+            stall += begin - t
+        starts.append(begin)
+        t = begin + s.seconds
+    return starts, stall
+
+def plan(segments: Sequence[Segment], workers: int = 4, engine_model: Optional[EngineModel] = None,
+         strategy: str = "hybrid") -> Plan:
+    """Schedule segments on `workers` queues and predict the playback timeline."""
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    em = engine_model or EngineModel()
+    segs = list(segments)
+    costs = [em.cost(s) for s in segs]
+    if strategy == "ordered":
+        order = list(range(len(segs)))
+    elif strategy == "lpt":
+        order = sorted(range(len(segs)), key=lambda i: (-costs[i], i))
+    elif strategy == "hybrid":
+        order = _hybrid_order(segs, costs)
+    else:
+        raise ValueError(f"Unknown strategy: {strategy}")
+
+    free = [(0.0, w) for w in range(workers)]   # (time the worker frees up, worker)
+    queues: List[List[int]] = [[] for _ in range(workers)]
+    assignments: List[Optional[Assignment]] = [None] * len(segs)
+    for i in order:
+        t, w = heapq.heappop(free)
+        assignments[i] = Assignment(i, w, t, t + costs[i])
+        queues[w].append(i)
+        heapq.heappush(free, (t + costs[i], w))
+    ready = [a.end for a in assignments]
+    starts, stall = _playback(segs, ready)
+    return Plan(segs, assignments, queues, starts,
+                ready[0] if segs else 0.0, max(ready, default=0.0), stall)
+
+def reassembly(p: Plan) -> List[Tuple[int, int, float, float]]:
+    """(segment, worker, predicted ready time, playback start) in playback order."""
+    return [(s.index, p.assignments[s.index].worker, p.assignments[s.index].end,
+             p.playback[s.index]) for s in p.segments]
+
+def _hybrid_order(segs: List[Segment], costs: List[float]) -> List[int]:
+    # segment 0 first, then least slack first: a segment must be ready by its
+    # playback offset (ttfa + audio before it), so it has to start by
+    # offset - cost; long segments move ahead of short ones near them
+    offset = 0.0
+    keys = []
+    for i, s in enumerate(segs):
+        keys.append((offset - costs[i], i))
+        offset += s.seconds
+    keys.sort()
+    return [0] + [i for _, i in keys if i != 0] if segs else []
+
+# ---- execution ----
+
+class LocalEngine:
+    """Stand-in engine: sleeps for the modelled cost (scaled) and returns fake PCM."""
+    __slots__ = ("model", "time_scale", "bytes_per_second", "calls")
+
+    def __init__(self, model: Optional[EngineModel] = None, time_scale: float = 0.01,
+                 bytes_per_second: int = 320):
+        self.model = model or EngineModel()
+        self.time_scale = time_scale
+        self.bytes_per_second = bytes_per_second
+        self.calls = 0
+
+    def __call__(self, seg: Segment) -> bytes:
+        self.calls += 1
+        time.sleep(self.model.cost(seg) * self.time_scale)
+        return bytes(int(seg.seconds * self.bytes_per_second))
+
+class RunResult(NamedTuple):
+    audio: List[bytes]          # per segment, in document order
+    ttfa: float                 # wall seconds until segment 0 was ready
+    makespan: float
+    ready: List[float]          # per segment, wall seconds
+
+def run_plan(p: Plan, engines: Union[Engine, Dict[Optional[str], Engine]]) -> RunResult:
+    """Execute a plan: one thread per worker queue; engines by voice (or one for all)."""
+    def engine_for(voice: Optional[str]) -> Engine:
+        if callable(engines):
+            return engines
+        return engines.get(voice) or engines[None]
+
+    audio: List[Optional[bytes]] = [None] * len(p.segments)
+    ready = [0.0] * len(p.segments)
+    errors: List[BaseException] = []
+    t0 = time.perf_counter()
+
+    def work(queue: List[int]) -> None:
+        try:
+            for i in queue:
+                s = p.segments[i]
+                audio[i] = engine_for(s.voice)(s)
+                ready[i] = time.perf_counter() - t0
+        except BaseException as e:   # surfaced in the calling thread
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(q,)) for q in p.queues if q]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    if errors:
+        raise errors[0]
+    return RunResult(audio, ready[0] if ready else 0.0, max(ready, default=0.0), ready)
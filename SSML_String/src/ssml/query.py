@@ -0,0 +1,227 @@
+from __future__ import annotations
+import re
+import xml.etree.ElementTree as ET
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+from .node import Node
+from .simple_etree import parse_ssml
+
+# XPath-lite over a parsed tree, answered from indexes built once per document.
+#
+# Supported syntax:
+#   /speak/p                 absolute child steps
+#   //say-as  or  say-as     descendants anywhere
+#   voice[@name='X']//say-as[@interpret-as="date"]
+#   *[@alias]                wildcard tag, attribute-presence predicate
+#
+# Every element gets a preorder id and the id one past its last descendant,
+# so "is a descendant of" is an interval check. Tags and attributes map to
+# sorted postings lists of ids; a step intersects postings, then joins with
+# the previous step's result by parent (/) or interval containment (//).
+
+Tree = Union[ET.Element, Node]
+
+class Step(NamedTuple):
+    axis: str                               # "/" child, "//" descendant
+    tag: str                                # tag name or "*"
+    preds: Tuple[Tuple[str, Optional[str]], ...]   # (attr, value or None for presence)
+
+_STEP_RE = re.compile(r"""\s*(//|/)?\s*([\w:.\-]+|\*)((?:\s*\[[^\]]*\])*)""")
+_PRED_RE = re.compile(r"""\[\s*@([\w:.\-]+)\s*(?:=\s*(?:'([^']*)'|"([^"]*)"))?\s*\]""")
+
+@lru_cache(maxsize=512)
+def compile_path(path: str) -> Tuple[Step, ...]:
+    steps: List[Step] = []
+    pos = 0
+    path = path.strip()
+    while pos < len(path):
+        m = _STEP_RE.match(path, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Bad query near: {path[pos:]!r}")
+        axis = m.group(1) or ("/" if steps else "//")
+        preds = []
+        for pm in _PRED_RE.finditer(m.group(3) or ""):
+            val = pm.group(2) if pm.group(2) is not None else pm.group(3)
+            preds.append((pm.group(1), val))
+        if m.group(3) and len(preds) != m.group(3).count("["):
+            raise ValueError(f"Unsupported predicate in: {m.group(0)!r}")
+        steps.append(Step(axis, m.group(2), tuple(preds)))
+        pos = m.end()
+    if not steps:
+        raise ValueError("Empty query")
+    return tuple(steps)
+
+def _intersect(a: List[int], b: List[int]) -> List[int]:
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) * 8 < len(b):
+        # galloping-ish: binary search the short list into the long one
+        out = []
+        lo = 0
+        for x in a:
+            lo = bisect_left(b, x, lo)
+            if lo < len(b) and b[lo] == x:
+                out.append(x)
+        return out
+    sb = set(b)
+    return [x for x in a if x in sb]
+
+class TreeIndex:
+    """Per-tag and per-attribute postings over one tree (ET.Element or Node)."""
+    __slots__ = ("nodes", "tags", "parent", "end", "depth", "by_tag", "by_attr", "by_attr_value")
+
+    def __init__(self, root: Tree):
+        self.nodes: List[Any] = []
+        self.tags: List[str] = []
+        self.parent: List[int] = []
+        self.end: List[int] = []
+        self.depth: List[int] = []
+        self.by_tag: Dict[str, List[int]] = {}
+        self.by_attr: Dict[str, List[int]] = {}
+        self.by_attr_value: Dict[Tuple[str, str], List[int]] = {}
+        if isinstance(root, Node):
+            self._build_from_node(root)
+        else:
+            self._build_from_element(root)
+
+    def _build_from_element(self, root: ET.Element) -> None:
+        nodes = self.nodes = list(root.iter())   # C-level preorder
+        n = len(nodes)
+        pos = {id(e): i for i, e in enumerate(nodes)}
+        parent = self.parent = [-1] * n
+        for i, e in enumerate(nodes):
+            for c in e:
+                parent[pos[id(c)]] = i
+        self._finish([e.tag for e in nodes], [e.attrib for e in nodes])
+
+    def _build_from_node(self, root: Node) -> None:
+        # parse_tiny trees keep text as "#text" children; only elements are indexed.
+        # Its synthetic "ROOT" is the document node, like the one above an ET
+        # root: its element children are the top-level elements.
+        nodes: List[Node] = []
+        parent: List[int] = []
+        tops = [c for c in root.children if c.tag != "#text"] if root.tag == "ROOT" else [root]
+        stack: List[Tuple[Node, int]] = [(c, -1) for c in reversed(tops)]
+        while stack:
+            el, par = stack.pop()
+            i = len(nodes)
+            nodes.append(el)
+            parent.append(par)
+            for c in reversed(el.children):
+                if c.tag != "#text":
+                    stack.append((c, i))
+        self.nodes, self.parent = nodes, parent
+        self._finish([e.tag for e in nodes], [e.attrs for e in nodes])
+
+    def _finish(self, tags: List[str], attrs: List[Dict[str, str]]) -> None:
+        n = len(tags)
+        parent = self.parent
+        self.tags = tags
+        # subtree sizes bottom-up (children always follow their parent in preorder)
+        size = [1] * n
+        for i in range(n - 1, -1, -1):
+            if parent[i] >= 0:
+                size[parent[i]] += size[i]
+        self.end = [i + size[i] for i in range(n)]
+        depth = self.depth = [0] * n
+        for i in range(n):
+            if parent[i] >= 0:
+                depth[i] = depth[parent[i]] + 1
+        by_tag = self.by_tag
+        by_attr = self.by_attr
+        by_attr_value = self.by_attr_value
+        for i, tag in enumerate(tags):
+            lst = by_tag.get(tag)
+            if lst is None:
+                by_tag[tag] = [i]
+            else:
+                lst.append(i)
+            a = attrs[i]
+            if a:
+                for k, v in a.items():
+                    by_attr.setdefault(k, []).append(i)
+                    by_attr_value.setdefault((k, v), []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def root(self) -> Any:
+        return self.nodes[0]
+
+    def _candidates(self, step: Step) -> List[int]:
+        lists: List[List[int]] = []
+        if step.tag != "*":
+            lists.append(self.by_tag.get(step.tag, []))
+        for attr, val in step.preds:
+            key_list = self.by_attr.get(attr, []) if val is None else self.by_attr_value.get((attr, val), [])
+            lists.append(key_list)
+        if not lists:
+            return list(range(len(self.nodes)))
+        lists.sort(key=len)
+        out = lists[0]
+        for other in lists[1:]:
+            if not out:
+                break
+            out = _intersect(out, other)
+        return out
+
+    def _join(self, ctx: Optional[List[int]], cand: List[int], axis: str) -> List[int]:
+        if ctx is None:  # first step, evaluated against the document node
+            if axis == "/":
+                parent = self.parent
+                return [c for c in cand if parent[c] < 0]
+            return cand
+        if axis == "/":
+            ctx_set = set(ctx)
+            parent = self.parent
+            return [c for c in cand if parent[c] in ctx_set]
+        # descendant: sweep sorted candidates against the union of context intervals
+        end = self.end
+        out: List[int] = []
+        j = 0
+        hi = -1
+        for c in cand:
+            while j < len(ctx) and ctx[j] < c:
+                hi = max(hi, end[ctx[j]])
+                j += 1
+            if c < hi:
+                out.append(c)
+        return out
+
+    def select_ids(self, path: str) -> List[int]:
+        ctx: Optional[List[int]] = None
+        for step in compile_path(path):
+            ctx = self._join(ctx, self._candidates(step), step.axis)
+            if not ctx:
+                return []
+        return ctx or []
+
+    def select(self, path: str) -> List[Any]:
+        """Elements matching `path`, in document order."""
+        nodes = self.nodes
+        return [nodes[i] for i in self.select_ids(path)]
+
+    def count(self, path: str) -> int:
+        return len(self.select_ids(path))
+
+    def ancestors(self, el_id: int) -> List[int]:
+        out = []
+        p = self.parent[el_id]
+        while p != -1:
+            out.append(p)
+            p = self.parent[p]
+        return out
+
+class IndexedDocument(NamedTuple):
+    root: ET.Element
+    index: TreeIndex
+
+    def select(self, path: str) -> List[ET.Element]:
+        return self.index.select(path)
+
+def parse_indexed(text: str) -> IndexedDocument:
+    """parse_ssml + build the query index once, at parse time."""
+    root = parse_ssml(text)
+    return IndexedDocument(root, TreeIndex(root))
@@ -0,0 +1,119 @@
+from __future__ import annotations
+import re
+import xml.etree.ElementTree as ET
+from typing import Optional
+
+# Spoken-form expansion for <say-as>, used to estimate how much is actually said.
+# English only, deliberately small: cardinals/ordinals up to the trillions,
+# digit/character spelling, simple m/d/y dates and h:mm times. Cardinals and
+# ordinals also accept canonical roman numerals ("VIII").
+
+_ONES = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine",
+         "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen",
+         "seventeen", "eighteen", "nineteen"]
+_TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+_SCALES = [(10**12, "trillion"), (10**9, "billion"), (10**6, "million"), (1000, "thousand")]
+_ORDINAL_IRREGULAR = {"one": "first", "two": "second", "three": "third", "five": "fifth",
+                      "eight": "eighth", "nine": "ninth", "twelve": "twelfth"}
+_MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+           "August", "September", "October", "November", "December"]
+
+# canonical roman numeral 1..3999 (no "IIII", "VX"); semiotic.py embeds it in its scanner
+ROMAN_PATTERN = r"(?=[MDCLXVI])M{0,3}(?:CM|CD|D?C{0,3})(?:XC|XL|L?X{0,3})(?:IX|IV|V?I{0,3})"
+_ROMAN = re.compile(ROMAN_PATTERN)
+_ROMAN_VALUES = {"M": 1000, "D": 500, "C": 100, "L": 50, "X": 10, "V": 5, "I": 1}
+
+def roman_to_int(s: str) -> Optional[int]:
+    """'MCMXCIV' -> 1994; None unless `s` is a canonical roman numeral."""
+    if not _ROMAN.fullmatch(s):
+        return None
+    total = 0
+    for a, b in zip(s, s[1:] + "I"):
+        v = _ROMAN_VALUES[a]
+        total += -v if v < _ROMAN_VALUES[b] else v
+    return total
+
+def _below_thousand(n: int) -> str:
+    parts = []
+    if n >= 100:
+        parts.append(_ONES[n // 100] + " hundred")
+        n %= 100
+    if n >= 20:
+        parts.append(_TENS[n // 10] + ("-" + _ONES[n % 10] if n % 10 else ""))
+    elif n or not parts:
+        parts.append(_ONES[n])
+    return " ".join(parts)
+
+def number_to_words(n: int) -> str:
+    """12045 -> 'twelve thousand forty-five'."""
+    if n < 0:
+        return "minus " + number_to_words(-n)
+    if n < 1000:
+        return _below_thousand(n)
+    parts = []
+    for value, name in _SCALES:
+        if n >= value:
+            parts.append(number_to_words(n // value) + " " + name)
+            n %= value
+    if n:
+        parts.append(_below_thousand(n))
+    return " ".join(parts)
+
+def ordinal_to_words(n: int) -> str:
+    """21 -> 'twenty-first'."""
+    words = number_to_words(n)
+    cut = max(words.rfind(" "), words.rfind("-")) + 1
+    head, last = words[:cut], words[cut:]
+    if last in _ORDINAL_IRREGULAR:
+        last = _ORDINAL_IRREGULAR[last]
+    elif last.endswith("y"):
+        last = last[:-1] + "ieth"
+    else:
+        last += "th"
+    return head + last
+
+def _digits_only(s: str) -> str:
+    return "".join(ch for ch in s if ch.isdecimal())
+
+def expand_say_as(mode: str, text: str, fmt: Optional[str] = None) -> str:
+    """Spoken form of `text` under <say-as interpret-as=mode format=fmt>."""
+    txt = text.strip()
+    if not txt:
+        return ""
+    if mode in ("characters", "spell-out", "verbatim"):
+        return " ".join(ch for ch in txt if not ch.isspace())
+    if mode in ("digits", "telephone"):
+        return " ".join(_ONES[int(ch)] for ch in txt if ch.isdecimal())
+    if mode in ("cardinal", "number", "ordinal"):
+        d = _digits_only(txt)
+        n = int(d) if d else roman_to_int(txt)
+        if n is None:
+            return txt
+        return ordinal_to_words(n) if mode == "ordinal" else number_to_words(n)
+    if mode == "date":
+        parts = [p for p in txt.replace("-", "/").split("/") if p]
+        if len(parts) == 3 and all(p.isdecimal() for p in parts):
+            order = (fmt or "mdy").lower()
+            if order == "ymd":
+                y, m, d = parts
+            elif order == "dmy":
+                d, m, y = parts
+            else:
+                m, d, y = parts
+            mi = int(m)
+            month = _MONTHS[mi - 1] if 1 <= mi <= 12 else number_to_words(mi)
+            return f"{month} {ordinal_to_words(int(d))} {number_to_words(int(y))}"
+    if mode == "time":
+        hh, _, mm = txt.partition(":")
+        if hh.isdecimal() and mm[:2].isdecimal():
+            m = int(mm[:2])
+            rest = mm[2:].strip()
+            spoken = number_to_words(int(hh))
+            if m:
+                spoken += (" oh " if m < 10 else " ") + number_to_words(m)
+            return spoken + (" " + rest if rest else "")
+    return txt
+
+def say_as_text(el: ET.Element) -> str:
+    """expand_say_as for a parsed <say-as> element."""
+    return expand_say_as(el.attrib.get("interpret-as", ""), el.text or "", el.attrib.get("format"))
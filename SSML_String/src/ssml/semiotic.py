@@ -0,0 +1,105 @@
+from __future__ import annotations
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, List
+from .annotate import Span, annotate_tree, spans_to_tree
+from .say_as import ROMAN_PATTERN
+
+# Semiotic-class detection for plain text: one compiled regex with a named
+# group per class, scanned once with finditer; m.lastgroup says which class
+# matched, and the span is wrapped in the matching <say-as>:
+#
+#   "Call 555-123-4567 by 5:30 pm on 3/14/2025, the 2nd of 3 reminders for Henry VIII"
+#   -> ... <say-as interpret-as="telephone">555-123-4567</say-as> by
+#          <say-as interpret-as="time">5:30 pm</say-as> on
+#          <say-as interpret-as="date" format="mdy">3/14/2025</say-as>, the
+#          <say-as interpret-as="ordinal">2nd</say-as> of
+#          <say-as interpret-as="cardinal">3</say-as> reminders for Henry
+#          <say-as interpret-as="ordinal">VIII</say-as>
+#
+# Alternatives are ordered most specific first (dates, phone numbers, times
+# before plain numbers). Numeric tokens must stand alone: a digit run glued to
+# letters, or joined by ".", ",", ":", "/" or "-" to more digits in a way no
+# class accepts (decimals, ranges, seconds), is left untouched rather than cut
+# into cardinals. Month/day/hour ranges are checked by the regex itself.
+#
+# Roman numerals need context, since "I", "MD" or "CV" are usually words:
+# after a cue word ("Chapter IV", "World War II") they are read as cardinals,
+# if they use only I/V/X or have two or more letters ("Appendix C", "Type D"
+# are letters, not 100 and 500). After another capitalized word that is not a
+# common non-name (ROMAN_ORDINAL_STOPWORDS), two or more of I/V/X ("Henry
+# VIII", "Louis XIV") are read as regnal ordinals; no L, so sizes like "XL"
+# stay text. say_as.expand_say_as reads roman numerals, so the tree goes
+# straight to flatten_text / duration estimates.
+
+ROMAN_CARDINAL_CUES = ("Chapter", "Part", "Volume", "Book", "Act", "Scene", "Section",
+                       "Article", "Appendix", "Phase", "Level", "Class", "Type", "War",
+                       "Bowl", "Episode", "Season")
+ROMAN_ORDINAL_STOPWORDS = ("Size", "Order", "Buy", "Get", "Wear", "Pick", "Choose", "Select",
+                           "Model", "Item", "Grade", "Room", "Gate", "Pack", "Style", "Fit")
+
+_DAY = r"(?:0?[1-9]|[12]\d|3[01])"
+_MONTH = r"(?:0?[1-9]|1[0-2])"
+_YEAR = r"(?:\d{4}|\d{2})"
+_ROMAN_CUED = rf"(?:(?=[IVX]+\b)|(?=[MDCLXVI]{{2}})){ROMAN_PATTERN}"
+_ROMAN_REGNAL = r"(?=[IVX]{2})X{0,3}(?:IX|IV|V?I{0,3})"
+
+def _pattern(date_order: str) -> str:
+    first, second = (_MONTH, _DAY) if date_order == "mdy" else (_DAY, _MONTH)
+    numeric = "|".join([
+        rf"(?P<date_iso>\d{{4}}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01]))",
+        rf"(?P<date>{first}(?P<sep>[/-]){second}(?P=sep){_YEAR})",
+        r"(?P<telephone>(?:\+?1[-. ])?(?:\(\d{3}\) ?|\d{3}[-. ])\d{3}[-. ]\d{4})",
+        r"(?P<time>(?:[01]?\d|2[0-3]):[0-5]\d(?:\s?(?:[AaPp]\.[Mm]\.|[AaPp][Mm]\b))?)",
+        r"(?P<ordinal>\d+(?:st|nd|rd|th))",
+        r"(?P<cardinal>\d{1,3}(?:,\d{3})+|\d+)",
+    ])
+    cues = "|".join(ROMAN_CARDINAL_CUES)
+    stop = "|".join(ROMAN_ORDINAL_STOPWORDS)
+    roman = "|".join([
+        rf"(?:{cues}) (?P<roman_cardinal>{_ROMAN_CUED})",
+        rf"(?!(?:{stop})\b)[A-Z][a-z]+ (?P<roman_ordinal>{_ROMAN_REGNAL})",
+    ])
+    # the leading lookahead rejects most positions with one character test
+    # before any alternative is tried
+    return (rf"(?=[\d(+A-Z])(?:(?<![\w.,:/+-])(?:{numeric})(?!\w|[.,:/-]\d)"
+            rf"|\b(?:{roman})(?!\w))")
+
+_SAY_AS = {"date_iso": ("date", "ymd"), "telephone": ("telephone", None), "time": ("time", None),
+           "ordinal": ("ordinal", None), "cardinal": ("cardinal", None),
+           "roman_cardinal": ("cardinal", None), "roman_ordinal": ("ordinal", None)}
+
+class SemioticTagger:
+    """Compiled detector for cardinals, ordinals, dates, times, phone numbers
+    and roman numerals in plain text."""
+    __slots__ = ("date_order", "_re", "_attrs")
+
+    def __init__(self, date_order: str = "mdy"):
+        if date_order not in ("mdy", "dmy"):
+            raise ValueError(f"Unsupported date order: {date_order}")
+        self.date_order = date_order
+        self._re = re.compile(_pattern(date_order))
+        self._attrs: Dict[str, Dict[str, str]] = {}
+        for group, (mode, fmt) in dict(_SAY_AS, date=("date", date_order)).items():
+            self._attrs[group] = {"interpret-as": mode, "format": fmt} if fmt else {"interpret-as": mode}
+
+    def find_spans(self, text: str) -> List[Span]:
+        """Sorted, non-overlapping (start, end, "say-as", attrs) spans."""
+        attrs = self._attrs
+        out: List[Span] = []
+        for m in self._re.finditer(text):
+            g = m.lastgroup                 # outermost group of the matched class
+            out.append((m.start(g), m.end(g), "say-as", attrs[g]))
+        return out
+
+    def annotate_text(self, text: str, root_tag: str = "speak") -> ET.Element:
+        """Plain text -> SSML tree ready for flatten_text / total_duration_seconds."""
+        return spans_to_tree(text, self.find_spans(text), root_tag)
+
+    def annotate_element(self, root: ET.Element) -> ET.Element:
+        """Annotate text and tails of an existing tree in place (skips <sub>/<say-as> content)."""
+        return annotate_tree(root, self.find_spans)
+
+def annotate_semiotic(text: str, date_order: str = "mdy") -> ET.Element:
+    """One-shot helper: SemioticTagger(date_order).annotate_text(text)."""
+    return SemioticTagger(date_order).annotate_text(text)
@@ -0,0 +1,281 @@
+from __future__ import annotations
+import asyncio
+import concurrent.futures
+import copy
+import os
+import xml.etree.ElementTree as ET
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from .simple_etree import parse_ssml
+from .tiny_parser import parse_tiny
+from .transforms import flatten_text, total_duration_seconds, validate_ssml
+from .edge_cases import analyze
+
+# Asyncio facade for the (CPU-bound) parse/analysis functions.
+#
+#   submit() --> bounded asyncio.Queue --> N worker tasks --> executor (threads or processes)
+#
+# - Backpressure: the queue holds at most `queue_size` pending jobs; submit() waits
+#   for room, or raises ServiceBusy with wait=False.
+# - Coalescing: identical in-flight requests (same op, text and options) share one
+#   job. When a job was shared, each caller gets its own deep copy of the result,
+#   so mutating a returned tree does not change what the others received.
+# - Timeouts/cancellation apply per caller. Waiting for queue room happens in a
+#   separate put task, so a submitter that times out or is cancelled there does
+#   not take down duplicates that joined its job. A job nobody waits for any
+#   more is dropped if it has not started; once running in the executor it
+#   cannot be interrupted, its result is just discarded.
+# - Thread safety: the facade lives on one event loop; other threads use
+#   submit_threadsafe(), which returns a concurrent.futures.Future.
+#
+# Operations are plain module-level functions of the document text, so they can
+# be shipped to a process pool.
+
+def _op_parse(text: str) -> ET.Element:
+    return parse_ssml(text)
+
+def _op_flatten(text: str) -> str:
+    return flatten_text(parse_ssml(text))
+
+def _op_duration(text: str, wpm: int = 180) -> float:
+    return total_duration_seconds(parse_ssml(text), wpm=wpm)
+
+def _op_validate(text: str) -> List[str]:
+    """[] when valid, else [message] (validate_ssml raises on the first problem)."""
+    try:
+        validate_ssml(parse_ssml(text))
+    except (ValueError, ET.ParseError) as e:
+        return [str(e)]
+    return []
+
+OPERATIONS: Dict[str, Callable[..., Any]] = {
+    "parse": _op_parse,
+    "parse_tiny": parse_tiny,
+    "flatten": _op_flatten,
+    "duration": _op_duration,
+    "validate": _op_validate,
+    "edge_cases": analyze,
+}
+
+def _run(op: str, text: str, kwargs: Tuple[Tuple[str, Any], ...]) -> Any:
+    # executor entry point; looks the op up by name so it pickles cheaply
+    return OPERATIONS[op](text, **dict(kwargs))
+
+class ServiceBusy(RuntimeError):
+    """Raised by submit(wait=False) when the queue is full."""
+
+class ServiceStats:
+    __slots__ = ("submitted", "coalesced", "completed", "failed", "timed_out", "cancelled", "rejected")
+
+    def __init__(self):
+        for k in self.__slots__:
+            setattr(self, k, 0)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+class _Job:
+    __slots__ = ("key", "future", "waiters", "shared")
+
+    def __init__(self, key, future: asyncio.Future):
+        self.key = key
+        self.future = future
+        self.waiters = 0
+        self.shared = False        # a duplicate joined: hand out copies of the result
+
+class SSMLService:
+    """Bounded, coalescing async front end over OPERATIONS.
+
+    executor: "thread" (default), "process", or a concurrent.futures.Executor
+    (not shut down by close()). `concurrency` worker tasks feed the executor,
+    so at most that many jobs run at once. Use as `async with SSMLService() as svc`.
+    """
+
+    def __init__(self, executor: Any = "thread", max_workers: Optional[int] = None,
+                 queue_size: int = 256, concurrency: Optional[int] = None,
+                 timeout: Optional[float] = None, coalesce: bool = True):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.concurrency = concurrency or self.max_workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.coalesce = coalesce
+        self.stats = ServiceStats()
+        self._executor_spec = executor
+        self._executor: Optional[concurrent.futures.Executor] = None
+        self._owns_executor = False
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._inflight: Dict[Any, _Job] = {}
+        self._putting: Set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ---- lifecycle ----
+
+    async def start(self) -> "SSMLService":
+        if self._loop is not None:
+            return self
+        self._loop = asyncio.get_running_loop()
+        spec = self._executor_spec
+        if spec == "thread":
+            self._executor = concurrent.futures.ThreadPoolExecutor(self.max_workers, thread_name_prefix="ssml")
+            self._owns_executor = True
+        elif spec == "process":
+            self._executor = concurrent.futures.ProcessPoolExecutor(self.max_workers)
+            self._owns_executor = True
+        elif isinstance(spec, concurrent.futures.Executor):
+            self._executor = spec
+        else:
+            raise ValueError(f"Unknown executor: {spec!r}")
+        self._queue = asyncio.Queue(self.queue_size)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        return self
+
+    async def close(self) -> None:
+        """Stop the workers; pending jobs are cancelled."""
+        if self._loop is None:
+            return
+        for w in self._workers:
+            w.cancel()
+        for t in self._putting:
+            t.cancel()
+        await asyncio.gather(*self._workers, *self._putting, return_exceptions=True)
+        self._workers = []
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            job.future.cancel()
+        for job in self._inflight.values():
+            job.future.cancel()
+        self._inflight.clear()
+        if self._owns_executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        self._loop = None
+
+    async def __aenter__(self) -> "SSMLService":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    @property
+    def pending(self) -> int:
+        """Jobs queued but not yet picked up by a worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    # ---- requests ----
+
+    async def submit(self, op: str, text: str, *, timeout: Optional[float] = None,
+                     wait: bool = True, **kwargs: Any) -> Any:
+        """Run OPERATIONS[op](text, **kwargs) off the event loop and return its result.
+
+        Raises asyncio.TimeoutError after `timeout` (default: the service's), and
+        ServiceBusy if wait=False and the queue is full.
+        """
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {op}")
+        if self._loop is None:
+            await self.start()
+        self.stats.submitted += 1
+        if timeout is None:
+            timeout = self.timeout
+        key = (op, text, tuple(sorted(kwargs.items())))
+        job = self._inflight.get(key) if self.coalesce else None
+        if job is not None:
+            self.stats.coalesced += 1
+            job.shared = True
+            return await self._wait(job, timeout)
+        job = _Job(key, self._loop.create_future())
+        job.waiters = 1            # the submitter, from before the job is visible to duplicates
+        if self.coalesce:
+            self._inflight[key] = job  # duplicates arriving while we wait for room join this job
+        if wait:
+            self._put(job)
+        else:
+            try:
+                self._queue.put_nowait(job)
+            except asyncio.QueueFull:
+                # no await since the job was created, so nobody else has joined it
+                self._forget(job)
+                job.future.cancel()
+                self.stats.rejected += 1
+                raise ServiceBusy(f"queue full ({self.queue_size} pending)") from None
+        return await self._wait(job, timeout, counted=True)
+
+    def _put(self, job: _Job) -> None:
+        # the put belongs to the job, not to the submitter: it keeps waiting for
+        # room while anyone waits on the job and stops when the job is dropped
+        task = self._loop.create_task(self._queue.put(job))
+        self._putting.add(task)
+        task.add_done_callback(self._putting.discard)
+        job.future.add_done_callback(lambda _: task.cancel())
+
+    async def _wait(self, job: _Job, timeout: Optional[float], counted: bool = False) -> Any:
+        if not counted:
+            job.waiters += 1
+        try:
+            result = await asyncio.wait_for(asyncio.shield(job.future), timeout)
+            return copy.deepcopy(result) if job.shared else result
+        except asyncio.TimeoutError:
+            self.stats.timed_out += 1
+            raise
+        except asyncio.CancelledError:
+            if not job.future.cancelled():
+                self.stats.cancelled += 1
+            raise
+        finally:
+            job.waiters -= 1
+            if job.waiters == 0 and not job.future.done():
+                # nobody is listening: drop it (a worker skips cancelled jobs)
+                job.future.cancel()
+                self._forget(job)
+
+    def _forget(self, job: _Job) -> None:
+        if self._inflight.get(job.key) is job:
+            del self._inflight[job.key]
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.future.done():
+                    continue
+                op, text, kwargs = job.key
+                try:
+                    result = await loop.run_in_executor(self._executor, _run, op, text, kwargs)
+                except asyncio.CancelledError:
+                    job.future.cancel()
+                    raise
+                except Exception as e:
+                    self.stats.failed += 1
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                else:
+                    self.stats.completed += 1
+                    if not job.future.done():
+                        job.future.set_result(result)
+            finally:
+                self._forget(job)
+                self._queue.task_done()
+
+    def submit_threadsafe(self, op: str, text: str, **kwargs: Any) -> concurrent.futures.Future:
+        """submit() from a thread other than the service's event loop."""
+        if self._loop is None:
+            raise RuntimeError("service is not started")
+        return asyncio.run_coroutine_threadsafe(self.submit(op, text, **kwargs), self._loop)
+
+    # ---- convenience wrappers ----
+
+    async def parse(self, text: str, **kw: Any) -> ET.Element:
+        return await self.submit("parse", text, **kw)
+
+    async def flatten(self, text: str, **kw: Any) -> str:
+        return await self.submit("flatten", text, **kw)
+
+    async def duration(self, text: str, **kw: Any) -> float:
+        return await self.submit("duration", text, **kw)
+
+    async def validate(self, text: str, **kw: Any) -> List[str]:
+        return await self.submit("validate", text, **kw)
+
+    async def edge_cases(self, text: str, **kw: Any) -> Dict[str, Any]:
+        return await self.submit("edge_cases", text, **kw)
@@ -1,9 +1,10 @@
 from __future__ import annotations
 import xml.etree.ElementTree as ET
 from typing import Any
+from .backends import parse
 
 def parse_ssml(text: str) -> ET.Element:
     """Parse SSML using Python stdlib ElementTree (no external libs)."""
-    # ElementTree will raise for unclosed/ill-formed XML
-    root = ET.fromstring(text)
-    return root
+    # ElementTree will raise for unclosed/ill-formed XML; backends.parse picks
+    # plain ET.fromstring or, for very large text, incremental expat feeding
+    return parse(text)
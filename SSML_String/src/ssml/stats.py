@@ -0,0 +1,162 @@
+from __future__ import annotations
+import json
+import xml.etree.ElementTree as ET
+from typing import Any, Callable, Dict, Iterable, List
+from .simple_etree import parse_ssml
+from .transforms import break_seconds
+
+# Corpus-wide SSML telemetry.
+# DocStats.add() walks one document once and folds it into running totals;
+# partial aggregates from different processes combine with merge() (or via
+# to_dict()/from_dict() when shipped as JSON). Nothing per-document is kept.
+
+OTHER = "__other__"   # bucket for attribute values beyond max_values
+
+class DocStats:
+    """Mergeable aggregate: tags, attribute vocabularies, depth/text-length histograms, breaks."""
+    __slots__ = ("documents", "elements", "parse_errors", "tags", "attributes",
+                 "depth_histogram", "text_length_histogram", "break_count",
+                 "break_seconds", "max_values")
+
+    def __init__(self, max_values: int = 256):
+        self.max_values = max_values          # per tag@attr vocabulary cap
+        self.documents = 0
+        self.elements = 0
+        self.parse_errors = 0
+        self.tags: Dict[str, int] = {}
+        self.attributes: Dict[str, Dict[str, int]] = {}   # "tag@attr" -> value -> count
+        self.depth_histogram: List[int] = []              # [depth] -> elements
+        self.text_length_histogram: List[int] = []        # [bit_length(chars)] -> documents
+        self.break_count = 0
+        self.break_seconds = 0.0
+
+    def add(self, root: ET.Element) -> None:
+        """Fold one parsed document into the aggregate (single pass)."""
+        chars = self._walk(root, 0)
+        self.documents += 1
+        bucket = chars.bit_length()   # 0, 1, 2-3, 4-7, 8-15, ...
+        hist = self.text_length_histogram
+        if bucket >= len(hist):
+            hist.extend([0] * (bucket + 1 - len(hist)))
+        hist[bucket] += 1
+
+    def _walk(self, el: ET.Element, depth: int) -> int:
+        tag = el.tag
+        self.elements += 1
+        tags = self.tags
+        tags[tag] = tags.get(tag, 0) + 1
+        hist = self.depth_histogram
+        if depth >= len(hist):
+            hist.append(0)
+        hist[depth] += 1
+        attrib = el.attrib
+        if attrib:
+            attributes = self.attributes
+            for k, v in attrib.items():
+                key = tag + "@" + k
+                vocab = attributes.get(key)
+                if vocab is None:
+                    vocab = attributes[key] = {}
+                if v in vocab:
+                    vocab[v] += 1
+                elif len(vocab) < self.max_values:
+                    vocab[v] = 1
+                else:
+                    vocab[OTHER] = vocab.get(OTHER, 0) + 1
+            if tag == "break":
+                try:
+                    self.break_seconds += break_seconds(el)
+                except ValueError:
+                    pass            # unparsable time ('xs'): counted as a break, no pause
+        if tag == "break":
+            self.break_count += 1
+        chars = len(el.text.strip()) if el.text else 0
+        for c in el:
+            chars += self._walk(c, depth + 1)
+            if c.tail:
+                chars += len(c.tail.strip())
+        return chars
+
+    def add_text(self, text: str, parse: Callable[[str], ET.Element] = parse_ssml) -> None:
+        """Parse and add one document; malformed input is counted, not raised."""
+        try:
+            root = parse(text)
+        except ET.ParseError:
+            self.parse_errors += 1
+            return
+        self.add(root)
+
+    def merge(self, other: "DocStats") -> "DocStats":
+        """Fold another partial aggregate into this one (in place) and return self."""
+        self.documents += other.documents
+        self.elements += other.elements
+        self.parse_errors += other.parse_errors
+        self.break_count += other.break_count
+        self.break_seconds += other.break_seconds
+        for t, n in other.tags.items():
+            self.tags[t] = self.tags.get(t, 0) + n
+        for key, vocab in other.attributes.items():
+            mine = self.attributes.setdefault(key, {})
+            for v, n in vocab.items():
+                if v in mine or v == OTHER or len(mine) < self.max_values:
+                    mine[v] = mine.get(v, 0) + n
+                else:
+                    mine[OTHER] = mine.get(OTHER, 0) + n
+        _add_hist(self.depth_histogram, other.depth_histogram)
+        _add_hist(self.text_length_histogram, other.text_length_histogram)
+        return self
+
+    def attributes_by_tag(self) -> Dict[str, List[str]]:
+        out: Dict[str, List[str]] = {}
+        for key in self.attributes:
+            tag, attr = key.rsplit("@", 1)
+            out.setdefault(tag, []).append(attr)
+        return {t: sorted(a) for t, a in out.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "documents": self.documents,
+            "elements": self.elements,
+            "parse_errors": self.parse_errors,
+            "tags": dict(self.tags),
+            "attributes": {k: dict(v) for k, v in self.attributes.items()},
+            "depth_histogram": list(self.depth_histogram),
+            "text_length_histogram": list(self.text_length_histogram),
+            "breaks": {"count": self.break_count, "seconds": round(self.break_seconds, 3)},
+            "max_values": self.max_values,
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "DocStats":
+        st = cls(max_values=d.get("max_values", 256))
+        st.documents = d["documents"]
+        st.elements = d["elements"]
+        st.parse_errors = d.get("parse_errors", 0)
+        st.tags = dict(d["tags"])
+        st.attributes = {k: dict(v) for k, v in d["attributes"].items()}
+        st.depth_histogram = list(d["depth_histogram"])
+        st.text_length_histogram = list(d["text_length_histogram"])
+        st.break_count = d["breaks"]["count"]
+        st.break_seconds = d["breaks"]["seconds"]
+        return st
+
+    @classmethod
+    def from_json(cls, s: str) -> "DocStats":
+        return cls.from_dict(json.loads(s))
+
+def _add_hist(dst: List[int], src: List[int]) -> None:
+    if len(src) > len(dst):
+        dst.extend([0] * (len(src) - len(dst)))
+    for i, n in enumerate(src):
+        dst[i] += n
+
+def collect_stats(texts: Iterable[str], parse: Callable[[str], ET.Element] = parse_ssml,
+                  max_values: int = 256) -> DocStats:
+    """Batch path: parse + aggregate a stream of SSML documents."""
+    st = DocStats(max_values=max_values)
+    for text in texts:
+        st.add_text(text, parse)
+    return st
@@ -0,0 +1,111 @@
+from __future__ import annotations
+import xml.etree.ElementTree as ET
+from typing import Iterator, List, NamedTuple, Optional, Union
+from .backends import iter_chunks
+from .transforms import parse_time_seconds
+
+# Streaming flatten_text / total_duration_seconds for documents too large to
+# hold as a tree. An XMLPullParser is fed chunk by chunk and every element is
+# detached from its parent as soon as its tail has been read, so only the open
+# path (O(depth) elements) is alive at any time.
+#
+# Text order with start/end events: an element's text is complete when its
+# first child starts (or it ends); a child's tail is complete when the next
+# sibling starts (or the parent ends). Those are exactly the points where the
+# pending piece is emitted, so output order and <sub alias> replacement match
+# the tree versions, however the input is chunked.
+
+CHUNK_SIZE = 1 << 16
+
+class _Frame:
+    __slots__ = ("el", "mute", "text_done", "last")
+
+    def __init__(self, el: ET.Element, mute: bool):
+        self.el = el
+        self.mute = mute          # inside <sub alias>: text is replaced by the alias
+        self.text_done = False
+        self.last: Optional[ET.Element] = None   # closed child whose tail is pending
+
+def _pending(f: _Frame) -> Optional[str]:
+    # the piece that became complete at this event, detaching a finished child
+    if not f.text_done:
+        f.text_done = True
+        return None if f.mute else f.el.text
+    if f.last is not None:
+        child, f.last = f.last, None
+        f.el.remove(child)
+        return None if f.mute else child.tail
+    return None
+
+def iter_pieces(source, chunk_size: int = CHUNK_SIZE) -> Iterator[Union[str, float]]:
+    """Spoken text pieces (str) and <break time> pauses (float seconds), in document order.
+
+    `source`: str/bytes, a file object, or an iterable of chunks.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: List[_Frame] = []
+
+    def handle(events) -> Iterator[Union[str, float]]:
+        for ev, el in events:
+            if ev == "start":
+                mute = False
+                if stack:
+                    f = stack[-1]
+                    piece = _pending(f)
+                    if piece:
+                        yield piece
+                    mute = f.mute
+                if el.tag == "sub" and "alias" in el.attrib and not mute:
+                    yield el.attrib["alias"]
+                    mute = True
+                elif el.tag == "break":
+                    t = el.attrib.get("time")
+                    if t:
+                        yield parse_time_seconds(t)
+                stack.append(_Frame(el, mute))
+            else:
+                f = stack.pop()
+                piece = _pending(f)
+                if piece:
+                    yield piece
+                if stack:
+                    stack[-1].last = el
+
+    for chunk in iter_chunks(source, chunk_size):
+        parser.feed(chunk)
+        yield from handle(parser.read_events())
+    parser.close()
+    yield from handle(parser.read_events())
+
+def iter_words(source, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Words of flatten_text(parse_ssml(source)), without building the tree."""
+    for piece in iter_pieces(source, chunk_size):
+        if piece.__class__ is str:
+            yield from piece.split()
+
+def stream_flatten_text(source, chunk_size: int = CHUNK_SIZE) -> str:
+    """flatten_text for a streamed document (the output itself is O(text))."""
+    return " ".join(iter_words(source, chunk_size))
+
+class StreamStats(NamedTuple):
+    words: int
+    break_seconds: float
+
+    def duration(self, wpm: int = 180) -> float:
+        """Same formula as total_duration_seconds."""
+        return round(self.words / (wpm / 60.0) + self.break_seconds, 3)
+
+def stream_stats(source, chunk_size: int = CHUNK_SIZE) -> StreamStats:
+    """Word count and <break time> total in one constant-memory pass."""
+    words = 0
+    br = 0.0
+    for piece in iter_pieces(source, chunk_size):
+        if piece.__class__ is str:
+            words += len(piece.split())
+        else:
+            br += piece
+    return StreamStats(words, br)
+
+def stream_total_duration_seconds(source, wpm: int = 180, chunk_size: int = CHUNK_SIZE) -> float:
+    """total_duration_seconds without building the tree."""
+    return stream_stats(source, chunk_size).duration(wpm)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+import html
+import re
+import xml.etree.ElementTree as ET
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+from .simple_etree import parse_ssml
+from .transforms import flatten_text, parse_time_seconds
+from .edge_cases import MAX_DEPTH, element_issues
+
+# Precompiled SSML templates.
+#
+#   t = Template('<speak>Hello {name}, your code is {code:int}.<break time="{pause:time}"/></speak>')
+#   t.render({"name": "Ann", "code": 42, "pause": "300ms"})       -> SSML text
+#   t.analyze({...})       -> ssml, flattened text, duration, validate_tree issues
+#
+# Slots are {name} or {name:type} in text and attribute values ({{ and }} are
+# literal braces); a slot in a tag or attribute name is not a legal XML name
+# character, so such a template fails to parse (ET.ParseError). The template is parsed once with every slot occurrence
+# replaced by a private-use sentinel; flatten_text, the <break time> total and
+# validate_tree then run once on that tree. Each result is kept as static pieces
+# around the sentinels, so an instance only fills slots:
+#
+#   ssml      static source pieces + html-escaped values
+#   text      static flattened pieces + whitespace-collapsed values
+#   duration  words of the text + static breaks + breaks whose time is a slot
+#   issues    static issues + element_issues() of elements with slot attributes
+#
+# No instance is parsed or walked; results equal parse_ssml(render(values))
+# followed by the tree functions. Values with characters XML does not allow
+# (control characters other than tab/newline/CR, U+FFFE, ...) are rejected.
+
+_SLOT = re.compile(r"\{\{|\}\}|\{([A-Za-z_]\w*)(?::(\w+))?\}")
+_SENTINEL = re.compile("\\ue000(\\d+)\\ue001")
+_TIME = re.compile(r"\d+(?:\.\d+)?(?:ms|s)")
+_PLAIN = re.compile(r"[^\s&<>\"']+(?: [^\s&<>\"']+)*")   # no escaping, already collapsed
+_NOT_XML_CHAR = re.compile("[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]")
+
+def _as_int(v: Any) -> str:
+    if isinstance(v, bool) or not isinstance(v, (int, str)):
+        raise ValueError
+    return str(int(v))
+
+def _as_float(v: Any) -> str:
+    if isinstance(v, bool):
+        raise ValueError
+    return f"{float(v):g}"
+
+def _as_time(v: Any) -> str:
+    v = str(v)
+    if not _TIME.fullmatch(v):
+        raise ValueError
+    return v
+
+SLOT_TYPES: Dict[str, Callable[[Any], str]] = {"str": str, "int": _as_int, "float": _as_float,
+                                               "time": _as_time}
+
+class _Pieces:
+    # a string with sentinels, as a buffer whose slot positions are filled per instance
+    __slots__ = ("buf", "pos")
+
+    def __init__(self, s: str, names: List[str]):
+        parts = _SENTINEL.split(s)
+        self.pos = [(i, names[int(parts[i])]) for i in range(1, len(parts), 2)]
+        for i, _ in self.pos:
+            parts[i] = ""
+        self.buf = parts
+
+    def fill(self, values: Mapping[str, str]) -> str:
+        buf = self.buf.copy()
+        for i, name in self.pos:
+            buf[i] = values[name]
+        return "".join(buf)
+
+class RenderedPrompt(NamedTuple):
+    ssml: str
+    text: str
+    duration_seconds: float
+    issues: List[str]
+
+class Template:
+    """SSML template compiled once; instances are rendered and analysed without parsing."""
+    __slots__ = ("source", "slots", "_ssml", "_text", "_static_breaks", "_breaks", "_issues",
+                 "_dynamic")
+
+    def __init__(self, source: str):
+        if "\ue000" in source or "\ue001" in source:
+            raise ValueError("Template contains reserved characters U+E000/U+E001")
+        self.source = source
+        self.slots: Dict[str, str] = {}   # name -> type
+        names: List[str] = []             # occurrence -> name
+        out: List[str] = []
+        last = 0
+        for m in _SLOT.finditer(source):
+            out.append(source[last:m.start()])
+            last = m.end()
+            tok = m.group(0)
+            if tok == "{{" or tok == "}}":
+                out.append(tok[0])
+                continue
+            name, typ = m.group(1), m.group(2) or "str"
+            if typ not in SLOT_TYPES:
+                raise ValueError(f"Unknown slot type: {typ}")
+            if self.slots.setdefault(name, typ) != typ:
+                raise ValueError(f"Slot {name!r} declared with two types")
+            out.append(f"\ue000{len(names)}\ue001")
+            names.append(name)
+        out.append(source[last:])
+        marked = "".join(out)
+        root = parse_ssml(marked)
+
+        self._ssml = _Pieces(marked, names)
+        self._text = _Pieces(flatten_text(root), names)
+        self._static_breaks = 0.0
+        self._breaks: List[_Pieces] = []
+        self._issues: List[Union[str, Tuple[str, Dict[str, _Pieces]]]] = []
+        if root.tag != "speak":
+            self._issues.append("Root must be <speak>.")
+        self._walk(root, 0, names)
+        self._dynamic = any(not isinstance(x, str) for x in self._issues)
+
+    def _walk(self, el: ET.Element, depth: int, names: List[str]) -> None:
+        if depth > MAX_DEPTH:
+            self._issues.append(f"Exceeded max depth {MAX_DEPTH} at <{el.tag}>.")
+        dynamic = {k: _Pieces(v, names) for k, v in el.attrib.items() if _SENTINEL.search(v)}
+        if dynamic:
+            self._issues.append((el.tag, {k: dynamic.get(k) or v for k, v in el.attrib.items()}))
+        else:
+            self._issues.extend(element_issues(el.tag, el.attrib))
+        if el.tag == "break":
+            t = el.attrib.get("time")
+            if t:
+                if "time" in dynamic:
+                    self._breaks.append(dynamic["time"])
+                else:
+                    self._static_breaks += parse_time_seconds(t)
+        for c in el:
+            self._walk(c, depth + 1, names)
+
+    def _values(self, values: Mapping[str, Any]) -> Tuple[Dict[str, str], Dict[str, str],
+                                                          Optional[Dict[str, str]]]:
+        # (raw, XML-escaped, whitespace-collapsed) slot strings; the last is None
+        # when a value has edge whitespace or is empty (see analyze)
+        raw: Dict[str, str] = {}
+        esc: Dict[str, str] = {}
+        words: Optional[Dict[str, str]] = {}
+        for name, typ in self.slots.items():
+            try:
+                v = values[name]
+            except KeyError:
+                raise ValueError(f"Missing slot: {name}") from None
+            if typ != "str":
+                try:
+                    v = SLOT_TYPES[typ](v)    # digits and units only
+                except (TypeError, ValueError):
+                    raise ValueError(f"Slot {name!r} expects {typ}, got {v!r}") from None
+                raw[name] = esc[name] = v
+                if words is not None:
+                    words[name] = v
+                continue
+            if v.__class__ is not str:
+                v = str(v)
+            bad = _NOT_XML_CHAR.search(v)
+            if bad:
+                raise ValueError(f"Slot {name!r} contains a character not allowed in XML: "
+                                 f"{bad.group()!r}")
+            raw[name] = v
+            if _PLAIN.fullmatch(v):
+                esc[name] = v
+                if words is not None:
+                    words[name] = v
+                continue
+            esc[name] = html.escape(v)
+            if not v or v[0].isspace() or v[-1].isspace():
+                words = None
+            elif words is not None:
+                words[name] = " ".join(v.split())
+        return raw, esc, words
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """SSML text of one instance (values are XML-escaped)."""
+        return self._ssml.fill(self._values(values)[1])
+
+    def analyze(self, values: Mapping[str, Any], wpm: int = 180) -> RenderedPrompt:
+        """SSML plus flatten_text, total_duration_seconds and validate_tree results."""
+        vals, esc, words = self._values(values)
+        ssml = self._ssml.fill(esc)
+        if words is None:
+            # edge whitespace or an empty value changes how the words around it
+            # join; only such instances re-collapse the whole text
+            text = " ".join(self._text.fill(vals).split())
+        else:
+            text = self._text.fill(words)
+        br = self._static_breaks
+        for p in self._breaks:
+            br += parse_time_seconds(p.fill(vals))
+        if self._dynamic:
+            issues: List[str] = []
+            for x in self._issues:
+                if x.__class__ is str:
+                    issues.append(x)
+                else:
+                    tag, attrs = x
+                    issues.extend(element_issues(tag, {k: v if v.__class__ is str else v.fill(vals)
+                                                       for k, v in attrs.items()}))
+        else:
+            issues = list(self._issues)
+        n_words = text.count(" ") + 1 if text else 0   # text is whitespace-collapsed
+        return RenderedPrompt(ssml, text, round(n_words / (wpm / 60.0) + br, 3), issues)
@@ -1,6 +1,7 @@
 from __future__ import annotations
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 from .node import Node
+from ..strings.markup_tokens import Tokens, as_tokens, TEXT, START, END, SELF, EMPTY, UNCLOSED
 
 # NOTE: This is an intentionally minimal, learning-oriented parser.
 # It supports: <tag key="val"> ... </tag> and <selfclosing .../> with double-quoted attrs.
@@ -41,9 +42,13 @@ def _parse_attrs(s: str) -> Dict[str, str]:
             break
     return attrs
 
-def parse_tiny(xml: str) -> Node:
-    i = 0
-    n = len(xml)
+def parse_tiny(xml: Union[str, Tokens]) -> Node:
+    """Parse into a Node tree on top of the shared markup token stream.
+
+    `xml` may be a str or a Tokens array already built by another pass.
+    """
+    toks = as_tokens(xml)
+    s = toks.text
     stack: List[Node] = [Node("ROOT")]
     text_buf: List[str] = []
 
@@ -54,46 +59,28 @@ def parse_tiny(xml: str) -> Node:
                 stack[-1].add(Node("#text", text=txt))
             text_buf.clear()
 
-    while i < n:
-        if xml[i] == "<":
-            # tag start
-            j = xml.find(">", i + 1)
-            if j == -1:
-                raise ValueError("Unclosed tag bracket")
-            inside = xml[i+1:j].strip()
-            if not inside:
-                raise ValueError("Empty tag")
-            if inside.startswith("?") or inside.startswith("!--"):
-                # skip processing instructions/comments (very naive)
-                i = j + 1
-                continue
-            is_end = inside.startswith("/")
-            is_self = inside.endswith("/")
-
-            if is_end:
-                flush_text()
-                tag = inside[1:].strip()
-                if not stack or stack[-1].tag != tag:
-                    raise ValueError(f"Mismatched closing tag: {tag}")
-                stack.pop()
-            else:
-                # start or self-close
-                # split tag name and attrs
-                parts = inside[:-1].strip() if is_self else inside
-                if " " in parts:
-                    tag, rest = parts.split(" ", 1)
-                    attrs = _parse_attrs(rest)
-                else:
-                    tag, attrs = parts, {}
-                flush_text()
-                node = Node(tag, attrs=attrs)
-                stack[-1].add(node)
-                if not is_self:
-                    stack.append(node)
-            i = j + 1
-        else:
-            text_buf.append(xml[i])
-            i += 1
+    for kind, a, b in toks:
+        if kind == TEXT:
+            text_buf.append(s[a:b])
+        elif kind == START or kind == SELF:
+            flush_text()
+            j = s.find(">", b)
+            attrs = _parse_attrs(s[b:j]) if j > b else {}
+            node = Node(s[a:b], attrs=attrs)
+            stack[-1].add(node)
+            if kind == START:
+                stack.append(node)
+        elif kind == END:
+            flush_text()
+            tag = s[a:b]
+            if not stack or stack[-1].tag != tag:
+                raise ValueError(f"Mismatched closing tag: {tag}")
+            stack.pop()
+        elif kind == UNCLOSED:
+            raise ValueError("Unclosed tag bracket")
+        elif kind == EMPTY:
+            raise ValueError("Empty tag")
+        # SKIP: processing instructions/comments (very naive)
     flush_text()
     if len(stack) != 1:
         raise ValueError("Unclosed tags at end")
@@ -1,27 +1,41 @@
 from __future__ import annotations
-from typing import List
 import xml.etree.ElementTree as ET
+from .normalize import Normalizer
+
+_FLATTEN = Normalizer(("sub", "whitespace"))
 
 def flatten_text(root: ET.Element) -> str:
-    """Flatten SSML to visible text. Applies <sub alias="..."> if present."""
-    out: List[str] = []
+    """Flatten SSML to visible text. Applies <sub alias="..."> if present.
 
-    def walk(el: ET.Element):
-        # apply <sub alias="..."> replacement
-        if el.tag == "sub" and "alias" in el.attrib:
-            out.append(el.attrib["alias"])
-        else:
-            # text at this node
-            if el.text and el.text.strip():
-                out.append(el.text.strip())
-            # children
-            for c in list(el):
-                walk(c)
-                if c.tail and c.tail.strip():
-                    out.append(c.tail.strip())
+    offsets.flatten_with_offsets returns the same text with its OffsetMap.
+    """
+    return _FLATTEN.normalize_tree(root)
 
-    walk(root)
-    return " ".join(" ".join(out).split())
+# rough pause lengths for <break strength="...">
+STRENGTH_MAP = {
+    "none": 0.0,
+    "x-weak": 0.1,
+    "weak": 0.25,
+    "medium": 0.5,
+    "strong": 0.75,
+    "x-strong": 1.0,
+}
+
+def parse_time_seconds(t: str) -> float:
+    """'500ms' -> 0.5, '2s' -> 2.0; anything else -> 0.0."""
+    if t.endswith("ms"):
+        return float(t[:-2]) / 1000.0
+    if t.endswith("s"):
+        return float(t[:-1])
+    return 0.0
+
+def break_seconds(el: ET.Element) -> float:
+    """Pause for a <break>: 'time' wins, else 'strength'; a bare or unknown
+    strength is medium, as in SSML."""
+    t = el.attrib.get("time")
+    if t:
+        return parse_time_seconds(t)
+    return STRENGTH_MAP.get(el.attrib.get("strength", "medium"), STRENGTH_MAP["medium"])
 
 def total_duration_seconds(root: ET.Element, wpm: int = 180) -> float:
     """Estimate speech duration + breaks. 180 wpm default; <break time="..."> adds pauses."""
@@ -34,10 +48,7 @@ def total_duration_seconds(root: ET.Element, wpm: int = 180) -> float:
         if el.tag == "break":
             t = el.attrib.get("time")
             if t:
-                if t.endswith("ms"):
-                    br += float(t[:-2]) / 1000.0
-                elif t.endswith("s"):
-                    br += float(t[:-1])
+                br += parse_time_seconds(t)
         for c in list(el):
             walk(c)
 
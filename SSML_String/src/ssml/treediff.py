@@ -0,0 +1,266 @@
+from __future__ import annotations
+import copy
+import xml.etree.ElementTree as ET
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Structural diff of two SSML trees.
+#
+# 1. Every subtree of both trees gets a canonical id by hash-consing its content
+#    (tag, sorted attributes, whitespace-collapsed text, child ids and tails -
+#    the canonical form of merkle.subtree_hash), so "these subtrees are equal" is
+#    an integer compare.
+# 2. Top-down from the roots: equal ids end the walk. Otherwise the children of
+#    a pair are aligned by id - common prefix/suffix trimmed, then the remaining
+#    exact matches kept in order (longest increasing subsequence). Unchanged
+#    regions cost O(1) per child, whatever their size.
+# 3. Only the gaps between exact matches get the finer diff: same-tag children
+#    are paired by similarity (shared child ids, equal text/attributes) with a
+#    small alignment DP, paired elements recurse, the rest become insert/delete.
+#
+# Edits are emitted in document order. Paths are child-index tuples from the
+# root: in the old tree for delete/update ops, in the new tree for inserts.
+# Inserted/deleted elements carry their whole subtree and their tail; text is
+# compared with whitespace collapsed.
+
+INSERT = "insert"
+DELETE = "delete"
+UPDATE_ATTR = "update-attr"
+UPDATE_TEXT = "update-text"
+
+GAP_DP_LIMIT = 4096   # gaps with more candidate pairs than this are paired greedily
+
+Path = Tuple[int, ...]
+
+class Edit(NamedTuple):
+    op: str
+    path: Path
+    tag: str
+    key: Optional[str]      # attribute name, or "text"/"tail" for UPDATE_TEXT
+    old: object             # previous value / deleted element
+    new: object             # new value / inserted element
+
+def _norm(s: Optional[str]) -> str:
+    return " ".join(s.split()) if s else ""
+
+class _Ids:
+    # canonical subtree ids shared by both trees
+    __slots__ = ("table", "of")
+
+    def __init__(self):
+        self.table: Dict[tuple, int] = {}
+        self.of: Dict[int, int] = {}    # id(element) -> canonical id
+
+    def visit(self, el: ET.Element) -> int:
+        key = [el.tag, tuple(sorted(el.attrib.items())) if el.attrib else (), _norm(el.text)]
+        for c in el:
+            key.append(self.visit(c))
+            key.append(_norm(c.tail))
+        k = tuple(key)
+        i = self.table.get(k)
+        if i is None:
+            i = self.table[k] = len(self.table)
+        self.of[id(el)] = i
+        return i
+
+def _lis(pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    # longest subsequence of (i, j) pairs (increasing i) with increasing j
+    tails: List[int] = []     # smallest j ending an increasing run of each length
+    at: List[int] = []        # index into pairs for tails
+    back: List[int] = []
+    for k, (_, j) in enumerate(pairs):
+        p = bisect_left(tails, j)
+        if p == len(tails):
+            tails.append(j)
+            at.append(k)
+        else:
+            tails[p] = j
+            at[p] = k
+        back.append(at[p - 1] if p else -1)
+    out = []
+    k = at[-1] if at else -1
+    while k >= 0:
+        out.append(pairs[k])
+        k = back[k]
+    out.reverse()
+    return out
+
+class _Differ:
+    __slots__ = ("ids", "edits")
+
+    def __init__(self, ids: _Ids):
+        self.ids = ids
+        self.edits: List[Edit] = []
+
+    def _sim(self, x: ET.Element, y: ET.Element) -> float:
+        of = self.ids.of
+        shared = len({of[id(c)] for c in x} & {of[id(c)] for c in y})
+        return (shared + (_norm(x.text) == _norm(y.text)) + (x.attrib == y.attrib)
+                + 0.5)  # same tag: worth pairing even when nothing else matches
+
+    def _pair_gap(self, ga: List[int], gb: List[int], A: List[ET.Element],
+                  B: List[ET.Element]) -> List[Tuple[int, int]]:
+        if not ga or not gb:
+            return []
+        if len(ga) * len(gb) > GAP_DP_LIMIT:
+            # greedy, in order: each old child takes the next new child with its tag
+            by_tag: Dict[str, List[int]] = {}
+            for j in gb:
+                by_tag.setdefault(B[j].tag, []).append(j)
+            out = []
+            last = -1
+            for i in ga:
+                lst = by_tag.get(A[i].tag)
+                if lst:
+                    p = bisect_right(lst, last)
+                    if p < len(lst):
+                        last = lst[p]
+                        out.append((i, last))
+            return out
+        # alignment DP maximizing total similarity over same-tag pairs
+        n, m = len(ga), len(gb)
+        score = [[0.0] * (m + 1) for _ in range(n + 1)]
+        for r in range(n - 1, -1, -1):
+            x = A[ga[r]]
+            row, nxt = score[r], score[r + 1]
+            for c in range(m - 1, -1, -1):
+                best = nxt[c] if nxt[c] > row[c + 1] else row[c + 1]
+                y = B[gb[c]]
+                if x.tag == y.tag:
+                    s = nxt[c + 1] + self._sim(x, y)
+                    if s > best:
+                        best = s
+                row[c] = best
+        out = []
+        r = c = 0
+        while r < n and c < m:
+            x, y = A[ga[r]], B[gb[c]]
+            if x.tag == y.tag and score[r][c] == score[r + 1][c + 1] + self._sim(x, y):
+                out.append((ga[r], gb[c]))
+                r += 1
+                c += 1
+            elif score[r][c] == score[r + 1][c]:
+                r += 1
+            else:
+                c += 1
+        return out
+
+    def diff(self, a: ET.Element, b: ET.Element, pa: Path, pb: Path) -> None:
+        # a and b have the same tag
+        of, out = self.ids.of, self.edits
+        if of[id(a)] == of[id(b)]:
+            return
+        if a.attrib != b.attrib:
+            for k in sorted(a.attrib.keys() | b.attrib.keys()):
+                va, vb = a.attrib.get(k), b.attrib.get(k)
+                if va != vb:
+                    out.append(Edit(UPDATE_ATTR, pa, a.tag, k, va, vb))
+        if _norm(a.text) != _norm(b.text):
+            out.append(Edit(UPDATE_TEXT, pa, a.tag, "text", a.text, b.text))
+        self._children(a, b, pa, pb)
+
+    def _children(self, a: ET.Element, b: ET.Element, pa: Path, pb: Path) -> None:
+        of = self.ids.of
+        A, B = list(a), list(b)
+        ca = [of[id(x)] for x in A]
+        cb = [of[id(y)] for y in B]
+        na, nb = len(A), len(B)
+        lo = 0
+        while lo < na and lo < nb and ca[lo] == cb[lo]:
+            lo += 1
+        hi = 0
+        while hi < na - lo and hi < nb - lo and ca[na - 1 - hi] == cb[nb - 1 - hi]:
+            hi += 1
+        where: Dict[int, List[int]] = {}
+        for j in range(nb - hi - 1, lo - 1, -1):
+            where.setdefault(cb[j], []).append(j)   # reversed: pop() yields the first
+        cand = []
+        for i in range(lo, na - hi):
+            lst = where.get(ca[i])
+            if lst:
+                cand.append((i, lst.pop()))
+        anchors = ([(i, i) for i in range(lo)] + _lis(cand)
+                   + [(na - hi + k, nb - hi + k) for k in range(hi)])
+
+        # walk the anchors; gaps between them get the fine diff
+        pi = pj = 0
+        for ai, bj in anchors + [(na, nb)]:
+            ga, gb = list(range(pi, ai)), list(range(pj, bj))
+            pairs = self._pair_gap(ga, gb, A, B)
+            qi = qj = 0
+            for i, j in pairs + [(ai, bj)]:
+                while pi + qi < i:
+                    x = A[pi + qi]
+                    self.edits.append(Edit(DELETE, pa + (pi + qi,), x.tag, None, x, None))
+                    qi += 1
+                while pj + qj < j:
+                    y = B[pj + qj]
+                    self.edits.append(Edit(INSERT, pb + (pj + qj,), y.tag, None, None, y))
+                    qj += 1
+                if i == ai:
+                    break
+                self.diff(A[i], B[j], pa + (i,), pb + (j,))
+                self._tail(A[i], B[j], pa + (i,))
+                qi += 1
+                qj += 1
+            if ai < na:
+                self._tail(A[ai], B[bj], pa + (ai,))
+            pi, pj = ai + 1, bj + 1
+
+    def _tail(self, x: ET.Element, y: ET.Element, path: Path) -> None:
+        if _norm(x.tail) != _norm(y.tail):
+            self.edits.append(Edit(UPDATE_TEXT, path, x.tag, "tail", x.tail, y.tail))
+
+def diff_trees(old: ET.Element, new: ET.Element) -> List[Edit]:
+    """Edit list turning `old` into `new` (equal up to whitespace and attribute order)."""
+    ids = _Ids()
+    ids.visit(old)
+    ids.visit(new)
+    d = _Differ(ids)
+    if old.tag != new.tag:
+        return [Edit(DELETE, (), old.tag, None, old, None), Edit(INSERT, (), new.tag, None, None, new)]
+    d.diff(old, new, (), ())
+    return d.edits
+
+def _at(root: ET.Element, path: Path) -> ET.Element:
+    el = root
+    for i in path:
+        el = el[i]
+    return el
+
+def apply_edits(root: ET.Element, edits: List[Edit]) -> ET.Element:
+    """Apply a diff_trees edit list to a copy of `root`."""
+    root = copy.deepcopy(root)
+    removals = []
+    for e in edits:
+        if e.op == DELETE:
+            if not e.path:
+                root = None
+            else:
+                removals.append((_at(root, e.path[:-1]), _at(root, e.path)))
+        elif e.op == UPDATE_ATTR:
+            el = _at(root, e.path)
+            if e.new is None:
+                el.attrib.pop(e.key, None)
+            else:
+                el.set(e.key, e.new)
+        elif e.op == UPDATE_TEXT:
+            setattr(_at(root, e.path), e.key, e.new)
+        elif e.op != INSERT:
+            raise ValueError(f"Unknown edit: {e.op}")
+    for parent, el in removals:
+        parent.remove(el)
+    for e in sorted((e for e in edits if e.op == INSERT), key=lambda e: e.path):
+        el = copy.deepcopy(e.new)
+        if not e.path:
+            root = el
+        else:
+            _at(root, e.path[:-1]).insert(e.path[-1], el)
+    return root
+
+def format_edit(e: Edit) -> str:
+    """One line for a report, e.g. "update-attr <break> 0/3/1 time: '1s' -> '2s'"."""
+    where = "/".join(map(str, e.path)) or "/"
+    if e.op == UPDATE_ATTR or e.op == UPDATE_TEXT:
+        return f"{e.op} <{e.tag}> {where} {e.key}: {e.old!r} -> {e.new!r}"
+    return f"{e.op} <{e.tag}> {where}"
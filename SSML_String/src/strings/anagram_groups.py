@@ -0,0 +1,170 @@
+from __future__ import annotations
+import heapq
+import marshal
+import math
+import os
+import shutil
+import tempfile
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+# Corpus-scale anagram grouping.
+#
+# Signature: for ASCII words, the product of one prime per byte value (unique
+# factorisation makes it an exact count-vector key, computed by math.prod over a
+# table lookup, all in C; frequent letters get the small primes so typical words
+# stay machine-sized). Non-ASCII words fall back to the sorted string. The two
+# key types cannot collide.
+#
+# Pipeline for inputs that do not fit in memory (group_anagrams_external):
+#   1. partition: stream words, route each to one of `shards` files by a
+#      permutation-invariant hash (length + byte sum), buffering in memory and
+#      spilling marshal chunks when `memory_words` is reached
+#   2. group: each shard is grouped independently (optionally in a process
+#      pool) and written back as a sorted run
+#   3. merge: heapq.merge over the runs streams groups in group_anagrams_sort order
+# Output matches group_anagrams_sort: words sorted within a group, groups sorted
+# by (first word, size, words).
+
+_FREQ_ORDER = "etaoinshrdlcumwfgypbvkjxqz"
+
+def _primes(n: int) -> List[int]:
+    ps: List[int] = []
+    k = 2
+    while len(ps) < n:
+        if all(k % p for p in ps if p * p <= k):
+            ps.append(k)
+        k += 1
+    return ps
+
+def _prime_table() -> List[int]:
+    order = _FREQ_ORDER + _FREQ_ORDER.upper()
+    order += "".join(chr(c) for c in range(128) if chr(c) not in order)
+    table = [0] * 128
+    for ch, p in zip(order, _primes(129)[1:]):  # odd primes: even keys crowd a dict's low hash bits
+        table[ord(ch)] = p
+    return table
+
+_PRIME_OF = _prime_table().__getitem__
+
+def anagram_signature(word: str) -> Union[int, str]:
+    """Key shared by exactly the anagrams of `word` (case-sensitive)."""
+    if word.isascii():
+        return math.prod(map(_PRIME_OF, word.encode()))
+    return "".join(sorted(word))
+
+def _signature_fn(case_sensitive: bool) -> Callable[[str], Union[int, str]]:
+    if case_sensitive:
+        return anagram_signature
+    return lambda w: anagram_signature(w.lower())
+
+def _sort_groups(groups: Iterable[List[str]]) -> List[List[str]]:
+    result = [sorted(g) for g in groups]
+    result.sort(key=_group_order)
+    return result
+
+# group_anagrams_sort orders groups by (first word, size, words); a word belongs
+# to exactly one group, so first words are unique and decide the order alone
+_group_order = itemgetter(0)
+
+def group_anagrams(words: Iterable[str], case_sensitive: bool = True) -> List[List[str]]:
+    """In-memory grouping; same result as group_anagrams_sort, cheaper keys."""
+    sig = _signature_fn(case_sensitive)
+    groups: Dict[Union[int, str], List[str]] = {}
+    get = groups.get
+    for w in words:
+        k = sig(w)
+        g = get(k)
+        if g is None:
+            groups[k] = [w]
+        else:
+            g.append(w)
+    return _sort_groups(groups.values())
+
+def iter_words(paths: Union[str, Sequence[str]], encoding: str = "utf-8") -> Iterator[str]:
+    """Whitespace-separated tokens from one or more text files, read line by line."""
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    for path in paths:
+        with open(path, encoding=encoding) as f:
+            for line in f:
+                yield from line.split()
+
+def shard_of(word: str, shards: int) -> int:
+    """Stable shard for `word`; all anagrams of a word land in the same shard."""
+    return (len(word) * 7919 + sum(word.encode())) % shards
+
+# ---- external / parallel pipeline ----
+
+def _load_chunks(path: str) -> Iterator[list]:
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield marshal.load(f)
+            except EOFError:
+                return
+
+def _group_shard(path: str, case_sensitive: bool) -> str:
+    # worker: group one shard file, replace it with a sorted run (one marshal chunk per group)
+    words: List[str] = []
+    for chunk in _load_chunks(path):
+        words.extend(chunk)
+    groups = group_anagrams(words, case_sensitive)
+    run = path + ".run"
+    with open(run, "wb") as f:
+        for g in groups:
+            marshal.dump(g, f)
+    os.remove(path)
+    return run
+
+def group_anagrams_external(words: Iterable[str], case_sensitive: bool = True, shards: int = 64,
+                            memory_words: int = 1_000_000, workers: Optional[int] = 1,
+                            tmp_dir: Optional[str] = None) -> Iterator[List[str]]:
+    """Stream groups (in group_anagrams_sort order) for inputs of any size.
+
+    At most ~`memory_words` input words are buffered before spilling to shard
+    files under `tmp_dir`; grouping then holds one shard at a time per worker,
+    so pick `shards` so that corpus_size / shards fits comfortably. workers > 1
+    (or None = cpu count) groups shards in a process pool. When the input fits
+    in the buffer nothing touches the disk.
+    """
+    buffers: List[List[str]] = [[] for _ in range(shards)]
+    buffered = 0
+    workdir: Optional[str] = None
+    paths: List[str] = []
+    try:
+        for w in words:
+            # shard on the folded form so case variants meet in the same shard
+            buffers[shard_of(w if case_sensitive else w.lower(), shards)].append(w)
+            buffered += 1
+            if buffered >= memory_words:
+                if workdir is None:
+                    workdir = tempfile.mkdtemp(prefix="anagrams-", dir=tmp_dir)
+                    paths = [os.path.join(workdir, f"shard-{i:05d}") for i in range(shards)]
+                _spill(buffers, paths)
+                buffered = 0
+
+        if workdir is None:  # everything fit in memory
+            yield from group_anagrams((w for b in buffers for w in b), case_sensitive)
+            return
+
+        _spill(buffers, paths)
+        buffers = []
+        live = [p for p in paths if os.path.exists(p)]
+        if workers == 1:
+            runs = [_group_shard(p, case_sensitive) for p in live]
+        else:
+            with ProcessPoolExecutor(workers) as ex:
+                runs = list(ex.map(_group_shard, live, [case_sensitive] * len(live)))
+        yield from heapq.merge(*(_load_chunks(r) for r in runs), key=_group_order)
+    finally:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+def _spill(buffers: List[List[str]], paths: List[str]) -> None:
+    for i, b in enumerate(buffers):
+        if b:
+            with open(paths[i], "ab") as f:
+                marshal.dump(b, f)
+            b.clear()
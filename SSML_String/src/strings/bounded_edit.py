@@ -0,0 +1,56 @@
+from __future__ import annotations
+from typing import Optional, Sequence
+
+# Levenshtein distance with an upper bound, over any sequences (characters,
+# words of flattened SSML, ...). Diagonal transition (Ukkonen / Landau-Vishkin):
+# for e = 0, 1, ... keep, per diagonal j - i, the furthest row reachable with e
+# edits, sliding along runs of equal items for free. Work is O((n + m) * d) in
+# the worst case and close to O(n + d^2) for near-identical inputs, where d is
+# the distance found; it stops as soon as d would exceed the bound, so
+# "are these within k edits?" costs nothing like the full n * m table.
+
+def bounded_edit_distance(a: Sequence, b: Sequence, k: int) -> Optional[int]:
+    """Edit distance of `a` and `b` if it is at most `k`, else None."""
+    n, m = len(a), len(b)
+    if k < 0 or abs(n - m) > k:
+        return None
+    # trim the common prefix and suffix (the e = 0 slide, done with slices)
+    lo = 0
+    while lo < n and lo < m and a[lo] == b[lo]:
+        lo += 1
+    while n > lo and m > lo and a[n - 1] == b[m - 1]:
+        n -= 1
+        m -= 1
+    a, b = a[lo:n], b[lo:m]
+    n, m = n - lo, m - lo
+    if n == 0 or m == 0:
+        return n + m
+    target = m - n
+    off = k + 1
+    unreached = -1 - n - m
+    prev = [unreached] * (2 * k + 3)     # furthest row per diagonal d, at index d + off
+    prev[off] = 0
+    for e in range(1, k + 1):
+        cur = [unreached] * (2 * k + 3)
+        for d in range(max(-e, -n), min(e, m) + 1):
+            x = off + d
+            i = prev[x] + 1                  # substitution
+            t = prev[x - 1]                  # insertion (diagonal d - 1)
+            if t > i:
+                i = t
+            t = prev[x + 1] + 1              # deletion (diagonal d + 1)
+            if t > i:
+                i = t
+            if i > n:
+                i = n
+            if i + d > m:
+                i = m - d
+            j = i + d
+            while i < n and j < m and a[i] == b[j]:
+                i += 1
+                j += 1
+            cur[x] = i
+        if cur[off + target] >= n:
+            return e
+        prev = cur
+    return None
@@ -1,31 +1,55 @@
-def is_well_formed_markup(s: str) -> bool:
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Sequence, Union
+from .markup_tokens import Tokens, as_tokens, START, END, EMPTY, UNCLOSED
+
+OK = -1  # check_markup result for well-formed input
+
+def check_markup(src: Union[str, Tokens]) -> int:
+    """Stack check for angle-bracket tags like <a> ... </a> and <br/>.
+
+    Returns OK (-1) when well formed, else the offset of the first problem:
+    the '<' of a bad/mismatched tag, or of the innermost start tag left open.
+    Runs on the shared token array (see markup_tokens): a str is scanned only
+    as far as the first error, and a document that was already tokenized is
+    not scanned again. <?...?> and <!--...> are skipped.
+    """
+    toks = as_tokens(src)
+    s = toks.text
+    stack: List[str] = []
+    starts: List[int] = []
+    for kind, a, b in toks:
+        if kind == START:
+            stack.append(s[a:b])
+            starts.append(a)
+        elif kind == END:
+            if not stack:
+                return toks.tag_start(a)
+            top = stack[-1]
+            if b - a != len(top) or not s.startswith(top, a):
+                return toks.tag_start(a)
+            stack.pop()
+            starts.pop()
+        elif kind == EMPTY or kind == UNCLOSED:
+            return a
+    return toks.tag_start(starts[-1]) if starts else OK
+
+def is_well_formed_markup(s: Union[str, Tokens]) -> bool:
     """Very small checker for angle-bracket tags like <a> ... </a> and <br/>.
     Not a full XML validator—meant for practicing stacks.
     """
-    stack = []
-    i = 0
-    n = len(s)
-    while i < n:
-        if s[i] == "<":
-            j = s.find(">", i+1)
-            if j == -1:
-                return False
-            inside = s[i+1:j].strip()
-            if not inside:
-                return False
-            if inside.startswith("/"):
-                tag = inside[1:].strip()
-                if not stack or stack[-1] != tag:
-                    return False
-                stack.pop()
-            elif inside.endswith("/"):
-                # self-closing; ok
-                pass
-            else:
-                # start tag name up to first space
-                name = inside.split()[0]
-                stack.append(name)
-            i = j + 1
-        else:
-            i += 1
-    return len(stack) == 0
+    return check_markup(s) == OK
+
+def check_markup_many(docs: Sequence[str], workers: Optional[int] = None,
+                      processes: bool = True, chunksize: int = 64) -> List[int]:
+    """check_markup over many documents with a process (default) or thread pool.
+
+    The checker is pure Python, so threads only help when docs arrive from I/O;
+    processes give real parallelism. Small batches run inline.
+    """
+    if workers == 1 or len(docs) <= chunksize:
+        return [check_markup(d) for d in docs]
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool(max_workers=workers) as ex:
+        if processes:
+            return list(ex.map(check_markup, docs, chunksize=chunksize))
+        return list(ex.map(check_markup, docs))
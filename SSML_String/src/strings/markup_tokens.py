@@ -0,0 +1,150 @@
+from __future__ import annotations
+import re
+from array import array
+from typing import Iterator, List, Tuple, Union
+
+# One scanner for angle-bracket markup (and, optionally, ()[]{} brackets).
+# Output is a flat array('q') of (kind, start, end) triples over the source:
+#   TEXT      text run between tags                   [start, end)
+#   START     <name ...>        -> span of the tag *name*
+#   END       </name>           -> span of the name (trimmed)
+#   SELF      <name .../>       -> span of the name
+#   SKIP      <?...> / <!--...> -> whole tag
+#   EMPTY     <> or <   >       -> whole tag (error)
+#   UNCLOSED  '<' with no '>'   -> '<' .. end of text (error)
+#   OPEN / CLOSE  a bracket character (only with brackets=True); brackets of a
+#                 text run or tag follow that run's/tag's own token
+# is_well_formed_markup, parse_tiny and is_valid_brackets all consume this, so a
+# document tokenized once (tokenize(text, brackets=True)) can be fed to each.
+#
+# Scanning is lazy and block-wise: consumers that stop early (a checker hitting
+# an error) only pay for the prefix they read, and the next consumer continues
+# from the cached array instead of re-scanning.
+
+TEXT, START, END, SELF, SKIP, EMPTY, UNCLOSED, OPEN, CLOSE = range(9)
+KIND_NAMES = ("TEXT", "START", "END", "SELF", "SKIP", "EMPTY", "UNCLOSED", "OPEN", "CLOSE")
+
+_NAME = re.compile(r"[^\s]*")
+_BRACKETS = re.compile(r"[()\[\]{}]")
+_OPENERS = "([{"
+_FIRST_BLOCK = 4         # tags scanned before the first hand-off to a consumer
+_MAX_BLOCK = 8192
+
+class Tokens:
+    """Token array for one text; pass it instead of the str to skip re-scanning."""
+    __slots__ = ("text", "data", "brackets", "_pos", "_block")
+
+    def __init__(self, text: str, brackets: bool = False):
+        self.text = text
+        self.data = array("q")
+        self.brackets = brackets
+        self._pos = 0            # next unscanned offset; None once complete
+        self._block = _FIRST_BLOCK
+
+    @property
+    def complete(self) -> bool:
+        return self._pos is None
+
+    def finish(self) -> "Tokens":
+        """Scan the rest of the text now; returns self."""
+        while self._pos is not None:
+            self._scan_block(_MAX_BLOCK)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.finish().data) // 3
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int]]:
+        data = self.data
+        k = 0
+        while True:
+            end = len(data)
+            if k < end:
+                it = iter(data[k:end])
+                yield from zip(it, it, it)
+                k = end
+            elif self._pos is None:
+                return
+            else:
+                self._scan_block(self._block)
+                self._block = min(self._block * 2, _MAX_BLOCK)
+
+    def tag_start(self, name_start: int) -> int:
+        """Offset of the '<' that opens the tag whose name starts at name_start."""
+        return self.text.rfind("<", 0, name_start)
+
+    def _scan_block(self, budget: int) -> None:
+        s = self.text
+        pos = self._pos
+        n = len(s)
+        out: List[int] = []
+        app = out.append
+        find = s.find
+        brackets = self.brackets
+        i = find("<", pos)
+        while i != -1 and budget:
+            budget -= 1
+            if i > pos:
+                app(TEXT); app(pos); app(i)
+                if brackets:
+                    _emit_brackets(s, pos, i, app)
+            j = find(">", i + 1)
+            if j == -1:
+                app(UNCLOSED); app(i); app(n)
+                if brackets:
+                    _emit_brackets(s, i, n, app)
+                pos = n
+                break
+            a, b = i + 1, j
+            c = s[a] if a < b else ""
+            if c.isspace() or (a < b and s[b - 1].isspace()):
+                while a < b and s[a].isspace():
+                    a += 1
+                while b > a and s[b - 1].isspace():
+                    b -= 1
+                c = s[a] if a < b else ""
+            if not c:
+                app(EMPTY); app(i); app(j + 1)
+            elif c == "/":
+                a += 1
+                while a < b and s[a].isspace():
+                    a += 1
+                app(END); app(a); app(b)
+            elif c == "?" or (c == "!" and s.startswith("!--", a)):
+                app(SKIP); app(i); app(j + 1)
+            elif s[b - 1] == "/":
+                app(SELF); app(a); app(_NAME.match(s, a, b - 1).end())
+            else:
+                app(START); app(a); app(_NAME.match(s, a, b).end())
+            if brackets:
+                _emit_brackets(s, i, j + 1, app)
+            pos = j + 1
+            i = find("<", pos)
+        if i == -1 and pos < n:
+            app(TEXT); app(pos); app(n)
+            if brackets:
+                _emit_brackets(s, pos, n, app)
+            pos = n
+        self.data.extend(out)
+        self._pos = None if pos >= n else pos
+
+    def __repr__(self) -> str:
+        state = "complete" if self.complete else f"scanned to {self._pos}"
+        return f"Tokens({len(self.data) // 3} tokens, {state}, brackets={self.brackets})"
+
+def _emit_brackets(s: str, start: int, end: int, app) -> None:
+    for m in _BRACKETS.finditer(s, start, end):
+        p = m.start()
+        app(OPEN if s[p] in _OPENERS else CLOSE); app(p); app(p + 1)
+
+def tokenize(text: str, brackets: bool = False) -> Tokens:
+    """Token stream for `text` (scanned lazily as it is iterated)."""
+    return Tokens(text, brackets)
+
+def as_tokens(src: Union[str, Tokens], brackets: bool = False) -> Tokens:
+    """Reuse `src` if it is already a compatible token array, else tokenize it."""
+    if isinstance(src, Tokens):
+        if src.brackets or not brackets:
+            return src
+        src = src.text
+    return Tokens(src, brackets)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, List, NamedTuple, Optional, Pattern, Tuple, Union
+from .windows import compact_hits, drop_surplus
+
+# Incremental minimum-window search.
+# A compiled query precomputes the need-map for `t` once and can then be fed
+# text chunk by chunk. Only characters of `t` are ever looked at (a regex
+# character class skips everything else in C) and only those characters are
+# buffered, at most 2 * len(t) of them (windows.compact_hits), so memory does
+# not grow with the stream even when a needed character never arrives.
+#   - alphabet of t within Latin-1 -> list-indexed counts by ord(ch)
+#   - otherwise                    -> dict counts restricted to t's characters
+# The need-map is immutable and cached per distinct `t`; stream state lives in
+# each MinWindowQuery, so every query object is independent.
+
+Window = Tuple[int, int]  # absolute [start, end) offsets in the fed stream
+
+class _Need(NamedTuple):
+    small_alphabet: bool
+    need: Union[Tuple[int, ...], Dict[str, int]]   # read-only once built
+    required: int
+    rx: Optional[Pattern[str]]
+
+@lru_cache(maxsize=256)
+def _compile_need(t: str) -> _Need:
+    small = all(ord(c) < 256 for c in t)
+    if small:
+        counts = [0] * 256
+        for c in t:
+            counts[ord(c)] += 1
+        need: Union[Tuple[int, ...], Dict[str, int]] = tuple(counts)
+    else:
+        need = {}
+        for c in t:
+            need[c] = need.get(c, 0) + 1
+    chars = "".join(sorted(set(t)))
+    rx = re.compile("[" + "".join(re.escape(c) for c in chars) + "]") if t else None
+    return _Need(small, need, len(set(t)), rx)
+
+class MinWindowQuery:
+    """Compiled 'smallest window containing all of t' query.
+
+    At most 2 * len(t) hits are buffered between feeds, whatever the stream.
+    """
+    __slots__ = ("t", "small_alphabet", "_need", "_required", "_rx", "_cap",
+                 "_have", "_formed", "_win", "_pos", "best")
+
+    def __init__(self, t: str):
+        self.t = t
+        self.small_alphabet, self._need, self._required, self._rx = _compile_need(t)
+        self._cap = 2 * len(t)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all fed text (the compiled need-map is kept)."""
+        if self.small_alphabet:
+            self._have = [0] * 256
+        else:
+            self._have = {c: 0 for c in self._need}
+        self._formed = 0
+        self._win: Deque[Tuple[int, object]] = deque()  # (absolute pos, count key) of t-chars only
+        self._pos = 0
+        self.best: Optional[Window] = None
+
+    @property
+    def position(self) -> int:
+        """Number of characters fed so far."""
+        return self._pos
+
+    def feed(self, chunk: str) -> List[Window]:
+        """Consume the next chunk; return each minimal window completed inside it.
+
+        A window is reported once per right end, already shrunk from the left,
+        and `best` tracks the overall shortest (earliest on ties).
+        """
+        base = self._pos
+        self._pos += len(chunk)
+        if self._rx is None:
+            return []
+        need, have, win = self._need, self._have, self._win
+        required = self._required
+        cap = self._cap
+        formed = self._formed
+        small = self.small_alphabet
+        found: List[Window] = []
+        for m in self._rx.finditer(chunk):
+            i = m.start()
+            key = ord(chunk[i]) if small else chunk[i]
+            have[key] += 1
+            if have[key] == need[key]:
+                formed += 1
+            win.append((base + i, key))
+            drop_surplus(win, have, need)
+            if len(win) > cap:
+                compact_hits(win, have, need)
+            if formed == required:
+                start = win[0][0]
+                end = base + i + 1
+                found.append((start, end))
+                if self.best is None or end - start < self.best[1] - self.best[0]:
+                    self.best = (start, end)
+                # step past the left edge so the next window can form
+                k = win.popleft()[1]
+                have[k] -= 1
+                formed -= 1
+                drop_surplus(win, have, need)
+        self._formed = formed
+        return found
+
+    def search(self, s: str) -> str:
+        """One-shot equivalent of min_window(s, t); resets the stream state."""
+        self.reset()
+        if not s or not self.t or len(self.t) > len(s):
+            return ""
+        self.feed(s)
+        if self.best is None:
+            return ""
+        a, b = self.best
+        return s[a:b]
+
+def compile_min_window(t: str) -> MinWindowQuery:
+    """A fresh query for `t`; the need-map behind it is cached and shared."""
+    return MinWindowQuery(t)
+
+def min_window(s: str, t: str) -> str:
+    """Drop-in min_window; only the per-`t` need-map is cached, not stream state."""
+    return MinWindowQuery(t).search(s)
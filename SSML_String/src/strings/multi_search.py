@@ -0,0 +1,148 @@
+from __future__ import annotations
+import marshal
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+# Multi-pattern search with a precompiled Aho–Corasick automaton.
+# One linear pass over the text reports every (pattern_id, offset) match,
+# including overlapping ones. A single pattern skips the automaton and uses
+# str.find (C-level, linear) instead.
+
+_MAGIC = b"ACAU"
+_FORMAT_VERSION = 1
+
+def fold_case(s: str) -> str:
+    """Casefold without changing string length, so match offsets stay valid."""
+    f = s.casefold()
+    if len(f) == len(s):
+        return f
+    out = []
+    for ch in s:
+        c = ch.casefold()
+        out.append(c if len(c) == 1 else ch)
+    return "".join(out)
+
+class AhoCorasick:
+    """Compiled multi-pattern matcher. Pattern ids are indexes into `patterns`."""
+    __slots__ = ("patterns", "case_fold", "_goto", "_fail", "_out", "_lens")
+
+    def __init__(self, patterns: Iterable[str], case_fold: bool = False):
+        self.patterns: List[str] = list(patterns)
+        self.case_fold = case_fold
+        if any(p == "" for p in self.patterns):
+            raise ValueError("Empty pattern")
+        self._lens = [len(p) for p in self.patterns]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        if len(self.patterns) > 1:
+            self._build()
+
+    def _build(self) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        # 1) trie
+        for pid, p in enumerate(self.patterns):
+            if self.case_fold:
+                p = fold_case(p)
+            node = 0
+            for ch in p:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    out.append(())
+                node = nxt
+            out[node] = out[node] + (pid,)
+        # 2) failure links in BFS order; merge outputs along the suffix chain
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[child] = target if target != child else 0
+                if out[fail[child]]:
+                    out[child] = out[child] + out[fail[child]]
+
+    @property
+    def state_count(self) -> int:
+        return len(self._goto)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (pattern_id, offset) for every match, ordered by end position."""
+        if not self.patterns:
+            return
+        if self.case_fold:
+            text = fold_case(text)
+        if len(self.patterns) == 1:
+            p = fold_case(self.patterns[0]) if self.case_fold else self.patterns[0]
+            find = text.find
+            i = find(p)
+            while i != -1:
+                yield 0, i
+                i = find(p, i + 1)
+            return
+        goto, fail, out, lens = self._goto, self._fail, self._out, self._lens
+        root = goto[0]
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0) if node else root.get(ch, 0)
+            hits = out[node]
+            if hits:
+                for pid in hits:
+                    yield pid, i - lens[pid] + 1
+
+    def findall(self, text: str) -> List[Tuple[int, int]]:
+        return list(self.finditer(text))
+
+    def contains_any(self, text: str) -> bool:
+        for _ in self.finditer(text):
+            return True
+        return False
+
+    # ---------- serialization ----------
+
+    def dumps(self) -> bytes:
+        payload = (self.patterns, self.case_fold, self._goto, self._fail, self._out)
+        return _MAGIC + bytes([_FORMAT_VERSION]) + marshal.dumps(payload)
+
+    @classmethod
+    def loads(cls, data: bytes) -> "AhoCorasick":
+        if len(data) < 5 or data[:4] != _MAGIC:
+            raise ValueError("Not a serialized AhoCorasick automaton")
+        if data[4] != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported automaton format version: {data[4]}")
+        try:
+            patterns, case_fold, goto, fail, out = marshal.loads(data[5:])
+            lens = [len(p) for p in patterns]
+        except (EOFError, ValueError, TypeError):
+            raise ValueError("Truncated or corrupt AhoCorasick automaton") from None
+        ac = cls.__new__(cls)
+        ac.patterns = patterns
+        ac.case_fold = case_fold
+        ac._lens = lens
+        ac._goto, ac._fail, ac._out = goto, fail, out
+        return ac
+
+    def save(self, path: Union[str, Path]) -> None:
+        Path(path).write_bytes(self.dumps())
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "AhoCorasick":
+        return cls.loads(Path(path).read_bytes())
+
+    def __repr__(self) -> str:
+        return f"AhoCorasick(patterns={len(self.patterns)}, states={self.state_count}, case_fold={self.case_fold})"
+
+def find_all(text: str, patterns: Iterable[str], case_fold: bool = False) -> List[Tuple[int, int]]:
+    """One-shot helper: compile `patterns` and return every (pattern_id, offset)."""
+    return AhoCorasick(patterns, case_fold=case_fold).findall(text)
@@ -0,0 +1,211 @@
+from __future__ import annotations
+import marshal
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Tuple, Union
+from .multi_search import fold_case
+
+# Prefix index over a fixed lexicon: one sorted array of keys, queried with
+# bisect. Every word with a given prefix sits in one contiguous slice, so
+#
+#   count / complete(prefix, limit)   two bisects + a slice
+#   common_prefix(prefix)             LCP of the first and last key in the slice
+#                                     (the LCP of a sorted set is the LCP of its
+#                                     extremes)
+#   longest_prefix_match(text)        bisect to the greatest key <= text; if it
+#                                     is not a prefix of text, any key that is
+#                                     must be a prefix of their common prefix,
+#                                     so retry with that (shorter) string
+#
+# In pure Python this beats a node-per-character or double-array trie: the sort
+# and the comparisons inside bisect run in C, and the whole index is two lists,
+# built in bulk with one sort and (de)serialized with marshal.
+
+_MAGIC = b"PFXI"
+_FORMAT_VERSION = 1
+
+def common_prefix_length(a: str, b: str) -> int:
+    """Length of the longest common prefix of two strings."""
+    n = min(len(a), len(b))
+    if a[:n] == b[:n]:
+        return n
+    lo, hi = 0, n            # a[:lo] == b[:lo], a[:hi] != b[:hi]; slices compare in C
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+def longest_common_prefix(strs: Iterable[str]) -> str:
+    """LCP of a set of strings: the LCP of its lexicographic min and max."""
+    strs = list(strs)
+    if not strs:
+        return ""
+    lo, hi = min(strs), max(strs)
+    return lo[:common_prefix_length(lo, hi)]
+
+def _prefix_end(p: str) -> Optional[str]:
+    # smallest string greater than every string starting with p (None: no bound)
+    while p:
+        c = ord(p[-1])
+        if c < 0x10FFFF:
+            return p[:-1] + chr(c + 1)
+        p = p[:-1]
+    return None
+
+class PrefixIndex:
+    """Sorted-array prefix index; optional values per word and case folding."""
+    __slots__ = ("keys", "words", "values", "case_fold")
+
+    def __init__(self, words: Iterable[str] = (), values: Optional[Iterable[Any]] = None,
+                 case_fold: bool = False):
+        self.case_fold = case_fold
+        if values is None:
+            uniq = set(words)
+            if case_fold:
+                pairs = sorted((fold_case(w), w) for w in uniq)
+                self.keys = [k for k, _ in pairs]
+                self.words = [w for _, w in pairs]
+            else:
+                self.keys = self.words = sorted(uniq)
+            self.values: Optional[List[Any]] = None
+        else:
+            entries = dict(zip(words, values))     # last value wins
+            order = sorted(entries, key=lambda w: (fold_case(w), w)) if case_fold else sorted(entries)
+            self.words = order
+            self.keys = [fold_case(w) for w in order] if case_fold else order
+            self.values = [entries[w] for w in order]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _key(self, s: str) -> str:
+        return fold_case(s) if self.case_fold else s
+
+    def _find(self, word: str) -> int:
+        key = self._key(word)
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            if self.case_fold:
+                # prefer the exact spelling among words that fold alike
+                j = i
+                while j < len(self.keys) and self.keys[j] == key:
+                    if self.words[j] == word:
+                        return j
+                    j += 1
+            return i
+        return -1
+
+    def __contains__(self, word: str) -> bool:
+        return self._find(word) >= 0
+
+    def get(self, word: str, default: Any = None) -> Any:
+        i = self._find(word)
+        if i < 0 or self.values is None:
+            return default
+        return self.values[i]
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """[lo, hi) slice of words starting with `prefix`."""
+        keys = self.keys
+        p = self._key(prefix)
+        lo = bisect_left(keys, p)
+        end = _prefix_end(p)
+        hi = len(keys) if end is None else bisect_left(keys, end, lo)
+        return lo, hi
+
+    def count(self, prefix: str) -> int:
+        lo, hi = self.prefix_range(prefix)
+        return hi - lo
+
+    def complete(self, prefix: str, limit: Optional[int] = 10) -> List[str]:
+        """Words starting with `prefix` in sorted order (at most `limit`; None = all)."""
+        lo, hi = self.prefix_range(prefix)
+        if limit is not None and hi - lo > limit:
+            hi = lo + max(limit, 0)
+        return self.words[lo:hi]
+
+    def common_prefix(self, prefix: str = "") -> Optional[str]:
+        """Longest extension of `prefix` shared by all its completions (None if
+        there are none); with case folding, in folded form."""
+        lo, hi = self.prefix_range(prefix)
+        if lo == hi:
+            return None
+        first, last = self.keys[lo], self.keys[hi - 1]
+        return first[:common_prefix_length(first, last)]
+
+    def longest_prefix_match(self, text: str) -> Optional[str]:
+        """Longest indexed word that is a prefix of `text`, or None."""
+        keys = self.keys
+        t = self._key(text)
+        while True:
+            i = bisect_right(keys, t) - 1
+            if i < 0:
+                return None
+            k = keys[i]
+            n = common_prefix_length(k, t)
+            if n == len(k):
+                if self.case_fold:
+                    # same key under several spellings: prefer the one in text
+                    j = i
+                    while j >= 0 and keys[j] == k:
+                        if self.words[j] == text[:n]:
+                            return self.words[j]
+                        j -= 1
+                return self.words[i]
+            t = t[:n]
+
+    def prefixes_of(self, text: str) -> List[str]:
+        """Every indexed word that is a prefix of `text`, shortest first."""
+        out: List[str] = []
+        keys = self.keys
+        t = self._key(text)
+        for n in range(1, len(t) + 1):
+            i = bisect_left(keys, t[:n])
+            if i < len(keys) and keys[i] == t[:n]:
+                out.append(self.words[i])
+            elif i == len(keys) or not keys[i].startswith(t[:n]):
+                break               # nothing longer can match either
+        return out
+
+    # ---------- serialization ----------
+
+    def dumps(self) -> bytes:
+        words = self.words
+        payload = (self.case_fold, words, None if self.keys is words else self.keys, self.values)
+        return _MAGIC + bytes([_FORMAT_VERSION]) + marshal.dumps(payload)
+
+    @classmethod
+    def loads(cls, data: bytes) -> "PrefixIndex":
+        if len(data) < 5 or data[:4] != _MAGIC:
+            raise ValueError("Not a serialized PrefixIndex")
+        if data[4] != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported prefix index format version: {data[4]}")
+        try:
+            case_fold, words, keys, values = marshal.loads(data[5:])
+        except (EOFError, ValueError, TypeError):
+            raise ValueError("Truncated or corrupt PrefixIndex") from None
+        n = len(words) if type(words) is list else -1
+        if (type(case_fold) is not bool or n < 0
+                or not (keys is None or (type(keys) is list and len(keys) == n))
+                or not (values is None or (type(values) is list and len(values) == n))
+                or not all(type(w) is str for w in (words if keys is None else keys))):
+            raise ValueError("Truncated or corrupt PrefixIndex")
+        idx = cls.__new__(cls)
+        idx.case_fold = case_fold
+        idx.words = words
+        idx.keys = words if keys is None else keys
+        idx.values = values
+        return idx
+
+    def save(self, path: Union[str, Path]) -> None:
+        Path(path).write_bytes(self.dumps())
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "PrefixIndex":
+        return cls.loads(Path(path).read_bytes())
+
+    def __repr__(self) -> str:
+        return f"PrefixIndex(words={len(self.keys)}, case_fold={self.case_fold})"
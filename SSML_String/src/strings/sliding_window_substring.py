@@ -1,10 +1,6 @@
+from .windows import longest_unique_span
+
 def length_of_longest_substring_no_repeat(s: str) -> int:
-    seen = {}
-    left = 0
-    best = 0
-    for right, ch in enumerate(s):
-        if ch in seen and seen[ch] >= left:
-            left = seen[ch] + 1
-        seen[ch] = right
-        best = max(best, right - left + 1)
-    return best
+    # characters are just tokens to the generic window engine (see windows.py)
+    a, b = longest_unique_span(s)
+    return b - a
@@ -1,6 +1,56 @@
 from collections import Counter
+from heapq import nsmallest
+from operator import neg
+from typing import Mapping
+
+# Top-k selection over a word -> count mapping, ordered by (-freq, word).
+# Keys are encoded as (-count, word) tuples built with map/zip, so every
+# comparison happens in C (no Python-level __lt__ or key lambdas).
+#   "sort":   full sort of encoded keys               O(n log n)
+#   "heap":   heapq.nsmallest over encoded keys       O(n log k), best for k << n
+#   "select": frequency-threshold selection           O(n + d log d + m log m)
+#             (d = distinct counts, m = candidates at or above the k-th count)
+
+def _top_k_sort(counts: Mapping[str, int], k: int) -> list[str]:
+    return [w for _, w in sorted(zip(map(neg, counts.values()), counts.keys()))[:k]]
+
+def _top_k_heap(counts: Mapping[str, int], k: int) -> list[str]:
+    return [w for _, w in nsmallest(k, zip(map(neg, counts.values()), counts.keys()))]
+
+def _top_k_select(counts: Mapping[str, int], k: int) -> list[str]:
+    # find the k-th largest count from the (usually tiny) count-of-counts table
+    freq_of_freq = Counter(counts.values())
+    cutoff = 0
+    seen = 0
+    for f in sorted(freq_of_freq, reverse=True):
+        seen += freq_of_freq[f]
+        if seen >= k:
+            cutoff = f
+            break
+    cand = [(-c, w) for w, c in counts.items() if c >= cutoff]
+    cand.sort()
+    return [w for _, w in cand[:k]]
+
+_METHODS = {"sort": _top_k_sort, "heap": _top_k_heap, "select": _top_k_select}
+
+def choose_top_k_method(n: int, k: int) -> str:
+    """Pick a selection strategy from the k/n ratio (thresholds from scripts/bench_top_k.py)."""
+    if k >= n:
+        return "sort"
+    if k * 1000 <= n:
+        return "heap"
+    return "select"
+
+def top_k_from_counts(counts: Mapping[str, int], k: int, method: str = "auto") -> list[str]:
+    if k <= 0 or not counts:
+        return []
+    if method == "auto":
+        method = choose_top_k_method(len(counts), k)
+    if method not in _METHODS:
+        raise ValueError(f"Unknown top-k method: {method}")
+    return _METHODS[method](counts, k)
 
 def top_k_frequent_words(words: list[str], k: int) -> list[str]:
     cnt = Counter(words)
     # sort by (-freq, word) for deterministic order
-    return [w for w, _ in sorted(cnt.items(), key=lambda x: (-x[1], x[0]))[:k]]
+    return top_k_from_counts(cnt, k)
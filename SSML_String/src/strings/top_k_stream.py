@@ -0,0 +1,148 @@
+from __future__ import annotations
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+from .top_k_freq import top_k_from_counts
+
+# Streaming top-k with the Space-Saving algorithm (Metwally et al.).
+# - bounded mode: at most `capacity` counters; every count is an over-estimate
+#   by at most its recorded error, and any word with true frequency > N/capacity
+#   is guaranteed to be tracked.
+# - exact mode (capacity=None): plain dict counting, for verification.
+# Sketches are mergeable, so per-worker results can be combined.
+
+class SpaceSaving:
+    """Bounded-memory heavy-hitters sketch with deterministic (-freq, word) ranking."""
+    __slots__ = ("capacity", "total", "_counts", "_errors", "_heap")
+
+    def __init__(self, capacity: Optional[int] = 1024):
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be >= 1 (or None for exact mode)")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        # lazy min-heap of (count, word); entries may be stale (count grew or word evicted)
+        self._heap: List[Tuple[int, str]] = []
+
+    @property
+    def exact(self) -> bool:
+        return self.capacity is None
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._counts
+
+    def update(self, word: str, count: int = 1) -> None:
+        self.total += count
+        counts = self._counts
+        if word in counts:
+            counts[word] += count
+        elif self.capacity is None or len(counts) < self.capacity:
+            counts[word] = count
+            self._errors[word] = 0
+            if self.capacity is not None:
+                heapq.heappush(self._heap, (count, word))
+        else:
+            floor, victim = self._pop_min()
+            del counts[victim]
+            del self._errors[victim]
+            counts[word] = floor + count
+            self._errors[word] = floor
+            heapq.heappush(self._heap, (floor + count, word))
+
+    def extend(self, words: Iterable[str]) -> None:
+        if self.capacity is None:
+            counts = self._counts
+            errors = self._errors
+            n = 0
+            for w in words:
+                n += 1
+                if w in counts:
+                    counts[w] += 1
+                else:
+                    counts[w] = 1
+                    errors[w] = 0
+            self.total += n
+            return
+        update = self.update
+        for w in words:
+            update(w)
+
+    def _pop_min(self) -> Tuple[int, str]:
+        """Remove and return the live (count, word) with the smallest count."""
+        heap = self._heap
+        counts = self._counts
+        while True:
+            cnt, w = heap[0]
+            cur = counts.get(w)
+            if cur == cnt:
+                heapq.heappop(heap)
+                return cnt, w
+            if cur is None:
+                heapq.heappop(heap)  # stale entry of an evicted word
+            else:
+                heapq.heapreplace(heap, (cur, w))  # refresh and retry
+
+    def min_count(self) -> int:
+        """Smallest tracked count when the sketch is full, else 0 (the Space-Saving error floor)."""
+        if self.capacity is None or len(self._counts) < self.capacity:
+            return 0
+        return min(self._counts.values())
+
+    def count(self, word: str) -> int:
+        """Estimated frequency (upper bound in bounded mode)."""
+        return self._counts.get(word, self.min_count())
+
+    def error(self, word: str) -> int:
+        return self._errors.get(word, self.min_count())
+
+    def items(self) -> List[Tuple[str, int, int]]:
+        """All tracked (word, count, error) in (-count, word) order."""
+        errors = self._errors
+        ordered = sorted(self._counts.items(), key=lambda x: (-x[1], x[0]))
+        return [(w, c, errors[w]) for w, c in ordered]
+
+    def top_k(self, k: int) -> List[str]:
+        """Top-k words by (-freq, word); exact in exact mode."""
+        return top_k_from_counts(self._counts, k)
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Fold `other` into this sketch (in place) and return self.
+
+        Words missing from one side are charged that side's error floor, then the
+        result is truncated back to `capacity` counters (mergeable summaries).
+        """
+        m1 = self.min_count()
+        m2 = other.min_count()
+        counts: Dict[str, int] = {}
+        errors: Dict[str, int] = {}
+        for w in self._counts.keys() | other._counts.keys():
+            counts[w] = self._counts.get(w, m1) + other._counts.get(w, m2)
+            errors[w] = self._errors.get(w, m1) + other._errors.get(w, m2)
+        if self.capacity is not None and len(counts) > self.capacity:
+            counts = {w: counts[w] for w in top_k_from_counts(counts, self.capacity)}
+            errors = {w: errors[w] for w in counts}
+        self._counts = counts
+        self._errors = errors
+        self.total += other.total
+        if self.capacity is not None:
+            self._heap = [(c, w) for w, c in counts.items()]
+            heapq.heapify(self._heap)
+        return self
+
+    def __repr__(self) -> str:
+        return f"SpaceSaving(capacity={self.capacity!r}, tracked={len(self._counts)}, total={self.total})"
+
+def stream_top_k(words: Iterable[str], k: int, capacity: Optional[int] = None) -> List[str]:
+    """Top-k over an iterable without materializing a Counter of the full vocabulary.
+
+    capacity=None runs in exact mode; otherwise memory is bounded by `capacity`
+    counters (use capacity >> k for accurate results on skewed streams).
+    """
+    if capacity is not None and capacity < k:
+        capacity = k
+    sketch = SpaceSaving(capacity)
+    sketch.extend(words)
+    return sketch.top_k(k)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+from array import array
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Sliding-window engine over arbitrary token streams (characters, words of
+# flattened SSML, ids, ...), single pass and fed incrementally.
+# Tokens are mapped once to dense integer ids by a Vocabulary; all per-token
+# state then lives in array('q') tables indexed by id instead of dicts keyed by
+# the tokens themselves. A Vocabulary can be shared by several windows so ids
+# (and the tables) are reused across queries.
+#
+#   LongestUniqueWindow   longest span without a repeated token
+#   CoveringWindow        smallest span containing every keyword (with multiplicity)
+#
+# Spans are absolute half-open [start, end) token positions in the fed stream.
+
+Span = Tuple[int, int]
+
+def drop_surplus(win: Deque[Tuple[int, Any]], have: Any, need: Any) -> None:
+    """Pop (position, key) hits off the left of `win` while their key is held
+    more often than needed; such hits can never start a minimal covering window.
+    Shared by CoveringWindow and min_window_stream.MinWindowQuery."""
+    while win and have[win[0][1]] > need[win[0][1]]:
+        have[win.popleft()[1]] -= 1
+
+def compact_hits(win: Deque[Tuple[int, Any]], have: Any, need: Any) -> None:
+    """Keep only the latest need[key] hits of each key in `win`.
+
+    An older hit of a key can never be inside a minimal window again, but
+    drop_surplus only removes such hits from the left end; while some required
+    key has not arrived, the others would pile up in the middle. Callers
+    compact once `win` holds twice the total need, so it stays O(len(keys)).
+    """
+    kept: Dict[Any, int] = {}
+    out = []
+    for hit in reversed(win):
+        k = hit[1]
+        c = kept.get(k, 0)
+        if c < need[k]:
+            kept[k] = c + 1
+            out.append(hit)
+    out.reverse()
+    win.clear()
+    win.extend(out)
+    for k, c in kept.items():
+        have[k] = c
+
+class Vocabulary:
+    """Dense token -> id mapping (ids are assigned in first-seen order)."""
+    __slots__ = ("ids", "tokens")
+
+    def __init__(self, tokens: Iterable[Hashable] = ()):
+        self.ids: Dict[Hashable, int] = {}
+        self.tokens: List[Hashable] = []
+        for t in tokens:
+            self.id(t)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def id(self, token: Hashable) -> int:
+        i = self.ids.get(token)
+        if i is None:
+            i = self.ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        return i
+
+    def encode(self, tokens: Iterable[Hashable]) -> array:
+        """Token ids as array('q'), growing the vocabulary as needed."""
+        return array("q", map(self.id, tokens))
+
+class LongestUniqueWindow:
+    """Longest span without a repeated token; `best` is the earliest longest."""
+    __slots__ = ("vocab", "_last", "_left", "_pos", "best")
+
+    def __init__(self, vocab: Optional[Vocabulary] = None):
+        self.vocab = vocab if vocab is not None else Vocabulary()
+        self.reset()
+
+    def reset(self) -> None:
+        self._last = array("q")  # id -> last position, -1 = unseen (grows with the vocabulary)
+        self._left = 0
+        self._pos = 0
+        self.best: Span = (0, 0)
+
+    @property
+    def position(self) -> int:
+        """Number of tokens fed so far."""
+        return self._pos
+
+    @property
+    def current(self) -> Span:
+        """The repeat-free span ending at the last fed token."""
+        return (self._left, self._pos)
+
+    def feed(self, tokens: Iterable[Hashable]) -> Span:
+        """Consume the next tokens; returns the best span so far."""
+        ids = self.vocab.ids
+        vid = self.vocab.id
+        last = self._last
+        left = self._left
+        pos = self._pos
+        best_a, best_b = self.best
+        best_len = best_b - best_a
+        for tok in tokens:
+            i = ids.get(tok)
+            if i is None:
+                i = vid(tok)
+            if i >= len(last):
+                last.extend([-1] * (len(self.vocab) - len(last)))
+            p = last[i]
+            if p >= left:
+                left = p + 1
+            last[i] = pos
+            pos += 1
+            if pos - left > best_len:
+                best_len = pos - left
+                best_a, best_b = left, pos
+        self._left = left
+        self._pos = pos
+        self.best = (best_a, best_b)
+        return self.best
+
+class CoveringWindow:
+    """Smallest span containing every keyword (repeated keywords must repeat).
+
+    Only keyword hits are buffered, at most twice the number of keywords
+    (see compact_hits), so memory does not grow with the stream.
+    """
+    __slots__ = ("keywords", "_index", "_need", "_required", "_cap", "_have", "_formed",
+                 "_win", "_pos", "best")
+
+    def __init__(self, keywords: Iterable[Hashable]):
+        self.keywords = Vocabulary()
+        need = array("q")
+        for k in keywords:
+            i = self.keywords.id(k)
+            if i == len(need):
+                need.append(0)
+            need[i] += 1
+        self._index = self.keywords.ids  # keyword -> id; other tokens are never assigned ids
+        self._need = need
+        self._required = len(need)
+        self._cap = 2 * sum(need)
+        self.reset()
+
+    def reset(self) -> None:
+        self._have = array("q", bytes(8 * len(self._need)))
+        self._formed = 0
+        self._win: Deque[Tuple[int, int]] = deque()  # (position, keyword id)
+        self._pos = 0
+        self.best: Optional[Span] = None
+
+    @property
+    def position(self) -> int:
+        return self._pos
+
+    def feed(self, tokens: Iterable[Hashable]) -> List[Span]:
+        """Consume the next tokens; return each minimal covering span completed in them."""
+        if not self._required:
+            self._pos += sum(1 for _ in tokens)
+            return []
+        get = self._index.get
+        need, have, win = self._need, self._have, self._win
+        required = self._required
+        cap = self._cap
+        formed = self._formed
+        pos = self._pos
+        found: List[Span] = []
+        for tok in tokens:
+            k = get(tok)
+            pos += 1
+            if k is None:
+                continue
+            have[k] += 1
+            if have[k] == need[k]:
+                formed += 1
+            win.append((pos - 1, k))
+            drop_surplus(win, have, need)
+            if len(win) > cap:
+                compact_hits(win, have, need)
+            if formed == required:
+                start = win[0][0]
+                found.append((start, pos))
+                if self.best is None or pos - start < self.best[1] - self.best[0]:
+                    self.best = (start, pos)
+                k = win.popleft()[1]
+                have[k] -= 1
+                formed -= 1
+                drop_surplus(win, have, need)
+        self._formed = formed
+        self._pos = pos
+        return found
+
+def longest_unique_span(tokens: Iterable[Hashable]) -> Span:
+    """[start, end) of the earliest longest run of tokens with no repeats."""
+    return LongestUniqueWindow().feed(tokens)
+
+def smallest_covering_span(tokens: Iterable[Hashable], keywords: Iterable[Hashable]) -> Optional[Span]:
+    """[start, end) of the earliest shortest span containing all keywords, or None."""
+    w = CoveringWindow(keywords)
+    w.feed(tokens)
+    return w.best
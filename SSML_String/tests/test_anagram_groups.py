@@ -0,0 +1,54 @@
+import os
+import random
+import tempfile
+import unittest
+from src.strings.anagram_groups import (anagram_signature, group_anagrams, group_anagrams_external,
+                                        iter_words, shard_of)
+
+def reference(words, case_sensitive=True):
+    # group_anagrams_sort from scripts/strings_06_group_anagrams.py
+    groups = {}
+    for w in words:
+        groups.setdefault("".join(sorted(w if case_sensitive else w.lower())), []).append(w)
+    result = [sorted(g) for g in groups.values()]
+    result.sort(key=lambda g: (g[0], len(g), g))
+    return result
+
+def random_words(rng, n):
+    alphabet = "abcdeABé"
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 5))) for _ in range(n)]
+
+class TestAnagramGroups(unittest.TestCase):
+    def test_signature(self):
+        self.assertEqual(anagram_signature("listen"), anagram_signature("silent"))
+        self.assertNotEqual(anagram_signature("aab"), anagram_signature("abb"))
+        self.assertEqual(anagram_signature("résumé"), anagram_signature("ésumér"))
+        self.assertNotEqual(anagram_signature("ab"), anagram_signature("Ab"))
+        self.assertEqual(shard_of("listen", 7), shard_of("enlist", 7))
+
+    def test_matches_sort_version(self):
+        rng = random.Random(11)
+        words = random_words(rng, 3000)
+        for cs in (True, False):
+            self.assertEqual(group_anagrams(words, cs), reference(words, cs))
+
+    def test_external_spills_and_merges(self):
+        rng = random.Random(12)
+        words = random_words(rng, 5000)
+        with tempfile.TemporaryDirectory() as tmp:
+            for cs in (True, False):
+                got = list(group_anagrams_external(iter(words), cs, shards=7, memory_words=500, tmp_dir=tmp))
+                self.assertEqual(got, reference(words, cs))
+            self.assertEqual(os.listdir(tmp), [])  # spill files cleaned up
+        self.assertEqual(list(group_anagrams_external(words[:100])), reference(words[:100]))
+
+    def test_iter_words_from_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "vocab.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("eat tea\n tan ate\nnat bat\n")
+            groups = list(group_anagrams_external(iter_words(path), memory_words=2, shards=3, tmp_dir=tmp))
+        self.assertEqual(groups, [["ate", "eat", "tea"], ["bat"], ["nat", "tan"]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import xml.etree.ElementTree as ET
+from src.ssml.annotate import AbbreviationAnnotator, Expansion
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.transforms import flatten_text
+
+ENTRIES = {
+    "NYC": "New York City",
+    "NY": "New York",
+    "Dr.": "Doctor",
+    "HTML": Expansion("say-as", "characters"),
+}
+
+class TestAbbreviationAnnotator(unittest.TestCase):
+    def setUp(self):
+        self.ann = AbbreviationAnnotator(ENTRIES)
+
+    def test_longest_match_and_boundaries(self):
+        root = self.ann.annotate_text("Dr. Jones left NYC and NYCE for HTML work.")
+        subs = [(el.tag, el.text, dict(el.attrib)) for el in root]
+        self.assertEqual(subs, [
+            ("sub", "Dr.", {"alias": "Doctor"}),
+            ("sub", "NYC", {"alias": "New York City"}),
+            ("say-as", "HTML", {"interpret-as": "characters"}),
+        ])
+        self.assertEqual(flatten_text(root), "Doctor Jones left New York City and NYCE for HTML work.")
+
+    def test_matches_hand_written_markup(self):
+        root = self.ann.annotate_text("Hello NYC fans!")
+        expected = parse_ssml('<speak>Hello <sub alias="New York City">NYC</sub> fans!</speak>')
+        self.assertEqual(ET.tostring(root), ET.tostring(expected))
+
+    def test_annotate_element_in_place(self):
+        root = parse_ssml('<speak>In NY <sub alias="x">NYC</sub> then NYC <p>Dr. Who</p></speak>')
+        self.ann.annotate_element(root)
+        self.assertEqual(flatten_text(root), "In New York x then New York City Doctor Who")
+
+    def test_roundtrip(self):
+        ann2 = AbbreviationAnnotator.loads(self.ann.dumps())
+        text = "Dr. X in NYC"
+        self.assertEqual(ann2.find_spans(text), self.ann.find_spans(text))
+        d = self.ann.dumps()
+        for bad in (d[:4], d[:6], d[:10], d[:len(d) // 2], d[:-1]):
+            with self.subTest(n=len(bad)), self.assertRaises(ValueError):
+                AbbreviationAnnotator.loads(bad)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import io
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from src.ssml.backends import (BACKENDS, ENTITIES, SINGLE_QUOTES, NAMESPACES, CDATA, RECOVER,
+                               choose_backend, parse)
+from src.ssml.simple_etree import parse_ssml
+
+SAMPLE = Path(__file__).resolve().parents[1] / "src" / "ssml" / "examples" / "sample1.xml"
+
+# (document, features it needs)
+CORPUS = [
+    (SAMPLE.read_text(encoding="utf-8"), set()),
+    ('<speak>Hi <sub alias="New York">NY</sub>! <break time="1s"/> <p><s>One.</s><s>Two</s></p></speak>', set()),
+    ('<speak>\n  <voice name="Émilie">Grüße <emphasis level="strong">très</emphasis> bien</voice>\n</speak>', set()),
+    ('<speak><!-- note -->Before<?pi x?> after</speak>', set()),
+    ("<speak>Fish &amp; chips &lt;3</speak>", {ENTITIES}),
+    ("<speak><break time='2s'/></speak>", {SINGLE_QUOTES}),
+    ('<speak xmlns="http://www.w3.org/2001/10/synthesis"><p>ns</p></speak>', {NAMESPACES}),
+    ("<speak><![CDATA[a < b]]></speak>", {CDATA}),
+]
+BROKEN = ["<speak><p>open", "<speak></p></speak>", "<speak>a < b</speak>", "<a/><b/>"]
+
+def shape(el):
+    # tree interface comparison; whitespace-only text counts as absent
+    def t(x):
+        return x if x and x.strip() else None
+    return (el.tag, dict(el.attrib), t(el.text), t(el.tail), [shape(c) for c in el])
+
+class TestBackends(unittest.TestCase):
+    def test_conformance_matrix(self):
+        for name, backend in BACKENDS.items():
+            for doc, needs in CORPUS:
+                with self.subTest(backend=name, doc=doc[:30]):
+                    if needs <= backend.features:
+                        self.assertEqual(shape(parse(doc, backend=name)), shape(ET.fromstring(doc)))
+
+    def test_strict_backends_reject_broken_input(self):
+        for name in ("etree", "pull", "tiny"):
+            for doc in BROKEN:
+                with self.subTest(backend=name, doc=doc):
+                    with self.assertRaises(ET.ParseError):
+                        parse(doc, backend=name)
+
+    def test_tolerant_recovers(self):
+        issues = []
+        root = parse("<speak><p>one <s>two</p> three </x>four", backend="tolerant", issues=issues)
+        self.assertEqual(ET.tostring(root), b"<speak><p>one <s>two</s></p> three four</speak>")
+        self.assertEqual(len(issues), 3)
+        root = parse("<a/><b/>", require=[RECOVER], issues=issues)
+        self.assertEqual([c.tag for c in root], ["a", "b"])
+        self.assertEqual(shape(parse("<speak>a < b</speak>", backend="tolerant")),
+                         ("speak", {}, "a < b", None, []))
+
+    def test_auto_selection(self):
+        doc = CORPUS[1][0]
+        self.assertEqual(choose_backend(doc).name, "etree")
+        self.assertEqual(choose_backend(io.BytesIO(doc.encode())).name, "pull")
+        self.assertEqual(choose_backend(doc, [RECOVER]).name, "tolerant")
+        self.assertEqual(shape(parse(iter([doc[:10], doc[10:]]))), shape(parse_ssml(doc)))
+        self.assertEqual(shape(parse(io.StringIO(doc))), shape(parse_ssml(doc)))
+        with self.assertRaises(ValueError):
+            choose_backend(doc, [RECOVER, NAMESPACES])
+        with self.assertRaises(ValueError):
+            parse(doc, backend="nope")
+
+if __name__ == "__main__":
+    unittest.main()
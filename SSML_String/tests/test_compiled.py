@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from src.ssml.compiled import CompiledDocument, compile_document, save_compiled
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.transforms import flatten_text, total_duration_seconds
+
+SAMPLE = Path(__file__).resolve().parents[1] / "src" / "ssml" / "examples" / "sample1.xml"
+DOC = """<speak>Grüße aus <sub alias="New York">NY</sub>!
+  <p>Wait <break time="1500ms"/> then <say-as interpret-as="digits">42</say-as>.</p>
+  <voice name="Émilie"><prosody rate="slow">slowly   now</prosody></voice>
+</speak>"""
+
+class TestCompiledDocument(unittest.TestCase):
+    def check_round_trip(self, text):
+        root = parse_ssml(text)
+        doc = CompiledDocument.from_bytes(compile_document(root))
+        self.assertEqual(ET.tostring(doc.to_element()), ET.tostring(root))
+        self.assertEqual(doc.flat_text, flatten_text(root))
+        self.assertEqual(round(doc.duration, 3), total_duration_seconds(root))
+        self.assertEqual(doc.n_nodes, sum(1 for _ in root.iter()))
+        doc.close()
+
+    def test_round_trip(self):
+        self.check_round_trip(DOC)
+        self.check_round_trip(SAMPLE.read_text(encoding="utf-8"))
+        self.check_round_trip("<speak/>")
+        self.check_round_trip('<speak>one <break strength="strong"/> two <break/></speak>')
+
+    def test_mmap_access(self):
+        root = parse_ssml(DOC)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "doc.ssmc")
+            save_compiled(root, path)
+            with CompiledDocument.open(path) as doc:
+                voice = next(doc.iter_tag("voice"))
+                self.assertEqual(doc.attrs(voice), {"name": "Émilie"})
+                self.assertEqual([doc.tag(c) for c in doc.children(voice)], ["prosody"])
+                self.assertEqual(doc.tag(doc.parent(voice)), "speak")
+                brk = next(doc.iter_tag("break"))
+                k = doc.at_time(3.0)
+                start, end, node, spoken = doc.timeline(k)
+                self.assertEqual(node, brk)
+                self.assertAlmostEqual(end - start, 1.5)
+                self.assertEqual(spoken, "")
+                first = doc.timeline(doc.at_time(0.0))
+                self.assertEqual(first[3], "Grüße aus")
+                self.assertIsNone(doc.at_time(doc.duration + 1))
+                self.assertEqual(list(doc.iter_tag("missing")), [])
+                self.assertEqual(list(doc.iter_tag("")), [])
+                root_ids = {t: [i for i, e in enumerate(root.iter()) if e.tag == t]
+                            for t in ("speak", "p", "sub", "say-as", "prosody")}
+                for t, ids in root_ids.items():
+                    self.assertEqual(list(doc.iter_tag(t)), ids, t)
+
+    def test_rejects_bad_input(self):
+        data = compile_document(parse_ssml(DOC))
+        with self.assertRaisesRegex(ValueError, "Not a compiled"):
+            CompiledDocument.from_bytes(b"XXXX" + data[4:])
+        with self.assertRaisesRegex(ValueError, "version"):
+            CompiledDocument.from_bytes(data[:4] + bytes([99]) + data[5:])
+        with self.assertRaisesRegex(ValueError, "Truncated"):
+            CompiledDocument.from_bytes(data[:-16])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import random
+import tempfile
+import unittest
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.dedup import DedupIndex, choose_bands, find_duplicates, minhash
+from src.strings.bounded_edit import bounded_edit_distance
+
+WORDS = ("your order ships today thanks for calling our support team please hold "
+         "the line while we connect you to an agent account balance payment due").split()
+
+def edit_distance(a, b):
+    prev = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        cur = [i]
+        for j, y in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (x != y)))
+        prev = cur
+    return prev[-1]
+
+def script(rng, n=80):
+    return [rng.choice(WORDS) for _ in range(n)]
+
+def tweak(rng, words, edits, vocab=WORDS):
+    words = list(words)
+    for _ in range(edits):
+        i = rng.randrange(len(words) + 1)
+        k = rng.randrange(3) if i < len(words) else 1
+        if k == 0:
+            words[i] = rng.choice(vocab)
+        elif k == 1:
+            words.insert(i, rng.choice(vocab))
+        else:
+            del words[i]
+    return words
+
+def to_ssml(words):
+    half = len(words) // 2
+    return (f"<speak><p><s>{' '.join(words[:half])}</s></p><break time='1s'/>"
+            f"<p><prosody rate='slow'>{' '.join(words[half:])}</prosody></p></speak>")
+
+class TestBoundedEdit(unittest.TestCase):
+    def test_matches_full_dp(self):
+        rng = random.Random(48)
+        for _ in range(400):
+            a = [rng.choice("abc") for _ in range(rng.randint(0, 12))]
+            b = tweak(rng, a, rng.randint(0, 4), "abc") if a and rng.random() < 0.7 else \
+                [rng.choice("abc") for _ in range(rng.randint(0, 12))]
+            d = edit_distance(a, b)
+            k = rng.randint(0, 8)
+            self.assertEqual(bounded_edit_distance(a, b, k), d if d <= k else None)
+            self.assertEqual(bounded_edit_distance("".join(a), "".join(b), k), d if d <= k else None)
+
+class TestDedup(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(480)
+        self.corpus = {}
+        self.planted = set()
+        for i in range(60):
+            base = script(rng)
+            self.corpus[f"d{i}"] = to_ssml(base)
+            if i % 3 == 0:
+                self.corpus[f"d{i}-copy"] = to_ssml(tweak(rng, base, 3))
+                self.planted.add((f"d{i}-copy", f"d{i}"))
+
+    def test_finds_planted_near_duplicates(self):
+        idx = DedupIndex(threshold=0.9)
+        matches = idx.add_many(self.corpus.items(), batch=16)
+        self.assertEqual({(m.key, m.other) for m in matches}, self.planted)
+        for m in matches:
+            self.assertLessEqual(m.distance, 3)
+            self.assertGreaterEqual(m.similarity, 0.9)
+            self.assertGreater(m.jaccard, 0.5)
+        # LSH keeps the confirmation step far below all pairs
+        self.assertLess(idx.candidates, len(self.corpus) * (len(self.corpus) - 1) // 8)
+
+    def test_incremental_after_save_and_load(self):
+        items = list(self.corpus.items())
+        idx = DedupIndex(threshold=0.9)
+        idx.add_many(items[:40])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sigs.bin")
+            idx.save(path)
+            loaded = DedupIndex.load(path)
+        self.assertEqual(len(loaded), 40)
+        self.assertEqual(loaded.sigs, idx.sigs)
+        later = loaded.add_many(items[40:])
+        full = find_duplicates(items, threshold=0.9)
+        self.assertEqual({(m.key, m.other) for m in later},
+                         {(m.key, m.other) for m in full if m.key in dict(items[40:])})
+        key, doc = items[0]
+        self.assertIn(key, [m.other for m in loaded.query(parse_ssml(doc))])
+        with self.assertRaises(ValueError):
+            DedupIndex.loads(b"XXXX" + idx.dumps()[4:])
+        d = idx.dumps()
+        for bad in (d[:4], d[:6], d[:10], d[:len(d) // 2], d[:-1]):
+            with self.subTest(n=len(bad)), self.assertRaises(ValueError):
+                DedupIndex.loads(bad)
+        with self.assertRaises(ValueError):
+            loaded.add(key, doc)
+
+    def test_signature_properties(self):
+        rng = random.Random(7)
+        words = script(rng, 200)
+        self.assertEqual(minhash(words), minhash(list(words)))
+        self.assertEqual(len(minhash(words[:2])), 128)          # short docs are densified
+        other = script(rng, 200)
+        same = sum(x == y for x, y in zip(minhash(words), minhash(other)))
+        self.assertLess(same, 40)
+        self.assertEqual(choose_bands(128, 0.5), (32, 4))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.transforms import total_duration_seconds
+from src.ssml.duration import (estimate_duration, parse_rate, count_syllables,
+                               WpmModel, SyllableModel, VoiceTableModel)
+from src.ssml.say_as import number_to_words, ordinal_to_words, expand_say_as
+
+class TestDuration(unittest.TestCase):
+    def test_wpm_matches_legacy_without_extras(self):
+        root = parse_ssml('<speak>Hello <sub alias="New York">NY</sub> fans <break time="500ms"/>'
+                          'this is a <emphasis>quick</emphasis> demo</speak>')
+        est = estimate_duration(root, WpmModel(180), punctuation_pauses=False)
+        self.assertAlmostEqual(est.total, total_duration_seconds(root, wpm=180), places=3)
+
+    def test_nested_prosody(self):
+        self.assertEqual(parse_rate("slow"), 0.75)
+        self.assertEqual(parse_rate("+100%", 0.5), 1.0)
+        self.assertEqual(parse_rate("80%", 2.0), 0.8)
+        plain = estimate_duration(parse_ssml("<speak>one two three</speak>"), punctuation_pauses=False)
+        nested = estimate_duration(parse_ssml(
+            '<speak><prosody rate="50%">one <prosody rate="+100%">two</prosody> three</prosody></speak>'),
+            punctuation_pauses=False)
+        # "one" and "three" at half speed, "two" back at full speed
+        self.assertAlmostEqual(nested.speech, plain.speech / 3 * (2 + 1 + 2), places=3)
+
+    def test_breaks_say_as_and_punctuation(self):
+        root = parse_ssml('<speak>Call <say-as interpret-as="telephone">5551212</say-as>. '
+                          '<break strength="strong"/><break time="250ms"/>Bye, now.</speak>')
+        est = estimate_duration(root)
+        self.assertEqual(est.words, 1 + 7 + 2)  # the lone "." is a pause only
+        self.assertAlmostEqual(est.breaks, 1.0)
+        self.assertAlmostEqual(est.punctuation, 0.35 + 0.15 + 0.35)
+        bare = estimate_duration(parse_ssml('<speak>a <break/> b <break strength="odd"/></speak>'))
+        self.assertAlmostEqual(bare.breaks, 0.5 + 0.5)   # bare and unknown strength -> medium
+
+    def test_syllable_and_voice_models(self):
+        self.assertEqual([count_syllables(w) for w in ("cat", "table", "make", "banana", "42")], [1, 2, 1, 3, 3])
+        m = SyllableModel(syllables_per_second=4.0)
+        m.precompute(["hello", "world"])
+        self.assertAlmostEqual(m.seconds(["hello", "world"], None), 3 / 4.0)
+        root = parse_ssml('<speak><voice name="fast">hello world</voice> hello world</speak>')
+        vt = VoiceTableModel({"fast": 8.0}, fallback=m)
+        est = estimate_duration(root, vt, punctuation_pauses=False)
+        self.assertAlmostEqual(est.speech, 3 / 8.0 + 3 / 4.0, places=3)
+
+    def test_say_as_words(self):
+        self.assertEqual(number_to_words(12045), "twelve thousand forty-five")
+        self.assertEqual(ordinal_to_words(21), "twenty-first")
+        self.assertEqual(expand_say_as("date", "10/05/2025"), "October fifth two thousand twenty-five")
+
+    def test_superscript_digits_are_not_numbers(self):
+        # '²'.isdigit() is True but int('²') raises
+        self.assertEqual(expand_say_as("cardinal", "10²"), "ten")
+        self.assertEqual(expand_say_as("digits", "2²"), "two")
+        self.assertEqual(expand_say_as("date", "1/2/²"), "1/2/²")
+        self.assertEqual(expand_say_as("time", "²:30"), "²:30")
+        self.assertEqual(count_syllables("m²"), 1)
+
+if __name__ == "__main__":
+    unittest.main()
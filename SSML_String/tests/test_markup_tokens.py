@@ -0,0 +1,74 @@
+import random
+import unittest
+from src.strings.markup_tokens import (tokenize, as_tokens, KIND_NAMES, TEXT, START, END, SELF,
+                                       SKIP, EMPTY, UNCLOSED, OPEN, CLOSE)
+from src.strings.is_valid_tags import check_markup, OK
+from src.ssml.tiny_parser import parse_tiny
+
+def spans(toks):
+    return [(KIND_NAMES[k], toks.text[a:b]) for k, a, b in toks]
+
+class TestMarkupTokens(unittest.TestCase):
+    def test_kinds(self):
+        toks = tokenize('hi <a x="1">t</ a ><br /><?pi?><!-- c --><>')
+        self.assertEqual(spans(toks), [
+            ("TEXT", "hi "), ("START", "a"), ("TEXT", "t"), ("END", "a"),
+            ("SELF", "br"), ("SKIP", "<?pi?>"), ("SKIP", "<!-- c -->"), ("EMPTY", "<>"),
+        ])
+        self.assertEqual(spans(tokenize("x <b")), [("TEXT", "x "), ("UNCLOSED", "<b")])
+
+    def test_brackets_cover_text_and_tags(self):
+        toks = tokenize('(a <t k="[">)}', brackets=True)
+        kinds = [(KIND_NAMES[k], toks.text[a:b]) for k, a, b in toks if k in (OPEN, CLOSE)]
+        self.assertEqual(kinds, [("OPEN", "("), ("OPEN", "["), ("CLOSE", ")"), ("CLOSE", "}")])
+
+    def test_lazy_scan_and_reuse(self):
+        doc = "<a></b>" + "<c></c>" * 5000
+        toks = tokenize(doc)
+        self.assertEqual(check_markup(toks), 3)
+        self.assertFalse(toks.complete)          # stopped early, rest not scanned
+        n = len(toks)                            # finishes the scan
+        self.assertTrue(toks.complete)
+        self.assertEqual(n, 2 + 2 * 5000)
+        self.assertIs(as_tokens(toks), toks)
+        self.assertIsNot(as_tokens(toks, brackets=True), toks)
+
+    def test_consumers_share_tokens(self):
+        doc = '<speak>Hi <break time="1s"/> there <b>(x)</b></speak>'
+        toks = tokenize(doc, brackets=True)
+        self.assertEqual(check_markup(toks), OK)
+        root = parse_tiny(toks)
+        self.assertEqual(root.children[0].tag, "speak")
+        self.assertEqual(root.children[0].children[1].attrs, {"time": "1s"})
+        self.assertEqual(len(toks), len(tokenize(doc, brackets=True)))
+
+    def test_random_docs(self):
+        rng = random.Random(5)
+        for _ in range(300):
+            doc = "".join(rng.choice("<>/ab ?!-()[") for _ in range(rng.randint(0, 30)))
+            toks = tokenize(doc, brackets=True)
+            pos = 0
+            for k, a, b in toks:  # markup tokens are ordered and disjoint
+                if k not in (OPEN, CLOSE):
+                    self.assertLessEqual(pos, a)
+                    self.assertLessEqual(a, b)
+                    pos = b
+            got = sorted(a for k, a, b in toks if k in (OPEN, CLOSE))
+            self.assertEqual(got, [i for i, c in enumerate(doc) if c in "()["])
+
+    def test_str_and_token_inputs_agree(self):
+        fixtures = ["<a><b></b><c/></a>", "<a><b></a></b>", "x <a> <b>", "ok < >", "<a>text <b",
+                    "< a x='1' ></ a >", "<?xml v?><!-- <a> --><a></a>", "<!x><a>", "</ >", "<</?>",
+                    "<a/ >", "<a\t/>x</a\n>", "<<a>></a>", ""]
+        rng = random.Random(35)
+        pieces = ["<a>", "</a>", "<b x='1'>", "</b>", "<c/>", "< a >", "</ a>", "t", " ", ">", "<",
+                  "</>", "<a/ >", "<?p?>", "<!-- c -->", "<!x>", "\n"]
+        fixtures += ["".join(rng.choice(pieces) for _ in range(rng.randint(0, 10))) for _ in range(2000)]
+        for doc in fixtures:
+            expected = check_markup(doc)
+            self.assertEqual(check_markup(tokenize(doc)), expected, doc)
+            self.assertEqual(check_markup(tokenize(doc).finish()), expected, doc)
+            self.assertEqual(check_markup(tokenize(doc, brackets=True)), expected, doc)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import random
+import unittest
+import xml.etree.ElementTree as ET
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.tiny_parser import parse_tiny
+from src.ssml.transforms import flatten_text, total_duration_seconds
+from src.ssml.edge_cases import validate_tree
+from src.ssml.merkle import AnalysisCache, subtree_hash
+
+def random_doc(rng):
+    def el(depth):
+        tag = rng.choice(["p", "s", "sub", "emphasis", "break", "say-as", "blink"])
+        if tag == "break":
+            return rng.choice(['<break time="250ms"/>', '<break strength="weak"/>', "<break/>",
+                               '<break time="2x"/>'])
+        attrs = ""
+        if tag == "sub" and rng.random() < 0.7:
+            attrs = f' alias="al {rng.randrange(9)}"'
+        elif tag == "emphasis":
+            attrs = rng.choice(["", ' level="strong"', ' pitch="x"'])
+        inner = "".join(rng.choice(["w ", "x", " ", "yy z "]) if rng.random() < 0.5 or depth > 3
+                        else el(depth + 1) for _ in range(rng.randint(0, 4)))
+        return f"<{tag}{attrs}>{inner}</{tag}>"
+    return "<speak>" + "".join(el(0) + rng.choice(["", " t ", "u"]) for _ in range(rng.randint(0, 6))) + "</speak>"
+
+def full(root):
+    return {"text": flatten_text(root), "duration_seconds": total_duration_seconds(root),
+            "issues": validate_tree(root)}
+
+class TestMerkle(unittest.TestCase):
+    def test_matches_full_analysis(self):
+        rng = random.Random(44)
+        cache = AnalysisCache(maxsize=500)
+        for _ in range(300):
+            root = parse_ssml(random_doc(rng))
+            self.assertEqual(cache.analyze(root), full(root))
+        self.assertLessEqual(len(cache), 500)
+        self.assertGreater(cache.hits, 0)
+
+    def test_hash_ignores_whitespace_and_attribute_order(self):
+        a = parse_ssml('<speak><p>Hello   world <emphasis level="strong" x="1">hi</emphasis> end</p></speak>')
+        b = parse_ssml('<speak>\n  <p>Hello world\n<emphasis x="1" level="strong"> hi </emphasis>end </p>\n</speak>')
+        c = parse_ssml('<speak><p>Hello world <emphasis level="strong" x="1">hi</emphasis> ends</p></speak>')
+        self.assertEqual(subtree_hash(a), subtree_hash(b))
+        self.assertNotEqual(subtree_hash(a), subtree_hash(c))
+        self.assertEqual(subtree_hash(a[0][0]), subtree_hash(c[0][0]))
+        self.assertEqual(len(subtree_hash(a)), 16)
+
+    def test_edit_reuses_unchanged_subtrees(self):
+        paras = [f"<p><s>para {i} <emphasis>word</emphasis></s></p>" for i in range(50)]
+        cache = AnalysisCache()
+        cache.analyze(parse_ssml("<speak>" + "".join(paras) + "</speak>"))
+        paras[10] = "<p><s>edited <emphasis>word</emphasis></s></p>"
+        root = parse_ssml("<speak>" + "\n".join(paras) + "</speak>")
+        cache.hits = cache.misses = 0
+        self.assertEqual(cache.analyze(root), full(root))
+        self.assertEqual(cache.misses, 3)   # <s> and <p> of the edit, <speak>; <emphasis> is shared
+        self.assertEqual(cache.hits, 50 + 2 * 49)   # every <emphasis>, the other <s>/<p>
+
+    def test_node_trees(self):
+        doc = '<speak>Intro <sub alias="New York">NY</sub> <break time="1s"/> <p>end</p></speak>'
+        cache = AnalysisCache()
+        tiny = cache.analyze(parse_tiny(doc).children[0])
+        self.assertEqual(tiny, full(parse_ssml(doc)))
+        self.assertEqual(subtree_hash(parse_tiny(doc).children[0]), subtree_hash(parse_ssml(doc)))
+
+    def test_depth_rule_depends_on_position(self):
+        deep = "<s>" * 70 + "x" + "</s>" * 70
+        cache = AnalysisCache()
+        for doc in ("<speak>" + deep + "</speak>", "<speak><p>" + deep + "</p></speak>"):
+            root = parse_ssml(doc)
+            self.assertEqual(cache.analyze(root)["issues"], validate_tree(root))
+
+    def test_bad_size(self):
+        with self.assertRaises(ValueError):
+            AnalysisCache(0)
+
+if __name__ == "__main__":
+    unittest.main()
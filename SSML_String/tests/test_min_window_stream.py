@@ -0,0 +1,77 @@
+import unittest
+import random
+from collections import Counter
+from src.strings.min_window_stream import MinWindowQuery, compile_min_window, min_window
+
+def _reference(s, t):
+    if not s or not t or len(t) > len(s):
+        return ""
+    need, have = Counter(t), Counter()
+    formed, best, L = 0, None, 0
+    for R, ch in enumerate(s):
+        have[ch] += 1
+        if ch in need and have[ch] == need[ch]:
+            formed += 1
+        while formed == len(need):
+            if best is None or R - L + 1 < best[1] - best[0]:
+                best = (L, R + 1)
+            have[s[L]] -= 1
+            if s[L] in need and have[s[L]] < need[s[L]]:
+                formed -= 1
+            L += 1
+    return "" if best is None else s[best[0]:best[1]]
+
+class TestMinWindowStream(unittest.TestCase):
+    def test_examples(self):
+        self.assertEqual(min_window("ADOBECODEBANC", "ABC"), "BANC")
+        self.assertEqual(min_window("a", "aa"), "")
+        self.assertEqual(min_window("aaflslflsldkalskaaa", "aaa"), "aaa")
+        self.assertEqual(min_window("ab", "A"), "")
+        self.assertEqual(min_window("cabefgecdaecf", "cae"), "aec")
+        self.assertEqual(min_window("", "a"), "")
+        self.assertEqual(min_window("a", ""), "")
+
+    def test_random_against_reference(self):
+        rng = random.Random(5)
+        for alphabet in ("abcd", "aβγδ"):
+            for _ in range(200):
+                s = "".join(rng.choice(alphabet + "xyz") for _ in range(rng.randint(0, 40)))
+                t = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+                self.assertEqual(min_window(s, t), _reference(s, t), (s, t))
+
+    def test_chunked_feed(self):
+        s = "ADOBECODEBANC" * 3
+        q = MinWindowQuery("ABC")
+        found = []
+        for i in range(0, len(s), 4):
+            found.extend(q.feed(s[i:i + 4]))
+        self.assertEqual(q.position, len(s))
+        self.assertEqual(s[q.best[0]:q.best[1]], "BANC")
+        for a, b in found:
+            self.assertEqual(Counter(s[a:b]) & Counter("ABC"), Counter("ABC"))
+        self.assertEqual(MinWindowQuery("ABC").feed(s), found)
+
+    def test_one_shot_calls_leave_streams_alone(self):
+        s = "ADOBECODEBANC"
+        q = compile_min_window("ABC")
+        self.assertIsNot(q, compile_min_window("ABC"))
+        found = q.feed(s[:8])
+        self.assertEqual(min_window("xxBAC", "ABC"), "BAC")   # same t, separate state
+        found += q.feed(s[8:])
+        self.assertEqual(q.position, len(s))
+        self.assertEqual(found, MinWindowQuery("ABC").feed(s))
+        self.assertEqual(s[q.best[0]:q.best[1]], "BANC")
+
+    def test_buffer_bounded_while_a_char_is_missing(self):
+        q = MinWindowQuery("ABC")
+        s = "A" + "xC" * 5000
+        for i in range(0, len(s), 7):
+            self.assertEqual(q.feed(s[i:i + 7]), [])
+            self.assertLessEqual(len(q._win), 6)
+        s += "xB"
+        found = q.feed("xB")
+        self.assertEqual([s[a:b] for a, b in found], [s])
+        self.assertEqual(s[q.best[0]:q.best[1]], _reference(s, "ABC"))
+
+if __name__ == "__main__":
+    unittest.main()
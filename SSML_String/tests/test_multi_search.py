@@ -0,0 +1,48 @@
+import unittest
+import random
+from src.strings.multi_search import AhoCorasick, find_all
+
+def _brute(text, patterns):
+    hits = []
+    for pid, p in enumerate(patterns):
+        i = text.find(p)
+        while i != -1:
+            hits.append((pid, i))
+            i = text.find(p, i + 1)
+    return sorted(hits)
+
+class TestAhoCorasick(unittest.TestCase):
+    def test_classic(self):
+        pats = ["he", "she", "his", "hers"]
+        self.assertEqual(sorted(find_all("ushers", pats)), [(0, 2), (1, 1), (3, 2)])
+
+    def test_matches_brute_force(self):
+        rng = random.Random(3)
+        for _ in range(50):
+            text = "".join(rng.choice("abc") for _ in range(200))
+            pats = list({"".join(rng.choice("abc") for _ in range(rng.randint(1, 5))) for _ in range(8)})
+            self.assertEqual(sorted(AhoCorasick(pats).findall(text)), _brute(text, pats))
+
+    def test_single_pattern_fast_path(self):
+        self.assertEqual(find_all("aaaa", ["aa"]), [(0, 0), (0, 1), (0, 2)])
+        self.assertEqual(find_all("abc", ["zz"]), [])
+
+    def test_case_fold(self):
+        ac = AhoCorasick(["NYC", "html"], case_fold=True)
+        self.assertEqual(sorted(ac.findall("nyc loves HTML")), [(0, 0), (1, 10)])
+        self.assertFalse(AhoCorasick(["NYC", "x"]).contains_any("nyc"))
+
+    def test_roundtrip(self):
+        ac = AhoCorasick(["abbr", "Dr.", "NYC"], case_fold=True)
+        ac2 = AhoCorasick.loads(ac.dumps())
+        text = "dr. smith moved to nyc; abbr."
+        self.assertEqual(ac2.findall(text), ac.findall(text))
+        with self.assertRaises(ValueError):
+            AhoCorasick.loads(b"nope" + ac.dumps()[4:])
+        d = ac.dumps()
+        for bad in (b"", d[:4], d[:6], d[:10], d[:len(d) // 2], d[:-1]):
+            with self.subTest(n=len(bad)), self.assertRaises(ValueError):
+                AhoCorasick.loads(bad)
+
+if __name__ == "__main__":
+    unittest.main()
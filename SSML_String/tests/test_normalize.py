@@ -0,0 +1,50 @@
+import unittest
+from src.ssml.normalize import Normalizer, join_words
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.say_as import say_as_text
+
+DOC = """<speak>
+  Hello   <sub alias="New York">NY</sub>!
+  <p>Call <say-as interpret-as="digits">42</say-as>   NOW</p>
+  <sub>no alias</sub>
+</speak>"""
+
+class TestNormalize(unittest.TestCase):
+    def test_stages(self):
+        root = parse_ssml(DOC)
+        self.assertEqual(Normalizer(("sub", "whitespace")).normalize_tree(root),
+                         "Hello New York ! Call 42 NOW no alias")
+        self.assertEqual(Normalizer().normalize_tree(root), "Hello New York ! Call four two NOW no alias")
+        drop_bang = lambda w: None if w == "!" else w
+        n = Normalizer(("sub", "say-as", "casefold", "whitespace", drop_bang))
+        self.assertEqual(n.normalize_tree(root), "hello new york call four two now no alias")
+        raw = Normalizer(("sub",)).normalize_tree(root)
+        self.assertIn("Hello   New York!", raw)
+        with self.assertRaises(ValueError):
+            Normalizer(("bogus",))
+        with self.assertRaises(ValueError):
+            Normalizer((str.upper,))
+
+    def test_casefold_follows_declared_order(self):
+        caps_only = lambda w: w if w[:1].isupper() else None
+        text = "Hello there World"
+        self.assertEqual(Normalizer(("whitespace", caps_only, "casefold")).normalize_text(text),
+                         "hello world")
+        self.assertEqual(Normalizer(("casefold", "whitespace", caps_only)).normalize_text(text), "")
+
+    def test_streaming_matches_whole(self):
+        root = parse_ssml("<speak>" + "<p>one  two <sub alias='x y'>z</sub></p>\n" * 500 + "</speak>")
+        n = Normalizer(("sub", "casefold", "whitespace"))
+        chunks = list(n.iter_tree(root, size=100))
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual("".join(chunks), n.normalize_tree(root))
+
+        text = "  The QUICK\tbrown\n\nfox " * 300
+        whole = n.normalize_text(text)
+        self.assertEqual(whole, join_words([text.casefold()]))
+        for step in (1, 7, 64):
+            pieces = (text[i:i + step] for i in range(0, len(text), step))
+            self.assertEqual("".join(n.iter_text(pieces, size=50)), whole)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import random
+import re
+import unittest
+import xml.etree.ElementTree as ET
+from src.ssml.offsets import flatten_with_offsets, parse_with_positions
+from src.ssml.transforms import flatten_text
+from src.ssml.edge_cases import flatten_with_styles
+
+DOC = ('<speak>Hello  world, café au lait.\r\n  Fish &amp; chips<break time="1s"/>and '
+       '<sub alias="World Wide Web">WWW</sub> ok<p>x&#233;y z</p>tail <![CDATA[a<b]]></speak>')
+
+def random_doc(rng):
+    def el(depth):
+        tag = rng.choice(["p", "s", "sub", "emphasis", "break"])
+        if tag == "break":
+            return '<break time="1s"/>'
+        attrs = f' alias="al {rng.randrange(9)}"' if tag == "sub" and rng.random() < 0.7 else ""
+        inner = "".join(rng.choice(["w ", "é", " ", "yy z ", "&amp;", "\n  "])
+                        if rng.random() < 0.5 or depth > 3 else el(depth + 1)
+                        for _ in range(rng.randint(0, 4)))
+        return f"<{tag}{attrs}>{inner}</{tag}>"
+    return "<speak>" + "".join(el(0) + rng.choice(["", " t ", "ü"]) for _ in range(rng.randint(0, 5))) + "</speak>"
+
+class TestOffsets(unittest.TestCase):
+    def check(self, doc):
+        root, pos = parse_with_positions(doc)
+        self.assertEqual(ET.tostring(root), ET.tostring(ET.fromstring(doc)))
+        text, m = flatten_with_offsets(root, pos)
+        self.assertEqual(text, flatten_text(root))
+        for w in re.finditer(r"\S+", text):
+            a, b = w.span()
+            sa, sb = m.source_range(a, b)
+            el = m.element_at(a)
+            ea, eb = pos.span(el)
+            self.assertTrue(ea <= sa < sb <= eb)
+            if m.verbatim[m._run_at_flat(a)] and m._run_at_flat(a) == m._run_at_flat(b - 1):
+                self.assertEqual(pos.source[sa:sb].decode("utf-8"), w.group())
+                self.assertEqual(m.flat_range(sa, sb), (a, b))
+        # runs are sorted in both coordinates
+        for r in range(1, len(m)):
+            self.assertLessEqual(m.flat_end[r - 1], m.flat_start[r])
+            self.assertLessEqual(m.src_end[r - 1], m.src_start[r])
+        return text, m
+
+    def test_matches_flatten_and_maps_back(self):
+        self.check(DOC)
+        rng = random.Random(43)
+        for _ in range(300):
+            self.check(random_doc(rng))
+
+    def test_runs(self):
+        text, m = self.check(DOC)
+        src = parse_with_positions(DOC)[1].source
+        runs = [src[m.src_start[r]:m.src_end[r]].decode() for r in range(len(m))]
+        self.assertIn("world, café au lait.", runs)      # single spaces: one run
+        self.assertIn("&amp;", runs)
+        self.assertIn('<sub alias="World Wide Web">WWW</sub>', runs)
+        i = text.index("Wide")
+        self.assertEqual(m.to_source(i), src.index(b"<sub"))
+        self.assertEqual(m.to_flat(src.index("lait".encode())), text.index("lait"))
+        self.assertIsNone(m.to_source(text.index(" chips")))  # joining space
+
+    def test_prose_is_one_run_per_text_node(self):
+        doc = "<speak><p>" + " ".join(f"word{i}" for i in range(5000)) + "</p></speak>"
+        root, pos = parse_with_positions(doc)
+        text, m = flatten_with_offsets(root, pos)
+        self.assertEqual(len(m), 1)
+        self.assertEqual(m.to_source(text.index("word4321")), doc.index("word4321"))
+
+    def test_flatten_with_styles(self):
+        doc = ('<speak>Call <say-as interpret-as="characters">abc</say-as> at '
+               '<sub alias="noon">12</sub>.  Done\n now</speak>')
+        root, pos = parse_with_positions(doc)
+        out = flatten_with_styles(root, positions=pos)
+        m = out["offsets"]
+        self.assertEqual(m.text, out["text"])
+        a = out["text"].index("b c")
+        self.assertEqual(pos.source[slice(*m.source_range(a, a + 3))].decode(),
+                         '<say-as interpret-as="characters">abc</say-as>')
+        self.assertNotIn("offsets", flatten_with_styles(root))
+
+    def test_parse_error(self):
+        with self.assertRaises(ET.ParseError):
+            parse_with_positions("<speak><p></speak>")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import random
+import unittest
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.transforms import flatten_text
+from src.ssml.duration import estimate_duration
+from src.ssml.planner import (EngineModel, LocalEngine, plan, reassembly, run_plan,
+                              split_segments)
+
+WORDS = "welcome to the show tonight we talk about speech synthesis".split()
+
+def chapter(rng, sections=12):
+    out = ["<speak>Intro <sub alias='New York'>NY</sub>."]
+    for _ in range(sections):
+        out.append(f'<voice name="{rng.choice("ABC")}"><prosody rate="slow">')
+        for _ in range(rng.randint(1, 4)):
+            out.append(f'<p><s>{" ".join(rng.choice(WORDS) for _ in range(rng.choice([5, 40, 120])))}</s>'
+                       f'<break time="300ms"/></p>')
+        out.append("</prosody></voice> between")
+    out.append("</speak>")
+    return "".join(out)
+
+class TestPlanner(unittest.TestCase):
+    def setUp(self):
+        self.root = parse_ssml(chapter(random.Random(46)))
+        self.segs = split_segments(self.root, max_seconds=15.0)
+
+    def test_segments_cover_document_in_order(self):
+        parsed = [parse_ssml(s.ssml) for s in self.segs]
+        self.assertEqual(" ".join(filter(None, map(flatten_text, parsed))), flatten_text(self.root))
+        self.assertEqual(sum(s.words for s in self.segs), estimate_duration(self.root).words)
+        self.assertEqual([s.index for s in self.segs], list(range(len(self.segs))))
+        for s, p in zip(self.segs, parsed):
+            names = {v.get("name") for v in p.iter("voice")}
+            self.assertLessEqual(len(names), 1)
+            self.assertEqual(s.voice, names.pop() if names else None)
+            if s.voice is not None:
+                self.assertEqual(len(list(p.iter("prosody"))), 1)   # rate context kept
+            # only a single too-long sentence may exceed the limit
+            if s.seconds > 15.0:
+                self.assertEqual(len(list(p.iter("s"))), 1)
+
+    def test_plan_strategies(self):
+        em = EngineModel({"A": 0.2, "B": 0.5})
+        plans = {st: plan(self.segs, 3, em, st) for st in ("ordered", "lpt", "hybrid")}
+        for p in plans.values():
+            self.assertEqual(sorted(i for q in p.queues for i in q), list(range(len(self.segs))))
+            self.assertAlmostEqual(p.makespan, max(a.end for a in p.assignments))
+            for q in p.queues:
+                ends = [p.assignments[i].end for i in q]
+                self.assertEqual(ends, sorted(ends))
+        self.assertAlmostEqual(plans["ordered"].ttfa, em.cost(self.segs[0]))
+        self.assertAlmostEqual(plans["hybrid"].ttfa, em.cost(self.segs[0]))
+        self.assertLessEqual(plans["lpt"].makespan, plans["ordered"].makespan + 1e-9)
+        self.assertLess(plans["ordered"].makespan, plan(self.segs, 1, em).makespan)
+        rows = reassembly(plans["hybrid"])
+        self.assertEqual([r[0] for r in rows], list(range(len(self.segs))))
+        self.assertTrue(all(play >= ready for _, _, ready, play in rows))
+
+    def test_run_plan(self):
+        p = plan(self.segs, 4)
+        engines = {None: LocalEngine(time_scale=0.0)}
+        for v in "ABC":
+            engines[v] = LocalEngine(time_scale=0.0, bytes_per_second=100)
+        r = run_plan(p, engines)
+        self.assertEqual([len(a) for a in r.audio],
+                         [int(s.seconds * (320 if s.voice is None else 100)) for s in self.segs])
+        self.assertEqual(sum(e.calls for e in engines.values()), len(self.segs))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            plan(self.segs, 0)
+        with self.assertRaises(ValueError):
+            plan(self.segs, 2, strategy="random")
+
+        def broken(seg):
+            raise RuntimeError("engine down")
+        with self.assertRaises(RuntimeError):
+            run_plan(plan(self.segs, 2), broken)
+
+if __name__ == "__main__":
+    unittest.main()
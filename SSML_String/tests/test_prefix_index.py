@@ -0,0 +1,66 @@
+import marshal
+import os
+import random
+import tempfile
+import unittest
+from src.strings.prefix_index import PrefixIndex, common_prefix_length, longest_common_prefix
+
+class TestPrefixIndex(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(49)
+        self.words = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 6))) for _ in range(300)]
+        self.idx = PrefixIndex(self.words)
+        self.lex = sorted(set(self.words))
+
+    def test_queries_match_brute_force(self):
+        rng = random.Random(490)
+        for _ in range(300):
+            p = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 4)))
+            hits = [w for w in self.lex if w.startswith(p)]
+            self.assertEqual(self.idx.count(p), len(hits))
+            self.assertEqual(self.idx.complete(p, limit=5), hits[:5])
+            self.assertEqual(self.idx.complete(p, limit=None), hits)
+            self.assertEqual(self.idx.common_prefix(p), longest_common_prefix(hits) if hits else None)
+            text = p + "".join(rng.choice("abc") for _ in range(rng.randint(0, 6)))
+            pre = [w for w in self.lex if text.startswith(w)]
+            self.assertEqual(self.idx.longest_prefix_match(text), max(pre, key=len) if pre else None)
+            self.assertEqual(self.idx.prefixes_of(text), sorted(pre, key=len))
+            self.assertEqual(p in self.idx, p in self.lex)
+
+    def test_lcp(self):
+        self.assertEqual(longest_common_prefix(["flower", "flow", "flight"]), "fl")
+        self.assertEqual(longest_common_prefix(["same", "same"]), "same")
+        self.assertEqual(longest_common_prefix([]), "")
+        self.assertEqual(common_prefix_length("abcdefgh", "abcdxfgh"), 4)
+        self.assertEqual(common_prefix_length("abc", "abcdef"), 3)
+        self.assertIsNone(PrefixIndex(["\U0010ffffa", "b"]).common_prefix("c"))
+        self.assertEqual(PrefixIndex(["\U0010ffffa", "\U0010ffffb"]).count("\U0010ffff"), 2)
+
+    def test_values_case_fold_and_serialization(self):
+        lex = PrefixIndex(["NASA", "nas", "Nashville", "nasal"], values=["n AE s ah", "n aa s",
+                          "n ae sh v ih l", "n ey z ah l"], case_fold=True)
+        self.assertEqual(lex.complete("NAS"), ["nas", "NASA", "nasal", "Nashville"])
+        self.assertEqual(lex.get("nasa"), "n AE s ah")
+        self.assertEqual(lex.longest_prefix_match("NASAL passages"), "nasal")
+        self.assertEqual(lex.common_prefix("nash"), "nashville")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "lexicon.pfx")
+            lex.save(path)
+            loaded = PrefixIndex.load(path)
+        self.assertEqual(loaded.complete("nas", None), lex.complete("nas", None))
+        self.assertEqual(loaded.get("Nashville"), "n ae sh v ih l")
+        plain = PrefixIndex.loads(self.idx.dumps())
+        self.assertIs(plain.keys, plain.words)
+        self.assertEqual(plain.complete("ab", None), self.idx.complete("ab", None))
+        with self.assertRaises(ValueError):
+            PrefixIndex.loads(b"XXXX\x01")
+        d = self.idx.dumps()
+        for bad in (d[:4], d[:6], d[:10], d[:len(d) // 2], d[:-1],
+                    d[:5] + marshal.dumps((1, ["a"], None, None)),
+                    d[:5] + marshal.dumps((False, ["a", "b"], ["a"], None)),
+                    d[:5] + marshal.dumps((False, ["a", 2], None, None))):
+            with self.subTest(n=len(bad)), self.assertRaises(ValueError):
+                PrefixIndex.loads(bad)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from src.ssml.query import TreeIndex, compile_path, parse_indexed
+from src.ssml.tiny_parser import parse_tiny
+
+DOC = """<speak>
+  <voice name="A"><p><say-as interpret-as="date">1/2/2025</say-as>
+     <say-as interpret-as="digits">12</say-as></p></voice>
+  <voice name="B"><say-as interpret-as="date">3/4/2025</say-as><break time="1s"/></voice>
+  <say-as interpret-as="date">5/6/2025</say-as>
+  <break strength="weak"/>
+</speak>"""
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.doc = parse_indexed(DOC)
+
+    def test_tag_and_attr(self):
+        self.assertEqual(len(self.doc.select("//break")), 2)
+        self.assertEqual([e.attrib["time"] for e in self.doc.select("break[@time]")], ["1s"])
+        self.assertEqual(len(self.doc.select("say-as[@interpret-as='date']")), 3)
+
+    def test_paths(self):
+        dates = self.doc.select("voice[@name='A']//say-as[@interpret-as=\"date\"]")
+        self.assertEqual([e.text for e in dates], ["1/2/2025"])
+        self.assertEqual([e.text for e in self.doc.select("/speak/say-as")], ["5/6/2025"])
+        self.assertEqual(self.doc.select("/voice"), [])
+        self.assertEqual(len(self.doc.select("/speak/voice/*")), 3)
+        self.assertEqual(len(self.doc.select("voice//*")), 5)
+
+    def test_matches_iter_scan(self):
+        root = self.doc.root
+        self.assertEqual(self.doc.select("//say-as"), list(root.iter("say-as")))
+        self.assertEqual(self.doc.select("//*"), list(root.iter()))
+
+    def test_node_trees(self):
+        idx = TreeIndex(parse_tiny(DOC))
+        self.assertEqual(idx.count("voice[@name='B']/say-as"), 1)
+        self.assertEqual(idx.count("//say-as"), 4)
+        self.assertEqual(idx.root.tag, "speak")
+        # parse_tiny's synthetic ROOT is the document node, as for ET trees
+        for path in ("/speak", "/speak/voice", "/speak/say-as", "/voice", "/speak/voice/*",
+                     "//*", "/speak//break", "/ROOT"):
+            with self.subTest(path=path):
+                self.assertEqual(idx.count(path), self.doc.index.count(path))
+
+    def test_bad_query(self):
+        with self.assertRaises(ValueError):
+            compile_path("voice[name=X]")
+
+if __name__ == "__main__":
+    unittest.main()
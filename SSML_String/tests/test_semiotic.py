@@ -0,0 +1,71 @@
+import unittest
+import xml.etree.ElementTree as ET
+from src.ssml.semiotic import SemioticTagger
+from src.ssml.annotate import AbbreviationAnnotator
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.say_as import roman_to_int, say_as_text
+from src.ssml.duration import estimate_duration
+
+class TestSemioticTagger(unittest.TestCase):
+    def setUp(self):
+        self.tagger = SemioticTagger()
+
+    def tags(self, text, tagger=None):
+        root = (tagger or self.tagger).annotate_text(text)
+        return [(el.text, el.get("interpret-as"), el.get("format")) for el in root]
+
+    def test_classes(self):
+        self.assertEqual(self.tags(
+            "Call 555-123-4567 or (800) 555-0199 by 5:30 pm on 3/14/2025 (or 2025-03-14), "
+            "the 2nd of 1,200 reminders for Henry VIII in Chapter IV, Part CD and Appendix V."), [
+            ("555-123-4567", "telephone", None),
+            ("(800) 555-0199", "telephone", None),
+            ("5:30 pm", "time", None),
+            ("3/14/2025", "date", "mdy"),
+            ("2025-03-14", "date", "ymd"),
+            ("2nd", "ordinal", None),
+            ("1,200", "cardinal", None),
+            ("VIII", "ordinal", None),
+            ("IV", "cardinal", None),
+            ("CD", "cardinal", None),
+            ("V", "cardinal", None),
+        ])
+        self.assertEqual(self.tags("due 31/12/2024", SemioticTagger("dmy")),
+                         [("31/12/2024", "date", "dmy")])
+
+    def test_ambiguous_tokens_left_alone(self):
+        text = ("I paid 3.14 for mp3 files, 5-10 times, at 12:30:45 on 31/12/2024; "
+                "Dr. Smith MD sent a CV. 13/45/2020 v2. See Appendix C. Type C cable, "
+                "Class D amplifier, Part D coverage. Size XL shirts. Order XL today. Order XX.")
+        self.assertEqual(self.tags(text), [])
+
+    def test_tree_feeds_transforms(self):
+        root = self.tagger.annotate_text("World War II ended in 1945, on the 2nd of September.")
+        expected = parse_ssml('<speak>World War <say-as interpret-as="cardinal">II</say-as> ended in '
+                              '<say-as interpret-as="cardinal">1945</say-as>, on the '
+                              '<say-as interpret-as="ordinal">2nd</say-as> of September.</speak>')
+        self.assertEqual(ET.tostring(root), ET.tostring(expected))
+        self.assertEqual([say_as_text(el) for el in root],
+                         ["two", "one thousand nine hundred forty-five", "second"])
+        self.assertEqual(estimate_duration(root).words, 4 + 6 + 5)
+
+    def test_annotate_element_with_abbreviations(self):
+        root = parse_ssml('<speak>Dr. Who at 9:15 a.m. <say-as interpret-as="digits">42</say-as>'
+                          '<p>Louis XIV had 3 dogs</p></speak>')
+        AbbreviationAnnotator({"Dr.": "Doctor"}).annotate_element(root)
+        self.tagger.annotate_element(root)
+        self.assertEqual([(el.tag, el.text) for el in root.iter() if el is not root], [
+            ("sub", "Dr."), ("say-as", "9:15 a.m."), ("say-as", "42"), ("p", "Louis "),
+            ("say-as", "XIV"), ("say-as", "3"),
+        ])
+
+    def test_roman_to_int(self):
+        self.assertEqual(roman_to_int("MCMXCIV"), 1994)
+        self.assertEqual(roman_to_int("XLII"), 42)
+        self.assertIsNone(roman_to_int("IIII"))
+        self.assertIsNone(roman_to_int(""))
+        with self.assertRaises(ValueError):
+            SemioticTagger("ymd")
+
+if __name__ == "__main__":
+    unittest.main()
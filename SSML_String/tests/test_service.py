@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+import unittest
+from src.ssml import service
+from src.ssml.service import SSMLService, ServiceBusy
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.transforms import flatten_text, total_duration_seconds
+from src.ssml.edge_cases import analyze
+
+DOC = '<speak>Hello <sub alias="New York">NY</sub> <break time="500ms"/> world.</speak>'
+
+class TestSSMLService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calls = 0
+        self.gate = threading.Event()
+
+        def slow(text, seconds=0.0):
+            self.calls += 1
+            if seconds:
+                time.sleep(seconds)
+            else:
+                self.gate.wait(5)
+            return text.upper()
+
+        service.OPERATIONS["slow"] = slow
+        self.addCleanup(service.OPERATIONS.pop, "slow")
+
+    async def test_matches_direct_calls(self):
+        async with SSMLService(max_workers=2) as svc:
+            self.assertEqual(await svc.flatten(DOC), flatten_text(parse_ssml(DOC)))
+            self.assertEqual(await svc.duration(DOC, wpm=120),
+                             total_duration_seconds(parse_ssml(DOC), wpm=120))
+            self.assertEqual(await svc.validate(DOC), [])
+            self.assertEqual(await svc.validate("<p/>"), ["Root must be <speak>"])
+            self.assertEqual(await svc.edge_cases(DOC), analyze(DOC))
+            self.assertEqual((await svc.parse(DOC)).tag, "speak")
+            with self.assertRaises(Exception):
+                await svc.parse("<speak>")
+
+    async def test_coalesces_duplicates(self):
+        async with SSMLService(max_workers=2) as svc:
+            tasks = [asyncio.create_task(svc.submit("slow", "a")) for _ in range(5)]
+            tasks.append(asyncio.create_task(svc.submit("slow", "b")))
+            await asyncio.sleep(0.05)
+            self.gate.set()
+            self.assertEqual(await asyncio.gather(*tasks), ["A"] * 5 + ["B"])
+            self.assertEqual(self.calls, 2)
+            self.assertEqual(svc.stats.coalesced, 4)
+
+    async def test_coalesced_callers_get_their_own_tree(self):
+        async with SSMLService(max_workers=1, concurrency=1, queue_size=1) as svc:
+            blocker = asyncio.create_task(svc.submit("slow", "x"))
+            await asyncio.sleep(0.05)
+            a, b = (asyncio.create_task(svc.parse(DOC)) for _ in range(2))
+            await asyncio.sleep(0.01)
+            self.gate.set()
+            ra, rb = await asyncio.gather(a, b)
+            await blocker
+            self.assertEqual(svc.stats.coalesced, 1)
+            self.assertIsNot(ra, rb)
+            ra.find("sub").set("alias", "changed")
+            self.assertEqual(rb.find("sub").get("alias"), "New York")
+
+    async def test_timeout_and_backpressure(self):
+        async with SSMLService(max_workers=1, concurrency=1, queue_size=1) as svc:
+            running = asyncio.create_task(svc.submit("slow", "x"))
+            await asyncio.sleep(0.05)                      # picked up by the only worker
+            queued = asyncio.create_task(svc.submit("slow", "y"))
+            await asyncio.sleep(0.01)
+            with self.assertRaises(ServiceBusy):
+                await svc.submit("slow", "z", wait=False)
+            with self.assertRaises(asyncio.TimeoutError):
+                await svc.submit("slow", "w", timeout=0.05)  # waits for queue room, times out
+            queued.cancel()                                # dropped before it starts
+            self.gate.set()
+            self.assertEqual(await running, "X")
+            self.assertEqual(self.calls, 1)
+            self.assertEqual(svc.stats.rejected, 1)
+            self.assertEqual(svc.stats.timed_out, 1)
+
+    async def test_duplicate_timeout_keeps_shared_job(self):
+        async with SSMLService(max_workers=1, concurrency=1, queue_size=1) as svc:
+            running = asyncio.create_task(svc.submit("slow", "x"))
+            await asyncio.sleep(0.05)
+            queued = asyncio.create_task(svc.submit("slow", "y"))
+            await asyncio.sleep(0.01)
+            # the original blocks on the full queue; a duplicate joins and gives up
+            original = asyncio.create_task(svc.submit("slow", "q", timeout=5))
+            await asyncio.sleep(0.01)
+            with self.assertRaises(asyncio.TimeoutError):
+                await svc.submit("slow", "q", timeout=0.05)
+            self.gate.set()
+            self.assertEqual(await asyncio.gather(running, queued, original), ["X", "Y", "Q"])
+            self.assertEqual(svc.stats.coalesced, 1)
+
+    async def test_submitter_timeout_keeps_shared_job(self):
+        async with SSMLService(max_workers=1, concurrency=1, queue_size=1) as svc:
+            running = asyncio.create_task(svc.submit("slow", "x"))
+            await asyncio.sleep(0.05)
+            queued = asyncio.create_task(svc.submit("slow", "y"))
+            await asyncio.sleep(0.01)
+            # the submitter blocks on the full queue and gives up; the duplicate
+            # (no timeout) and a cancelled second submitter must not affect it
+            submitter = asyncio.create_task(svc.submit("slow", "q", timeout=0.05))
+            cancelled = asyncio.create_task(svc.submit("slow", "r"))
+            await asyncio.sleep(0.01)
+            duplicate = asyncio.create_task(svc.submit("slow", "q"))
+            other = asyncio.create_task(svc.submit("slow", "r"))
+            await asyncio.sleep(0.01)
+            cancelled.cancel()
+            with self.assertRaises(asyncio.TimeoutError):
+                await submitter
+            self.gate.set()
+            self.assertEqual(await asyncio.gather(running, queued, duplicate, other),
+                             ["X", "Y", "Q", "R"])
+            self.assertTrue(cancelled.cancelled())
+            self.assertEqual(svc.stats.timed_out, 1)
+            self.assertEqual(svc.stats.coalesced, 2)
+
+    async def test_threadsafe_submit(self):
+        async with SSMLService(max_workers=2) as svc:
+            fut = await asyncio.to_thread(lambda: svc.submit_threadsafe("flatten", DOC))
+            self.assertEqual(await asyncio.wrap_future(fut), "Hello New York world.")
+
+if __name__ == "__main__":
+    unittest.main()
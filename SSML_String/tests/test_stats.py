@@ -0,0 +1,50 @@
+import unittest
+import json
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.stats import DocStats, collect_stats, OTHER
+from src.ssml.transforms import total_duration_seconds
+
+DOCS = [
+    '<speak>Hi <break time="500ms"/> there <voice name="A"><p>Deep text</p></voice></speak>',
+    '<speak><break strength="strong"/><voice name="B">x</voice></speak>',
+    '<speak><unclosed></speak>',
+]
+
+class TestDocStats(unittest.TestCase):
+    def test_single_pass_counts(self):
+        st = collect_stats(DOCS)
+        self.assertEqual(st.documents, 2)
+        self.assertEqual(st.parse_errors, 1)
+        self.assertEqual(st.tags, {"speak": 2, "break": 2, "voice": 2, "p": 1})
+        self.assertEqual(st.attributes["voice@name"], {"A": 1, "B": 1})
+        self.assertEqual(st.depth_histogram, [2, 4, 1])
+        self.assertEqual(st.break_count, 2)
+        self.assertAlmostEqual(st.break_seconds, 1.25)
+        self.assertEqual(sum(st.text_length_histogram), 2)
+        self.assertEqual(st.attributes_by_tag()["break"], ["strength", "time"])
+
+    def test_merge_equals_single_collector(self):
+        whole = collect_stats(DOCS * 3)
+        parts = [collect_stats(DOCS[:1]), collect_stats(DOCS[1:] * 2), collect_stats(DOCS[:1] * 2 + DOCS[1:])]
+        merged = DocStats()
+        for p in parts:
+            merged.merge(DocStats.from_json(p.to_json()))
+        self.assertEqual(merged.to_dict(), whole.to_dict())
+        json.loads(merged.to_json())
+
+    def test_bad_break_time_does_not_abort_batch(self):
+        st = collect_stats(['<speak>a <break time="xs"/> b</speak>'] + DOCS[:1])
+        self.assertEqual(st.documents, 2)
+        self.assertEqual(st.break_count, 2)
+        self.assertAlmostEqual(st.break_seconds, 0.5)
+        with self.assertRaises(ValueError):   # the public estimate still rejects it
+            total_duration_seconds(parse_ssml('<speak>a <break time="xs"/> b</speak>'))
+
+    def test_vocab_cap(self):
+        st = DocStats(max_values=2)
+        for i in range(5):
+            st.add(parse_ssml(f'<speak><break time="{i}s"/></speak>'))
+        self.assertEqual(st.attributes["break@time"], {"0s": 1, "1s": 1, OTHER: 3})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import io
+import random
+import unittest
+import xml.etree.ElementTree as ET
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.transforms import flatten_text, total_duration_seconds
+from src.ssml.streaming import (iter_pieces, stream_flatten_text, stream_stats,
+                                stream_total_duration_seconds)
+
+DOC = """<speak>Intro <sub alias="New York City">NYC<break time="2s"/> ignored</sub> tail
+  <p>One <s>two <emphasis>three</emphasis> four</s> five<break time="500ms"/>six</p>
+  <sub>no alias <b>kept</b></sub> end</speak>"""
+
+def random_doc(rng):
+    def el(depth):
+        tag = rng.choice(["p", "s", "sub", "emphasis", "break"])
+        attrs = ""
+        if tag == "sub" and rng.random() < 0.7:
+            attrs = f' alias="al{rng.randrange(9)}"'
+        if tag == "break":
+            return f'<break time="{rng.randrange(900)}ms"/>'
+        inner = "".join(rng.choice(["w ", "x", " ", "yy z "]) if rng.random() < 0.5 or depth > 3
+                        else el(depth + 1) for _ in range(rng.randint(0, 4)))
+        return f"<{tag}{attrs}>{inner}</{tag}>"
+    return "<speak>" + "".join(el(0) + rng.choice(["", " t ", "u"]) for _ in range(rng.randint(0, 5))) + "</speak>"
+
+class TestStreaming(unittest.TestCase):
+    def check(self, doc, chunk_size):
+        root = parse_ssml(doc)
+        self.assertEqual(stream_flatten_text(doc, chunk_size), flatten_text(root))
+        self.assertEqual(stream_total_duration_seconds(doc, chunk_size=chunk_size), total_duration_seconds(root))
+
+    def test_matches_tree_versions(self):
+        for size in (1, 3, 7, 64, 1 << 16):
+            self.check(DOC, size)
+        rng = random.Random(8)
+        for _ in range(200):
+            self.check(random_doc(rng), rng.choice([1, 5, 40]))
+
+    def test_sources_and_order(self):
+        pieces = list(iter_pieces(io.BytesIO(DOC.encode()), 10))
+        self.assertEqual(pieces[:3], ["Intro ", "New York City", 2.0])
+        self.assertEqual(pieces[3].split(), ["tail"])
+        self.assertEqual(stream_stats(iter([DOC[:50], DOC[50:]])), stream_stats(DOC))
+        with self.assertRaises(ET.ParseError):
+            stream_stats("<speak><p>unclosed</speak>")
+
+if __name__ == "__main__":
+    unittest.main()
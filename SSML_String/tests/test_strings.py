@@ -1,6 +1,7 @@
 import unittest
 from src.strings.reverse_words import reverse_words
-from src.strings.is_valid_tags import is_well_formed_markup
+import random
+from src.strings.is_valid_tags import is_well_formed_markup, check_markup, check_markup_many, OK
 from src.strings.sliding_window_substring import length_of_longest_substring_no_repeat
 from src.strings.top_k_freq import top_k_frequent_words
 
@@ -13,6 +14,47 @@ class TestStrings(unittest.TestCase):
         self.assertFalse(is_well_formed_markup("<a><b></a></b>"))
         self.assertFalse(is_well_formed_markup("<a>"))
 
+    def test_markup_failure_offset(self):
+        self.assertEqual(check_markup("<a><b></b><c/></a>"), OK)
+        self.assertEqual(check_markup("<a><b></a></b>"), 6)
+        self.assertEqual(check_markup("x <a> <b>"), 6)
+        self.assertEqual(check_markup("ok < >"), 3)
+        self.assertEqual(check_markup("<a>text <b"), 8)
+        self.assertEqual(check_markup("< a x='1' ></ a >"), OK)
+
+    def test_markup_matches_reference(self):
+        def reference(s):
+            stack, i = [], 0
+            while i < len(s):
+                if s[i] == "<":
+                    j = s.find(">", i + 1)
+                    if j == -1:
+                        return False
+                    inside = s[i+1:j].strip()
+                    if not inside:
+                        return False
+                    if inside.startswith("/"):
+                        if not stack or stack[-1] != inside[1:].strip():
+                            return False
+                        stack.pop()
+                    elif not inside.endswith("/"):
+                        stack.append(inside.split()[0])
+                    i = j + 1
+                else:
+                    i += 1
+            return not stack
+        rng = random.Random(11)
+        pieces = ["<a>", "</a>", "<b x='1'>", "</b>", "<c/>", "< a >", "</ a>", "txt", " ", ">", "<", "</>", "<a/ >"]
+        for _ in range(2000):
+            s = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 8)))
+            self.assertEqual(is_well_formed_markup(s), reference(s), s)
+
+    def test_markup_bulk(self):
+        docs = ["<a><b></b></a>", "<a>", "plain"] * 50
+        expected = [check_markup(d) for d in docs]
+        self.assertEqual(check_markup_many(docs, workers=2, processes=False, chunksize=8), expected)
+        self.assertEqual(check_markup_many(docs, workers=2, chunksize=16), expected)
+
     def test_longest_substring(self):
         self.assertEqual(length_of_longest_substring_no_repeat("abcabcbb"), 3)
         self.assertEqual(length_of_longest_substring_no_repeat("bbbbb"), 1)
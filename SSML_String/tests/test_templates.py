@@ -0,0 +1,61 @@
+import random
+import unittest
+import xml.etree.ElementTree as ET
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.transforms import flatten_text, total_duration_seconds
+from src.ssml.edge_cases import validate_tree
+from src.ssml.templates import Template
+
+SOURCE = ('<speak>Hello {name}, your order {order:int} ships in {days:float} days.'
+          '<break time="{pause:time}"/><sub alias="{alias}">X</sub>'
+          '<prosody rate="{rate}">{name}</prosody> {{literal}} <break time="1s"/>'
+          '<emphasis level="{level}">ok</emphasis></speak>')
+
+def slow_path(ssml):
+    root = parse_ssml(ssml)
+    return flatten_text(root), total_duration_seconds(root), validate_tree(root)
+
+class TestTemplates(unittest.TestCase):
+    def test_matches_parse_then_analyze(self):
+        t = Template(SOURCE)
+        self.assertEqual(t.slots, {"name": "str", "order": "int", "days": "float", "pause": "time",
+                                   "alias": "str", "rate": "str", "level": "str"})
+        rng = random.Random(47)
+        names = ["Ann", "Bob & <Co>", ' "Q" ', "", "a  b\tc", "O'Neil"]
+        for _ in range(200):
+            values = {"name": rng.choice(names), "order": rng.randrange(10 ** 6),
+                      "days": rng.choice([1, 2.5, "3"]), "pause": rng.choice(["250ms", "2s"]),
+                      "alias": rng.choice(["New York", " x ", ""]),
+                      "rate": rng.choice(["slow", "fast"]), "level": rng.choice(["strong", "loud"])}
+            out = t.analyze(values)
+            self.assertEqual(out.ssml, t.render(values))
+            self.assertEqual((out.text, out.duration_seconds, out.issues), slow_path(out.ssml))
+
+    def test_static_issues_and_literals(self):
+        t = Template('<speak><blink>{x}</blink>{{ {x} }}<break time="{t:time}" strength="weak"/></speak>')
+        out = t.analyze({"x": "hi", "t": "1s"})
+        self.assertIn("{ hi }", out.text)
+        self.assertEqual(out.issues, validate_tree(parse_ssml(out.ssml)))
+        self.assertEqual(len(out.issues), 2)
+
+    def test_bad_values_and_templates(self):
+        t = Template("<speak>{n:int} {t:time}</speak>")
+        for bad in ({"n": "x", "t": "1s"}, {"n": 1.5, "t": "1s"}, {"n": 1, "t": "soon"}, {"n": 1}):
+            with self.assertRaises(ValueError):
+                t.render(bad)
+        s = Template('<speak>Hi {name}<sub alias="{alias}">x</sub></speak>')
+        for name in ("a\x01b", "\x00", "x\ufffe", "\ud800"):
+            with self.subTest(name=name), self.assertRaises(ValueError):
+                s.analyze({"name": name, "alias": "ok"})
+            with self.assertRaises(ValueError):
+                s.render({"name": "ok", "alias": name})
+        out = s.analyze({"name": "tab\there \U0001F600", "alias": "ok"})
+        self.assertEqual((out.text, out.duration_seconds, out.issues), slow_path(out.ssml))
+        for src, err in (("<speak>{x:date}</speak>", ValueError), ("<speak>{x:int}{x}</speak>", ValueError),
+                         ("<{tag}/>", ET.ParseError), ('<speak {attr}="1"/>', ET.ParseError),
+                         ("<speak>\ue000</speak>", ValueError), ("<speak>{x}", ET.ParseError)):
+            with self.subTest(src=src), self.assertRaises(err):
+                Template(src)
+
+if __name__ == "__main__":
+    unittest.main()
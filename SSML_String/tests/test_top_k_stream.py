@@ -0,0 +1,47 @@
+import unittest
+import random
+from src.strings.top_k_freq import top_k_frequent_words
+from src.strings.top_k_stream import SpaceSaving, stream_top_k
+
+class TestSpaceSaving(unittest.TestCase):
+    def test_exact_mode_matches_counter(self):
+        words = "the day is sunny the the the sunny is is".split()
+        self.assertEqual(stream_top_k(words, 2), ["the", "is"])
+        self.assertEqual(stream_top_k(words, 10), top_k_frequent_words(words, 10))
+
+    def test_tie_order(self):
+        words = ["Z", "z", "z", "Z", "a", "A", "A", "a"]
+        self.assertEqual(stream_top_k(words, 2), ["A", "Z"])
+        self.assertEqual(stream_top_k(words, 2, capacity=4), ["A", "Z"])
+
+    def test_bounded_heavy_hitters(self):
+        rng = random.Random(7)
+        words = ["hot"] * 500 + ["warm"] * 300 + [f"w{rng.randrange(5000)}" for _ in range(2000)]
+        rng.shuffle(words)
+        sk = SpaceSaving(capacity=64)
+        sk.extend(words)
+        self.assertLessEqual(len(sk), 64)
+        self.assertEqual(sk.top_k(2), ["hot", "warm"])
+        self.assertGreaterEqual(sk.count("hot"), 500)
+        self.assertLessEqual(sk.count("hot") - sk.error("hot"), 500)
+
+    def test_merge(self):
+        a_words = "a b a c a".split()
+        b_words = "b b d a".split()
+        a, b = SpaceSaving(None), SpaceSaving(None)
+        a.extend(a_words)
+        b.extend(b_words)
+        a.merge(b)
+        self.assertEqual(a.top_k(4), top_k_frequent_words(a_words + b_words, 4))
+        self.assertEqual(a.total, 9)
+
+        x, y = SpaceSaving(3), SpaceSaving(3)
+        x.extend(["hot"] * 50 + list("abcdef"))
+        y.extend(["hot"] * 40 + list("ghijkl"))
+        x.merge(y)
+        self.assertLessEqual(len(x), 3)
+        self.assertEqual(x.top_k(1), ["hot"])
+        self.assertGreaterEqual(x.count("hot"), 90)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import copy
+import random
+import unittest
+import xml.etree.ElementTree as ET
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.merkle import subtree_hash
+from src.ssml.treediff import (diff_trees, apply_edits, format_edit, INSERT, DELETE,
+                               UPDATE_ATTR, UPDATE_TEXT)
+
+def random_tree(rng, depth=0):
+    el = ET.Element(rng.choice(["p", "s", "prosody", "break", "emphasis"]))
+    if el.tag == "break":
+        el.set("time", f"{rng.randrange(5)}s")
+    if el.tag == "prosody":
+        el.set("rate", rng.choice(["slow", "fast"]))
+    el.text = rng.choice([None, "a", "b c"])
+    if depth < 3 and el.tag != "break":
+        for _ in range(rng.randint(0, 4)):
+            c = random_tree(rng, depth + 1)
+            c.tail = rng.choice([None, " t", "u v"])
+            el.append(c)
+    return el
+
+def mutate(rng, root):
+    els = list(root.iter())
+    for _ in range(rng.randint(1, 4)):
+        el = rng.choice(els)
+        k = rng.randrange(5)
+        if k == 0:
+            el.set("rate", rng.choice(["slow", "fast", "x-slow"]))
+        elif k == 1:
+            el.text = rng.choice([None, "a", "changed"])
+        elif k == 2 and len(el):
+            el.remove(el[rng.randrange(len(el))])
+        elif k == 3:
+            el.insert(rng.randint(0, len(el)), random_tree(rng, 2))
+        elif len(el) > 1:
+            c = el[rng.randrange(len(el))]
+            el.remove(c)
+            el.insert(rng.randint(0, len(el)), c)   # a move: delete + insert
+        els = list(root.iter())
+
+class TestTreeDiff(unittest.TestCase):
+    def test_random_edits_roundtrip(self):
+        rng = random.Random(45)
+        for _ in range(300):
+            a = ET.Element("speak")
+            a.extend(random_tree(rng) for _ in range(rng.randint(1, 5)))
+            b = copy.deepcopy(a)
+            mutate(rng, b)
+            edits = diff_trees(a, b)
+            self.assertEqual(subtree_hash(apply_edits(a, edits)), subtree_hash(b))
+            self.assertEqual(diff_trees(a, copy.deepcopy(a)), [])
+
+    def test_edit_kinds(self):
+        a = parse_ssml('<speak><p>Hello <break time="1s"/> world</p>'
+                       '<p>second <prosody rate="slow">slow</prosody></p><p>third</p></speak>')
+        b = parse_ssml('<speak>\n <p>Hello <break time="2s"/> world!</p>\n'
+                       '<p>third</p><p>new</p></speak>')
+        edits = diff_trees(a, b)
+        self.assertEqual([(e.op, e.path, e.key) for e in edits], [
+            (UPDATE_ATTR, (0, 0), "time"),
+            (UPDATE_TEXT, (0, 0), "tail"),
+            (DELETE, (1,), None),
+            (INSERT, (2,), None),
+        ])
+        self.assertEqual(format_edit(edits[0]), "update-attr <break> 0/0 time: '1s' -> '2s'")
+
+    def test_whitespace_and_attribute_order_ignored(self):
+        a = parse_ssml('<speak><prosody rate="slow" pitch="low">a  b</prosody></speak>')
+        b = parse_ssml('<speak>\n<prosody pitch="low" rate="slow"> a b </prosody>\n</speak>')
+        self.assertEqual(diff_trees(a, b), [])
+
+    def test_changed_paragraph_pairs_by_similarity(self):
+        paras = [f"<p><s>sentence {i}</s><s>more {i}</s></p>" for i in range(6)]
+        a = parse_ssml("<speak>" + "".join(paras) + "</speak>")
+        paras[2] = "<p><s>sentence 2</s><s>edited</s></p>"
+        del paras[4]
+        b = parse_ssml("<speak>" + "".join(paras) + "</speak>")
+        self.assertEqual([(e.op, e.path) for e in diff_trees(a, b)],
+                         [(UPDATE_TEXT, (2, 1)), (DELETE, (4,))])
+
+    def test_root_replaced(self):
+        a, b = ET.fromstring("<speak>x</speak>"), ET.fromstring("<p>y</p>")
+        edits = diff_trees(a, b)
+        self.assertEqual([e.op for e in edits], [DELETE, INSERT])
+        self.assertEqual(ET.tostring(apply_edits(a, edits)), b"<p>y</p>")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import random
+import unittest
+from collections import Counter
+from src.strings.windows import (Vocabulary, LongestUniqueWindow, CoveringWindow,
+                                 longest_unique_span, smallest_covering_span)
+from src.ssml.simple_etree import parse_ssml
+from src.ssml.transforms import flatten_text
+
+def brute_unique(toks):
+    best = (0, 0)
+    for a in range(len(toks)):
+        for b in range(a + 1, len(toks) + 1):
+            if len(set(toks[a:b])) == b - a and b - a > best[1] - best[0]:
+                best = (a, b)
+    return best
+
+def brute_cover(toks, kws):
+    need = Counter(kws)
+    best = None
+    for a in range(len(toks)):
+        for b in range(a + 1, len(toks) + 1):
+            have = Counter(toks[a:b])
+            if all(have[k] >= n for k, n in need.items()):
+                if best is None or b - a < best[1] - best[0]:
+                    best = (a, b)
+                break
+    return best
+
+class TestWindows(unittest.TestCase):
+    def test_random_against_brute_force(self):
+        rng = random.Random(3)
+        for _ in range(300):
+            toks = [rng.choice(["a", "b", "c", "d", 1, (2,)]) for _ in range(rng.randint(0, 14))]
+            kws = [rng.choice(["a", "b", 1]) for _ in range(rng.randint(1, 3))]
+            self.assertEqual(longest_unique_span(toks), brute_unique(toks))
+            self.assertEqual(smallest_covering_span(toks, kws), brute_cover(toks, kws))
+
+    def test_chunked_feed_matches_one_shot(self):
+        rng = random.Random(4)
+        toks = [rng.randrange(30) for _ in range(2000)]
+        vocab = Vocabulary()
+        uniq, cover = LongestUniqueWindow(vocab), CoveringWindow([1, 2, 2, 3])
+        spans = []
+        for i in range(0, len(toks), 97):
+            uniq.feed(toks[i:i + 97])
+            spans.extend(cover.feed(iter(toks[i:i + 97])))
+        self.assertEqual(uniq.best, longest_unique_span(toks))
+        self.assertEqual(cover.best, smallest_covering_span(toks, [1, 2, 2, 3]))
+        self.assertEqual(cover.position, len(toks))
+        self.assertTrue(all(b - a >= 4 for a, b in spans))
+        self.assertEqual(len(vocab), len(set(toks)))
+
+    def test_covering_buffer_bounded_while_a_keyword_is_missing(self):
+        cover = CoveringWindow(["a", "b", "c"])
+        cover.feed(["a"])
+        for _ in range(1000):
+            self.assertEqual(cover.feed(["b", "x", "b"]), [])
+            self.assertLessEqual(len(cover._win), 6)
+        self.assertEqual(cover.feed(["c"]), [(0, 3002)])
+
+    def test_ssml_word_stream(self):
+        root = parse_ssml("<speak>the show <break time='1s'/> we talk about <sub alias='speech synthesis'>TTS</sub>"
+                          " and the markup tonight</speak>")
+        words = flatten_text(root).split()
+        a, b = smallest_covering_span(words, ["markup", "speech"])
+        self.assertEqual(words[a:b], ["speech", "synthesis", "and", "the", "markup"])
+        a, b = longest_unique_span(words)
+        self.assertEqual(words[a:b][0], "show")
+        self.assertEqual(b - a, 10)
+        self.assertIsNone(smallest_covering_span(words, ["absent"]))
+
+if __name__ == "__main__":
+    unittest.main()